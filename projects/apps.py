@@ -0,0 +1,30 @@
+"""Configuration de l'application de projets."""
+
+from django.apps import AppConfig
+
+
+class ProjectsConfig(AppConfig):
+    """Configuration de l'application projects.
+
+    Connecte les signaux de l'application au démarrage, ainsi que le
+    réglage et la mesure des nouvelles connexions à la base.
+    """
+
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "projects"
+
+    def ready(self):
+        """Importe les signaux pour enregistrer leurs récepteurs."""
+        from django.db.backends.signals import connection_created
+        from django.db.models.signals import post_migrate
+
+        from . import signals
+        from .sqlite import configure_connection
+        from .timing import install_query_timer
+
+        connection_created.connect(configure_connection)
+        connection_created.connect(install_query_timer)
+
+        post_migrate.connect(
+            signals.install_search_triggers_after_migrate, sender=self
+        )
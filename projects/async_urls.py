@@ -0,0 +1,48 @@
+"""Configuration des URLs des vues asynchrones de l'application de projets.
+
+Ces routes, montées sous ``/api/async/``, reprennent en lecture seule les
+chemins des routes synchrones (voir ``projects.urls``):
+- /projects/ - Liste des projets
+- /projects/{id}/ - Détail d'un projet
+- /projects/{id}/issues/ - Problèmes d'un projet
+- /projects/{id}/issues/{id}/ - Détail d'un problème
+- /projects/{id}/issues/{id}/comments/ - Commentaires d'un problème
+"""
+
+from django.urls import path
+
+from .async_views import (
+    ProjectListAsyncView,
+    ProjectDetailAsyncView,
+    IssueListAsyncView,
+    IssueDetailAsyncView,
+    CommentListAsyncView,
+)
+
+urlpatterns = [
+    path(
+        "projects/",
+        ProjectListAsyncView.as_view(),
+        name="async-project-list",
+    ),
+    path(
+        "projects/<int:pk>/",
+        ProjectDetailAsyncView.as_view(),
+        name="async-project-detail",
+    ),
+    path(
+        "projects/<int:project_pk>/issues/",
+        IssueListAsyncView.as_view(),
+        name="async-project-issues-list",
+    ),
+    path(
+        "projects/<int:project_pk>/issues/<int:pk>/",
+        IssueDetailAsyncView.as_view(),
+        name="async-project-issues-detail",
+    ),
+    path(
+        "projects/<int:project_pk>/issues/<int:issue_pk>/comments/",
+        CommentListAsyncView.as_view(),
+        name="async-issue-comments-list",
+    ),
+]
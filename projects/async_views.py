@@ -0,0 +1,205 @@
+"""Vues asynchrones (ASGI) en lecture seule pour l'application de projets.
+
+Sous ASGI, une vue synchrone occupe un thread pendant toute la requête, et
+le nombre de threads limite le nombre de connexions servies en parallèle.
+Les vues de ce module sont des coroutines: l'authentification, le contrôle
+d'appartenance, les requêtes (ORM asynchrone de Django) et le cache sont
+attendus sans bloquer la boucle d'évènements, de sorte qu'un seul worker
+peut tenir un grand nombre de connexions lentes.
+
+Elles reprennent, sous ``/api/async/``, les lectures les plus fréquentes:
+- ``projects/`` et ``projects/{id}/``
+- ``projects/{id}/issues/`` et ``projects/{id}/issues/{id}/``
+- ``projects/{id}/issues/{id}/comments/``
+
+avec les mêmes sérialiseurs, filtres, tris et pagination que les ViewSets
+synchrones, mais sans ETag ni cache de réponses. Les sérialiseurs ne
+s'exécutent que sur des données déjà chargées: ils ne font aucune requête.
+"""
+
+from types import SimpleNamespace
+
+from django.db.models import Prefetch
+from django.views import View
+from rest_framework.exceptions import (
+    APIException,
+    AuthenticationFailed,
+    NotFound,
+    PermissionDenied,
+)
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from users.authentication import CachedJWTAuthentication
+from .exceptions import custom_exception_handler
+from .fieldsets import defer_unused, get_sparse_paths
+from .filters import IssueFilterBackend, IssueOrderingFilter
+from .membership import aget_project_role
+from .models import Comment, Contributor, Issue, Project
+from .pagination import KeysetPagination
+from .renderers import FastJSONRenderer
+from .serializers import (
+    CommentSerializer,
+    IssueDetailSerializer,
+    IssueListSerializer,
+    ProjectDetailSerializer,
+    ProjectListSerializer,
+)
+
+
+class AsyncReadView(View):
+    """Base des vues asynchrones: authentification, erreurs et rendu JSON.
+
+    Les sous-classes implémentent ``async def read(self, request, **kwargs)``
+    et retournent les données à rendre. ``request`` est une requête DRF
+    (``query_params``, ``user``) construite sur la requête Django.
+    """
+
+    http_method_names = ["get", "head", "options"]
+    authentication_class = CachedJWTAuthentication
+    renderer_class = FastJSONRenderer
+
+    async def get(self, request, *args, **kwargs):
+        """Authentifie la requête puis produit la réponse de ``read``."""
+        drf_request = Request(request, authenticators=())
+        try:
+            drf_request.user = await self.authenticate(request)
+            data = await self.read(drf_request, **kwargs)
+            response = Response(data)
+        except APIException as exc:
+            response = custom_exception_handler(exc, {"request": drf_request})
+        return self.finalize(response)
+
+    async def authenticate(self, request):
+        """Retourne l'utilisateur authentifié par le jeton JWT.
+
+        Raises:
+            AuthenticationFailed: Si la requête ne porte pas de jeton, ou
+                si le jeton ou le compte est invalide
+        """
+        result = await self.authentication_class().aauthenticate(request)
+        if result is None:
+            raise AuthenticationFailed(
+                "Les informations d'authentification n'ont pas été fournies."
+            )
+        return result[0]
+
+    async def check_membership(self, request, project_id):
+        """Vérifie que l'utilisateur est membre du projet.
+
+        Raises:
+            PermissionDenied: Si l'utilisateur n'en est pas membre
+        """
+        if await aget_project_role(request, project_id) is None:
+            raise PermissionDenied()
+
+    def finalize(self, response):
+        """Prépare une réponse DRF pour le rendu JSON par Django."""
+        response.accepted_renderer = self.renderer_class()
+        response.accepted_media_type = self.renderer_class.media_type
+        response.renderer_context = {}
+        return response
+
+    def get_serializer_context(self, request):
+        """Contexte transmis aux sérialiseurs."""
+        return {"request": request, "view": self}
+
+    async def paginate(self, request, queryset, serializer_class):
+        """Retourne une page de ``queryset`` sérialisée, avec ses liens.
+
+        Avec ``?fields=`` ou ``?omit=``, seules les colonnes des champs
+        restants sont lues.
+        """
+        paginator = KeysetPagination()
+        context = self.get_serializer_context(request)
+        if any(get_sparse_paths(request)):
+            queryset = defer_unused(
+                queryset, serializer_class(context=context), paginator.ordering
+            )
+        page = await paginator.apaginate_queryset(queryset, request)
+        serializer = serializer_class(page, many=True, context=context)
+        return paginator.get_paginated_data(serializer.data)
+
+    async def get_object(self, queryset, **lookup):
+        """Retourne l'objet désigné, ou lève NotFound."""
+        obj = await queryset.filter(**lookup).afirst()
+        if obj is None:
+            raise NotFound()
+        return obj
+
+
+class ProjectListAsyncView(AsyncReadView):
+    """Liste des projets dont l'utilisateur est contributeur."""
+
+    async def read(self, request):
+        """Page des projets de l'utilisateur."""
+        queryset = Project.objects.filter(contributors__user=request.user)
+        return await self.paginate(request, queryset, ProjectListSerializer)
+
+
+class ProjectDetailAsyncView(AsyncReadView):
+    """Détail d'un projet, avec son auteur et ses contributeurs."""
+
+    async def read(self, request, pk):
+        """Détail du projet ``pk``, s'il est accessible à l'utilisateur."""
+        queryset = (
+            Project.objects.filter(contributors__user=request.user)
+            .select_related("author")
+            .prefetch_related(
+                Prefetch(
+                    "contributors",
+                    queryset=Contributor.objects.select_related("user"),
+                )
+            )
+        )
+        project = await self.get_object(queryset, pk=pk)
+        return ProjectDetailSerializer(
+            project, context=self.get_serializer_context(request)
+        ).data
+
+
+class IssueListAsyncView(AsyncReadView):
+    """Liste filtrée et triée des problèmes d'un projet."""
+
+    filter_backends = [IssueFilterBackend, IssueOrderingFilter]
+
+    async def read(self, request, project_pk):
+        """Page filtrée et triée des problèmes du projet."""
+        await self.check_membership(request, project_pk)
+        queryset = Issue.objects.filter(project_id=project_pk)
+        # Les filtres ne lisent que les paramètres et construisent le
+        # queryset: ils n'exécutent aucune requête
+        view = SimpleNamespace(action="list")
+        for backend in self.filter_backends:
+            queryset = backend().filter_queryset(request, queryset, view)
+        return await self.paginate(request, queryset, IssueListSerializer)
+
+
+class IssueDetailAsyncView(AsyncReadView):
+    """Détail d'un problème, avec ses derniers commentaires."""
+
+    async def read(self, request, project_pk, pk):
+        """Détail du problème ``pk``, avec ses derniers commentaires."""
+        await self.check_membership(request, project_pk)
+        queryset = Issue.objects.filter(project_id=project_pk).select_related(
+            "author", "assignee"
+        )
+        issue = await self.get_object(queryset, pk=pk)
+        serializer = IssueDetailSerializer(
+            issue, context=self.get_serializer_context(request)
+        )
+        if {"comments", "comments_more"} & set(serializer.fields):
+            await serializer.aload_embedded_comments(issue)
+        return serializer.data
+
+
+class CommentListAsyncView(AsyncReadView):
+    """Liste des commentaires d'un problème."""
+
+    async def read(self, request, project_pk, issue_pk):
+        """Page des commentaires du problème ``issue_pk``."""
+        await self.check_membership(request, project_pk)
+        queryset = Comment.objects.filter(
+            issue__project_id=project_pk, issue_id=issue_pk
+        ).select_related("author")
+        return await self.paginate(request, queryset, CommentSerializer)
@@ -0,0 +1,569 @@
+"""Mesure de la latence de toutes les routes de l'API.
+
+Chaque route de ``projects.urls`` et de ``users.urls`` est associée à un
+ou plusieurs scénarios (méthode, chemin, corps), construits à partir des
+données présentes en base: le projet le plus volumineux de l'utilisateur
+choisi, son problème le plus commenté, etc. ``missing_routes`` signale les
+routes sans scénario, pour qu'une route ajoutée ne passe pas inaperçue.
+
+Un scénario est exécuté par le client de test de Django, depuis
+``concurrency`` threads ayant chacun leur client et leur connexion à la
+base. Pour chaque scénario sont relevés les quantiles de latence, le
+débit, le nombre de requêtes SQL par requête HTTP et la mémoire résidente
+maximale du processus pendant son exécution. ``compare`` confronte ces
+résultats à une référence enregistrée.
+
+Les scénarios d'écriture (création, modification, import, inscription)
+modifient la base: ils ne sont exécutés qu'à la demande, de préférence
+sur une copie.
+"""
+
+import json
+import os
+import resource
+import statistics
+import sys
+import threading
+import time
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import Client
+from django.urls import get_resolver
+from rest_framework_simplejwt.tokens import AccessToken
+
+from .models import Project
+
+URLCONFS = {"projects.urls": "/api/", "users.urls": "/api/auth/"}
+
+HOST = "localhost"
+
+
+class Scenario:
+    """Requête répétée pour mesurer une route.
+
+    Attributes:
+        name: Nom du scénario dans le rapport
+        route: Nom de la route couverte
+        method: Méthode HTTP
+        path: Chemin absolu, avec sa chaîne de requête
+        body: Corps JSON, fonction (numéro de la requête) -> corps, ou
+            None
+        multipart: Si True, le corps est envoyé en multipart
+        authenticated: Si True, la requête porte le jeton JWT
+        write: Si True, le scénario modifie la base
+        weight: Fraction du nombre de requêtes demandé, pour les routes
+            lentes par nature (export, hachage du mot de passe)
+    """
+
+    def __init__(
+        self,
+        name,
+        route,
+        method,
+        path,
+        body=None,
+        multipart=False,
+        authenticated=True,
+        write=False,
+        weight=1.0,
+    ):
+        self.name = name
+        self.route = route
+        self.method = method
+        self.path = path
+        self.body = body
+        self.multipart = multipart
+        self.authenticated = authenticated
+        self.write = write
+        self.weight = weight
+
+    def get_body(self, index):
+        """Corps de la requête numéro ``index``."""
+        return self.body(index) if callable(self.body) else self.body
+
+
+def route_names():
+    """Noms de toutes les routes de l'API mesurées."""
+    names = set()
+
+    def walk(resolver):
+        for pattern in resolver.url_patterns:
+            if hasattr(pattern, "url_patterns"):
+                walk(pattern)
+            elif pattern.name:
+                names.add(pattern.name)
+
+    for urlconf in URLCONFS:
+        walk(get_resolver(urlconf))
+    return names
+
+
+def find_fixture(username=None):
+    """Choisit les objets visés par les scénarios.
+
+    Args:
+        username: Utilisateur pour lequel mesurer; par défaut, l'auteur du
+            projet qui a le plus de problèmes
+
+    Returns:
+        Dictionnaire {"user", "project", "issue", "comment",
+        "contributor"}, ou None si la base ne contient aucun projet
+        exploitable
+    """
+    projects = Project.objects.select_related("author").order_by(
+        "-issues_count", "id"
+    )
+    if username:
+        projects = projects.filter(contributors__user__username=username)
+    project = projects.first()
+    if project is None:
+        return None
+    user = project.author
+    if username and user.username != username:
+        user = project.contributors.get(user__username=username).user
+    issue = project.issues.order_by("-comments_count", "id").first()
+    if issue is None:
+        return None
+    return {
+        "user": user,
+        "project": project,
+        "issue": issue,
+        "comment": issue.comments.order_by("id").first(),
+        "contributor": project.contributors.order_by("id").first(),
+    }
+
+
+def build_scenarios(fixture, password):
+    """Construit les scénarios de toutes les routes.
+
+    Args:
+        fixture: Objets visés (voir ``find_fixture``)
+        password: Mot de passe en clair de l'utilisateur, pour la
+            connexion
+
+    Returns:
+        Liste de Scenario
+    """
+    user = fixture["user"]
+    project = f"/api/projects/{fixture['project'].pk}"
+    issue = f"{project}/issues/{fixture['issue'].pk}"
+    comment = fixture["comment"]
+    run = int(time.time())
+
+    def ndjson(index):
+        lines = [
+            {
+                "title": f"Import de mesure {index}",
+                "description": "Problème importé par la mesure de charge.",
+                "tag": "TASK",
+                "priority": "LOW",
+                "author": user.username,
+            }
+        ] * 10
+        content = "".join(json.dumps(line) + "\n" for line in lines)
+        return {
+            "file": SimpleUploadedFile(
+                "benchmark.ndjson", content.encode(), "application/x-ndjson"
+            )
+        }
+
+    scenarios = [
+        Scenario("project-list", "project-list", "GET", "/api/projects/"),
+        Scenario(
+            "project-search-all",
+            "project-search-all",
+            "GET",
+            "/api/projects/search/?q=api",
+        ),
+        Scenario("project-detail", "project-detail", "GET", f"{project}/"),
+        Scenario(
+            "project-export",
+            "project-export",
+            "GET",
+            f"{project}/export/",
+            weight=0.1,
+        ),
+        Scenario(
+            "project-search",
+            "project-search",
+            "GET",
+            f"{project}/search/?q=api",
+        ),
+        Scenario(
+            "project-users-list",
+            "project-users-list",
+            "GET",
+            f"{project}/users/",
+        ),
+        Scenario(
+            "project-users-detail",
+            "project-users-detail",
+            "GET",
+            f"{project}/users/{fixture['contributor'].pk}/",
+        ),
+        Scenario(
+            "project-issues-list",
+            "project-issues-list",
+            "GET",
+            f"{project}/issues/",
+        ),
+        Scenario(
+            "project-issues-list-filtered",
+            "project-issues-list",
+            "GET",
+            f"{project}/issues/?status=TODO&ordering=-priority",
+        ),
+        Scenario(
+            "project-issues-list-sparse",
+            "project-issues-list",
+            "GET",
+            f"{project}/issues/?fields=id,title,status,priority",
+        ),
+        Scenario(
+            "project-issues-detail",
+            "project-issues-detail",
+            "GET",
+            f"{issue}/",
+        ),
+        Scenario(
+            "issue-comments-list",
+            "issue-comments-list",
+            "GET",
+            f"{issue}/comments/",
+        ),
+        Scenario("account", "account", "GET", "/api/auth/account/"),
+        Scenario(
+            "login",
+            "token_obtain_pair",
+            "POST",
+            "/api/auth/login/",
+            body={"username": user.username, "password": password},
+            authenticated=False,
+            weight=0.1,
+        ),
+        Scenario(
+            "project-issues-create",
+            "project-issues-list",
+            "POST",
+            f"{project}/issues/",
+            body={
+                "title": "Problème de mesure",
+                "description": "Créé par la mesure de charge.",
+                "tag": "TASK",
+                "priority": "LOW",
+            },
+            write=True,
+        ),
+        Scenario(
+            "project-issues-batch-update",
+            "project-issues-batch-update",
+            "PATCH",
+            f"{project}/issues/batch/",
+            body={"ids": [fixture["issue"].pk], "priority": "HIGH"},
+            write=True,
+        ),
+        Scenario(
+            "project-issues-update",
+            "project-issues-detail",
+            "PATCH",
+            f"{issue}/",
+            body={"priority": "MEDIUM"},
+            write=True,
+        ),
+        Scenario(
+            "issue-comments-create",
+            "issue-comments-list",
+            "POST",
+            f"{issue}/comments/",
+            body={"description": "Commentaire de mesure."},
+            write=True,
+        ),
+        Scenario(
+            "project-import-issues",
+            "project-import-issues",
+            "POST",
+            f"{project}/import/",
+            body=ndjson,
+            multipart=True,
+            write=True,
+            weight=0.1,
+        ),
+        Scenario(
+            "signup",
+            "signup",
+            "POST",
+            "/api/auth/signup/",
+            body=lambda index: {
+                "username": f"signup-{run}-{index}",
+                "email": f"signup-{run}-{index}@example.com",
+                "password": "Benchmark-Password-123",
+                "password2": "Benchmark-Password-123",
+                "age": 30,
+                "can_be_contacted": False,
+                "can_data_be_shared": False,
+            },
+            authenticated=False,
+            write=True,
+            weight=0.1,
+        ),
+    ]
+    if comment is not None:
+        scenarios.insert(
+            12,
+            Scenario(
+                "issue-comments-detail",
+                "issue-comments-detail",
+                "GET",
+                f"{issue}/comments/{comment.pk}/",
+            ),
+        )
+    return scenarios
+
+
+def missing_routes(scenarios):
+    """Routes de l'API qu'aucun scénario ne couvre."""
+    return sorted(route_names() - {scenario.route for scenario in scenarios})
+
+
+def current_rss():
+    """Mémoire résidente actuelle du processus, en octets.
+
+    Lue dans ``/proc`` sous Linux; ailleurs, le maximum atteint depuis le
+    début du processus.
+    """
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss est en octets sous macOS, en Kio ailleurs
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+class RSSSampler:
+    """Relève la mémoire résidente maximale pendant une mesure.
+
+    Attributes:
+        peak: Maximum relevé, en octets
+    """
+
+    def __init__(self, interval=0.005):
+        self.interval = interval
+        self.peak = current_rss()
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self.sample, daemon=True)
+
+    def sample(self):
+        """Relève la mémoire résidente jusqu'à l'arrêt de la mesure."""
+        while not self.stopped.wait(self.interval):
+            self.peak = max(self.peak, current_rss())
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stopped.set()
+        self.thread.join()
+        self.peak = max(self.peak, current_rss())
+
+
+def percentiles(latencies):
+    """Quantiles p50, p95 et p99 d'une série de durées, en ms."""
+    if len(latencies) < 2:
+        value = round(latencies[0] * 1000, 3) if latencies else None
+        return {"p50_ms": value, "p95_ms": value, "p99_ms": value}
+    quantiles = statistics.quantiles(latencies, n=100, method="inclusive")
+    return {
+        "p50_ms": round(quantiles[49] * 1000, 3),
+        "p95_ms": round(quantiles[94] * 1000, 3),
+        "p99_ms": round(quantiles[98] * 1000, 3),
+    }
+
+
+class EndpointBenchmark:
+    """Exécute les scénarios et mesure chacun d'eux.
+
+    Attributes:
+        token: Jeton JWT des requêtes authentifiées
+        requests: Nombre de requêtes mesurées par scénario (avant
+            application du poids du scénario)
+        concurrency: Nombre de clients simultanés
+        warmup: Nombre de requêtes non mesurées avant la mesure
+    """
+
+    def __init__(self, user, requests=100, concurrency=1, warmup=5):
+        self.token = str(AccessToken.for_user(user))
+        self.requests = requests
+        self.concurrency = concurrency
+        self.warmup = warmup
+
+    def client(self, scenario):
+        """Client de test d'un thread.
+
+        Une exception levée par une vue donne une réponse 500, comptée
+        comme une erreur, au lieu d'interrompre la mesure.
+        """
+        headers = {}
+        if scenario.authenticated:
+            headers["Authorization"] = f"Bearer {self.token}"
+        return Client(
+            raise_request_exception=False, headers=headers, HTTP_HOST=HOST
+        )
+
+    def call(self, client, scenario, index):
+        """Exécute une requête.
+
+        Returns:
+            Tuple (statut, durée en secondes, nombre de requêtes SQL)
+        """
+        queries = 0
+
+        def count(execute, sql, params, many, context):
+            nonlocal queries
+            queries += 1
+            return execute(sql, params, many, context)
+
+        body = scenario.get_body(index)
+        kwargs = {}
+        if body is not None:
+            kwargs["data"] = body
+            if not scenario.multipart:
+                kwargs["content_type"] = "application/json"
+        request = getattr(client, scenario.method.lower())
+
+        with connection.execute_wrapper(count):
+            started = time.perf_counter()
+            response = request(scenario.path, **kwargs)
+            if response.streaming:
+                for _ in response.streaming_content:
+                    pass
+            duration = time.perf_counter() - started
+        return response.status_code, duration, queries
+
+    def run(self, scenario):
+        """Mesure un scénario.
+
+        Returns:
+            Dictionnaire des mesures du scénario
+        """
+        total = max(1, round(self.requests * scenario.weight))
+        warmup_client = self.client(scenario)
+        for index in range(self.warmup):
+            self.call(warmup_client, scenario, -index - 1)
+
+        indices = iter(range(total))
+        lock = threading.Lock()
+        outcomes = []
+
+        def worker():
+            client = self.client(scenario)
+            try:
+                while True:
+                    with lock:
+                        index = next(indices, None)
+                    if index is None:
+                        return
+                    outcome = self.call(client, scenario, index)
+                    with lock:
+                        outcomes.append(outcome)
+            finally:
+                connection.close()
+
+        threads = [
+            threading.Thread(target=worker)
+            for _ in range(min(self.concurrency, total))
+        ]
+        with RSSSampler() as rss:
+            started = time.perf_counter()
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            elapsed = time.perf_counter() - started
+
+        latencies = sorted(duration for _, duration, _ in outcomes)
+        queries = [count for _, _, count in outcomes]
+        statuses = {}
+        for status, _, _ in outcomes:
+            statuses[str(status)] = statuses.get(str(status), 0) + 1
+        return {
+            "route": scenario.route,
+            "method": scenario.method,
+            "path": scenario.path,
+            "requests": len(outcomes),
+            "errors": sum(1 for status, _, _ in outcomes if status >= 400),
+            "statuses": statuses,
+            **percentiles(latencies),
+            "mean_ms": round(statistics.fmean(latencies) * 1000, 3),
+            "throughput": round(len(outcomes) / elapsed, 1),
+            "queries_mean": round(statistics.fmean(queries), 2),
+            "queries_max": max(queries),
+            "peak_rss_mb": round(rss.peak / 2**20, 1),
+        }
+
+
+# Mesures comparées à la référence
+COMPARED = ("p50_ms", "p95_ms", "p99_ms", "throughput", "queries_mean")
+
+# Écart absolu en deçà duquel une variation est tenue pour du bruit
+MIN_LATENCY_DELTA_MS = 1.0
+MIN_QUERIES_DELTA = 0.5
+
+
+def is_regression(metric, before, after, threshold):
+    """Indique si l'écart d'une mesure à sa référence est une régression."""
+    if metric == "queries_mean":
+        return after - before >= MIN_QUERIES_DELTA
+    if metric == "throughput":
+        return after < before / (1 + threshold)
+    return (
+        after > before * (1 + threshold)
+        and after - before > MIN_LATENCY_DELTA_MS
+    )
+
+
+def compare(results, baseline, threshold=0.2):
+    """Compare des résultats à une référence.
+
+    Une latence ou un débit dégradé de plus de ``threshold`` (en
+    proportion), ou un nombre moyen de requêtes SQL en hausse d'au moins
+    ``MIN_QUERIES_DELTA``, est une régression. Le nombre de requêtes ne
+    dépend pas de la machine: sa hausse trahit une requête N+1.
+
+    Returns:
+        Dictionnaire {scénario: {mesure: {"baseline", "current",
+        "change", "regression"}}}
+    """
+    comparison = {}
+    for name, current in results.items():
+        reference = baseline.get(name)
+        if reference is None:
+            comparison[name] = {"new": True}
+            continue
+        entry = {}
+        for metric in COMPARED:
+            before, after = reference.get(metric), current.get(metric)
+            if before is None or after is None:
+                continue
+            entry[metric] = {
+                "baseline": before,
+                "current": after,
+                "change": (
+                    round((after - before) / before, 4) if before else None
+                ),
+                "regression": is_regression(metric, before, after, threshold),
+            }
+        comparison[name] = entry
+    return comparison
+
+
+def regressions(comparison):
+    """Liste des (scénario, mesure) en régression."""
+    return [
+        (name, metric)
+        for name, entry in comparison.items()
+        for metric, values in entry.items()
+        if isinstance(values, dict) and values["regression"]
+    ]
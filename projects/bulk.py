@@ -0,0 +1,118 @@
+"""Écritures en masse sur les problèmes.
+
+Les insertions passent par ``bulk_create`` et les modifications groupées
+par ``QuerySet.update``, qui n'émettent pas les signaux ``post_save``: les
+fonctions de ce module mettent donc à jour elles-mêmes
+les compteurs dénormalisés et la version des projets concernés, en une
+requête par projet plutôt qu'une par ligne. L'index de recherche est tenu
+à jour par ses triggers SQLite.
+"""
+
+from collections import Counter
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .counters import adjust_comment_counts, adjust_issue_counts
+from .models import Comment, Issue
+from .versions import touch_issues_projects, touch_project
+
+
+def get_batch_size():
+    """Nombre de lignes insérées par requête ``INSERT``."""
+    return getattr(settings, "BULK_INSERT_BATCH_SIZE", 500)
+
+
+def create_issues(issues):
+    """Insère des problèmes déjà validés et met à jour les compteurs.
+
+    Args:
+        issues: Instances Issue non sauvegardées
+
+    Returns:
+        Les instances créées, avec leur identifiant
+    """
+    with transaction.atomic():
+        created = Issue.objects.bulk_create(
+            issues, batch_size=get_batch_size()
+        )
+        statuses = {}
+        for issue in created:
+            statuses.setdefault(issue.project_id, Counter())[issue.status] += 1
+        for project_id, counts in statuses.items():
+            adjust_issue_counts(project_id, counts)
+            touch_project(project_id)
+    return created
+
+
+def create_comments(comments):
+    """Insère des commentaires déjà validés et met à jour les compteurs.
+
+    Args:
+        comments: Instances Comment non sauvegardées
+
+    Returns:
+        Les instances créées, avec leur identifiant
+    """
+    with transaction.atomic():
+        created = Comment.objects.bulk_create(
+            comments, batch_size=get_batch_size()
+        )
+        counts = Counter(comment.issue_id for comment in created)
+        if counts:
+            adjust_comment_counts(counts)
+            touch_issues_projects(list(counts))
+    return created
+
+
+def update_issues(project_id, user, ids, changes):
+    """Applique les mêmes modifications à plusieurs problèmes d'un projet.
+
+    Les problèmes sont lus en une seule requête pour vérifier que
+    l'utilisateur en est l'auteur, puis modifiés par un seul
+    ``UPDATE ... WHERE id IN (...)``.
+
+    Args:
+        project_id: Identifiant du projet
+        user: Utilisateur à l'origine de la modification
+        ids: Identifiants des problèmes à modifier
+        changes: Dictionnaire {champ: nouvelle valeur}
+
+    Returns:
+        Tuple (updated, rejected): identifiants modifiés, et dictionnaires
+        {"id", "reason"} des problèmes refusés, dans l'ordre de ``ids``
+    """
+    ids = list(dict.fromkeys(ids))
+    with transaction.atomic():
+        issues = {
+            pk: (author_id, status)
+            for pk, author_id, status in Issue.objects.filter(
+                project_id=project_id, pk__in=ids
+            )
+            .select_for_update()
+            .values_list("pk", "author_id", "status")
+        }
+        updated = []
+        rejected = []
+        for pk in ids:
+            if pk not in issues:
+                rejected.append({"id": pk, "reason": "not_found"})
+            elif issues[pk][0] != user.pk:
+                rejected.append({"id": pk, "reason": "not_author"})
+            else:
+                updated.append(pk)
+        if not updated:
+            return updated, rejected
+
+        if "status" in changes:
+            deltas = Counter()
+            for pk in updated:
+                deltas[issues[pk][1]] -= 1
+                deltas[changes["status"]] += 1
+            adjust_issue_counts(project_id, deltas)
+        Issue.objects.filter(pk__in=updated).update(
+            **changes, updated_time=timezone.now()
+        )
+        touch_project(project_id)
+    return updated, rejected
@@ -0,0 +1,50 @@
+"""Cache des réponses de l'API, propre à chaque utilisateur.
+
+Remplace le cache global de Django (UpdateCacheMiddleware et
+FetchFromCacheMiddleware), qui ignorait l'en-tête Authorization et
+n'était jamais invalidé. Ici, la clé de cache est l'ETag calculé par
+``projects.conditional``: il dépend de l'utilisateur, de l'URL, du format
+demandé et de la version du projet, incrémentée à chaque écriture. Une
+écriture rend donc immédiatement inaccessibles les entrées précédentes,
+dans tous les processus, sans invalidation explicite.
+"""
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.response import Response
+
+from .conditional import ConditionalGetMixin
+
+
+class ResponseCacheMixin(ConditionalGetMixin):
+    """Met en cache les données des réponses des actions choisies.
+
+    Attributes:
+        cached_actions: Actions dont la réponse est mise en cache
+            (par exemple ``("list", "retrieve")``); aucune par défaut
+    """
+
+    cached_actions = ()
+
+    def get_fresh_response(self, handler, request, etag, *args, **kwargs):
+        """Retourne la réponse en cache, ou l'exécute et la met en cache.
+
+        Seules les données sérialisées d'une réponse 200 sont stockées; le
+        rendu (JSON, API navigable) est refait à chaque requête.
+        """
+        if self.action not in self.cached_actions:
+            return handler(request, *args, **kwargs)
+
+        key = "api:response:" + etag.strip('"')
+        data = cache.get(key)
+        if data is not None:
+            return Response(data)
+
+        response = handler(request, *args, **kwargs)
+        if response.status_code == 200 and isinstance(response, Response):
+            cache.set(
+                key,
+                response.data,
+                getattr(settings, "API_RESPONSE_CACHE_TIMEOUT", 300),
+            )
+        return response
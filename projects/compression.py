@@ -0,0 +1,350 @@
+"""Compression négociée des réponses de l'API (gzip, Brotli, Zstandard).
+
+Le codage est choisi d'après l'en-tête ``Accept-Encoding`` du client,
+parmi ``COMPRESSION_ENCODINGS`` (dans l'ordre de préférence du serveur à
+qualité égale): gzip est toujours disponible, Brotli (``br``) et
+Zstandard (``zstd``) seulement si les bibliothèques ``brotli`` et
+``zstandard`` sont installées.
+
+Seules les réponses des routes de l'API sont concernées:
+- une réponse de moins de ``COMPRESSION_MIN_SIZE`` octets est envoyée
+  telle quelle, la compression n'y gagnant presque rien
+- une réponse en flux (``StreamingHttpResponse``) est compressée au fil
+  de l'eau, bloc par bloc
+- une réponse déjà codée (``Content-Encoding``) n'est pas modifiée
+
+Chaque codage est une représentation distincte: son ETag reçoit le suffixe
+du codage (``"abc"`` devient ``"abc-gzip"``), la réponse porte
+``Vary: Accept-Encoding``, et les suffixes sont retirés de
+``If-None-Match`` avant la vue, qui compare ses propres ETags. Un ETag fort
+identifiant un unique corps JSON (voir ``projects.conditional``), le corps
+compressé d'une telle réponse est mis en cache par ETag et par codage.
+"""
+
+import hashlib
+import re
+import zlib
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.cache import patch_vary_headers
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Préfixes des chemins dont les réponses sont compressées
+COMPRESSED_PATHS = ("/api/",)
+
+# Niveaux par défaut: compromis entre taux et coût pour des réponses
+# produites à chaque requête
+DEFAULT_LEVELS = {"gzip": 6, "br": 5, "zstd": 3}
+
+# Types dont le corps est entièrement déterminé par l'ETag, et peut donc
+# être mis en cache compressé (l'API navigable inclut un jeton CSRF)
+CACHED_MEDIA_TYPES = ("application/json", "application/msgpack")
+
+ETAG_PATTERN = re.compile(r'(?:W/)?"[^"]*"')
+ETAG_SUFFIX = re.compile(r'-(?:gzip|br|zstd)"$')
+
+
+class GzipCompressor:
+    """Compresseur gzip, utilisable au fil de l'eau."""
+
+    def __init__(self, level):
+        self.compressor = zlib.compressobj(
+            level, zlib.DEFLATED, 16 + zlib.MAX_WBITS
+        )
+
+    def compress(self, data):
+        """Compresse un bloc; la sortie peut rester en tampon."""
+        return self.compressor.compress(data)
+
+    def flush(self):
+        """Vide le tampon, pour que le client puisse décoder ce bloc."""
+        return self.compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self):
+        """Termine le flux compressé et vide le tampon."""
+        return self.compressor.flush()
+
+
+class BrotliCompressor:
+    """Compresseur Brotli, utilisable au fil de l'eau."""
+
+    def __init__(self, level):
+        self.compressor = brotli.Compressor(quality=level)
+
+    def compress(self, data):
+        """Compresse un bloc; la sortie peut rester en tampon."""
+        return self.compressor.process(data)
+
+    def flush(self):
+        """Vide le tampon, pour que le client puisse décoder ce bloc."""
+        return self.compressor.flush()
+
+    def finish(self):
+        """Termine le flux compressé et vide le tampon."""
+        return self.compressor.finish()
+
+
+class ZstdCompressor:
+    """Compresseur Zstandard, utilisable au fil de l'eau."""
+
+    def __init__(self, level):
+        self.compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data):
+        """Compresse un bloc; la sortie peut rester en tampon."""
+        return self.compressor.compress(data)
+
+    def flush(self):
+        """Vide le tampon, pour que le client puisse décoder ce bloc."""
+        return self.compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self):
+        """Termine le flux compressé et vide le tampon."""
+        return self.compressor.flush()
+
+
+# Compresseurs disponibles, par nom de codage HTTP
+COMPRESSORS = {"gzip": GzipCompressor}
+if brotli is not None:
+    COMPRESSORS["br"] = BrotliCompressor
+if zstandard is not None:
+    COMPRESSORS["zstd"] = ZstdCompressor
+
+
+def get_encodings():
+    """Codages disponibles, dans l'ordre de préférence du serveur."""
+    encodings = getattr(
+        settings, "COMPRESSION_ENCODINGS", ("zstd", "br", "gzip")
+    )
+    return [encoding for encoding in encodings if encoding in COMPRESSORS]
+
+
+def get_min_size():
+    """Taille minimale, en octets, d'une réponse compressée."""
+    return getattr(settings, "COMPRESSION_MIN_SIZE", 1024)
+
+
+def get_compressor(encoding):
+    """Nouveau compresseur pour ``encoding``, au niveau configuré."""
+    levels = getattr(settings, "COMPRESSION_LEVELS", {})
+    level = levels.get(encoding, DEFAULT_LEVELS[encoding])
+    return COMPRESSORS[encoding](level)
+
+
+def compress(encoding, data):
+    """Compresse ``data`` d'un seul tenant."""
+    compressor = get_compressor(encoding)
+    return compressor.compress(data) + compressor.finish()
+
+
+def compress_stream(chunks, compressor):
+    """Compresse un flux d'octets, en vidant le tampon à chaque bloc."""
+    for chunk in chunks:
+        data = compressor.compress(chunk) + compressor.flush()
+        if data:
+            yield data
+    yield compressor.finish()
+
+
+async def acompress_stream(chunks, compressor):
+    """Variante asynchrone de ``compress_stream``."""
+    async for chunk in chunks:
+        data = compressor.compress(chunk) + compressor.flush()
+        if data:
+            yield data
+    yield compressor.finish()
+
+
+def parse_accept_encoding(header):
+    """Qualités annoncées par un en-tête ``Accept-Encoding``.
+
+    Returns:
+        Dictionnaire {codage en minuscules: qualité entre 0 et 1}
+    """
+    weights = {}
+    for item in header.split(","):
+        coding, _, params = item.partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        weights[coding] = quality
+    return weights
+
+
+def negotiate(header, encodings):
+    """Choisit le codage de la réponse.
+
+    Args:
+        header: Valeur de ``Accept-Encoding`` ("" si absent)
+        encodings: Codages disponibles, par ordre de préférence
+
+    Returns:
+        Le codage de plus haute qualité acceptée (le premier de
+        ``encodings`` à égalité), ou None pour une réponse non compressée
+    """
+    weights = parse_accept_encoding(header)
+    best, best_quality = None, 0.0
+    for encoding in encodings:
+        quality = weights.get(encoding, weights.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def suffix_etag(etag, encoding):
+    """ETag de la représentation codée: ``"abc"`` devient ``"abc-gzip"``."""
+    return f'{etag[:-1]}-{encoding}"'
+
+
+def strip_etag_suffixes(header):
+    """Retire les suffixes de codage des ETags d'un ``If-None-Match``.
+
+    Returns:
+        Tuple (en-tête réécrit, {ETag sans suffixe: ETag reçu})
+    """
+    received = {}
+
+    def strip(match):
+        """Remplace un ETag par sa forme sans suffixe."""
+        etag = match.group()
+        base = ETAG_SUFFIX.sub('"', etag)
+        if base != etag:
+            received[base] = etag
+        return base
+
+    return ETAG_PATTERN.sub(strip, header), received
+
+
+class CompressionMiddleware:
+    """Compresse les réponses des routes de l'API selon le client.
+
+    À placer juste après ``RequestTimingMiddleware``, avant tout
+    middleware qui lit ou complète le corps des réponses.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        if not request.path.startswith(COMPRESSED_PATHS):
+            return self.get_response(request)
+        received = self.process_request(request)
+        response = self.get_response(request)
+        return self.process_response(request, response, received)
+
+    async def __acall__(self, request):
+        if not request.path.startswith(COMPRESSED_PATHS):
+            return await self.get_response(request)
+        received = self.process_request(request)
+        response = await self.get_response(request)
+        return self.process_response(request, response, received)
+
+    def process_request(self, request):
+        """Présente à la vue les ETags de ``If-None-Match`` sans suffixe.
+
+        Returns:
+            Dictionnaire {ETag sans suffixe: ETag reçu}
+        """
+        header = request.META.get("HTTP_IF_NONE_MATCH")
+        if not header:
+            return {}
+        header, received = strip_etag_suffixes(header)
+        request.META["HTTP_IF_NONE_MATCH"] = header
+        return received
+
+    def process_response(self, request, response, received):
+        """Compresse la réponse si le client et sa taille s'y prêtent."""
+        if response.status_code == 304:
+            # Le client a validé une représentation codée: elle reste la
+            # sienne
+            etag = response.get("ETag")
+            if etag in received:
+                response["ETag"] = received[etag]
+                patch_vary_headers(response, ("Accept-Encoding",))
+            return response
+        if response.has_header("Content-Encoding"):
+            return response
+        if not response.streaming and len(response.content) < get_min_size():
+            return response
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+        encoding = negotiate(
+            request.headers.get("Accept-Encoding", ""), get_encodings()
+        )
+        if encoding is None:
+            return response
+
+        if response.streaming:
+            compressor = get_compressor(encoding)
+            if response.is_async:
+                response.streaming_content = acompress_stream(
+                    response.streaming_content, compressor
+                )
+            else:
+                response.streaming_content = compress_stream(
+                    response.streaming_content, compressor
+                )
+            del response["Content-Length"]
+        else:
+            content = self.compressed_content(response, encoding)
+            if len(content) >= len(response.content):
+                return response
+            response.content = content
+            response["Content-Length"] = str(len(content))
+
+        response["Content-Encoding"] = encoding
+        if response.has_header("ETag"):
+            response["ETag"] = suffix_etag(response["ETag"], encoding)
+        return response
+
+    def compressed_content(self, response, encoding):
+        """Corps compressé, lu en cache si l'ETag l'identifie.
+
+        Seules les réponses JSON (ou MessagePack) d'ETag fort sont mises en
+        cache: leur corps ne dépend que de l'ETag.
+        """
+        etag = response.get("ETag", "")
+        media_type = response.get("Content-Type", "").split(";")[0].strip()
+        if not etag.startswith('"') or media_type not in CACHED_MEDIA_TYPES:
+            return compress(encoding, response.content)
+
+        digest = hashlib.sha1(
+            f"{encoding}|{media_type}|{etag}".encode()
+        ).hexdigest()
+        key = f"api:compressed:{digest}"
+        content = cache.get(key)
+        if content is None:
+            content = compress(encoding, response.content)
+            cache.set(
+                key,
+                content,
+                getattr(settings, "API_RESPONSE_CACHE_TIMEOUT", 300),
+            )
+        return content
@@ -0,0 +1,178 @@
+"""Requêtes GET conditionnelles (ETag / Last-Modified) pour les projets.
+
+Les validateurs d'une réponse sont calculés à partir de la version et de la
+date de modification du projet concerné (voir ``projects.versions``), par
+une requête légère, avant toute lecture ou sérialisation des données. Un
+client qui renvoie ``If-None-Match`` ou ``If-Modified-Since`` reçoit alors
+un 304 sans que le sérialiseur ne s'exécute.
+"""
+
+import hashlib
+import time
+
+from django.db.models import Count, Max, Sum
+from django.http import HttpResponse
+from django.utils.cache import (
+    get_conditional_response,
+    patch_cache_control,
+    patch_vary_headers,
+)
+from django.utils.http import http_date, quote_etag
+
+from .models import Project
+
+
+def get_last_modified(updated_time):
+    """Retourne la date Last-Modified d'un état, en secondes.
+
+    Une date HTTP est à la seconde près: tant que la seconde de la
+    dernière modification n'est pas écoulée, une écriture peut encore la
+    suivre sans changer cette date, et un ``If-Modified-Since`` validerait
+    une représentation périmée. Dans ce cas, aucune date n'est donnée et
+    seul l'ETag permet une réponse 304.
+
+    Returns:
+        Horodatage entier, ou None si la date est inconnue ou si sa
+        seconde n'est pas écoulée
+    """
+    if updated_time is None:
+        return None
+    last_modified = int(updated_time.timestamp())
+    if last_modified >= int(time.time()):
+        return None
+    return last_modified
+
+
+class ConditionalGetMixin:
+    """Ajoute ETag et Last-Modified aux actions ``list`` et ``retrieve``.
+
+    L'état de référence dépend de la route:
+    - ``/projects/`` : agrégat (nombre, somme des versions, date maximale)
+      des projets de l'utilisateur
+    - ``/projects/{id}/`` et toutes les routes imbriquées : version et date
+      de modification du projet
+
+    L'ETag est propre à l'utilisateur, à l'URL absolue et au format
+    demandé, de sorte qu'il n'identifie qu'une seule représentation. La
+    liste des projets n'a pas de Last-Modified (voir
+    ``get_project_state``).
+    """
+
+    def list(self, request, *args, **kwargs):
+        """Liste les objets, ou répond 304 si rien n'a changé."""
+        return self.conditional_response(
+            super().list, request, *args, **kwargs
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        """Affiche un objet, ou répond 304 si rien n'a changé."""
+        return self.conditional_response(
+            super().retrieve, request, *args, **kwargs
+        )
+
+    def get_project_state(self, request):
+        """Retourne l'état (version, date de modification) de référence.
+
+        La liste des projets n'a pas de date de modification: la date
+        maximale des projets recule quand le plus récent est supprimé ou
+        quitté, et un ``If-Modified-Since`` validerait alors une liste
+        périmée. Son ETag repose sur le nombre, les identifiants et les
+        versions des projets.
+
+        Returns:
+            Tuple (version, updated_time ou None), ou None si aucun projet
+            accessible ne correspond à la requête
+        """
+        projects = Project.objects.filter(contributors__user=request.user)
+        project_pk = self.kwargs.get("project_pk")
+        if project_pk is None and self.action == "retrieve":
+            project_pk = self.kwargs.get(self.lookup_url_kwarg or "pk")
+        if project_pk is None:
+            state = projects.aggregate(
+                count=Count("pk"),
+                ids=Sum("pk"),
+                version=Sum("version"),
+                updated_time=Max("updated_time"),
+            )
+            if state["updated_time"] is None:
+                return None
+            return (
+                f"{state['count']}.{state['ids']}.{state['version']}."
+                f"{state['updated_time'].isoformat()}",
+                None,
+            )
+        return (
+            projects.filter(pk=project_pk)
+            .values_list("version", "updated_time")
+            .first()
+        )
+
+    def get_etag(self, request, version, updated_time):
+        """Calcule l'ETag fort de la représentation demandée."""
+        source = "|".join(
+            (
+                str(request.user.pk),
+                request.build_absolute_uri(),
+                request.headers.get("Accept", ""),
+                str(version),
+                updated_time.isoformat() if updated_time else "",
+            )
+        )
+        return quote_etag(hashlib.sha1(source.encode()).hexdigest())
+
+    def conditional_response(self, handler, request, *args, **kwargs):
+        """Exécute ``handler`` sauf si la représentation du client est à jour.
+
+        Args:
+            handler: Action à exécuter (list ou retrieve du parent)
+            request: La requête HTTP
+
+        Returns:
+            Réponse 304 sans corps, ou réponse de ``handler`` complétée par
+            les en-têtes ETag, Last-Modified (hors liste des projets, voir
+            ``get_last_modified``), Vary et Cache-Control
+        """
+        state = self.get_project_state(request)
+        if state is None:
+            return handler(request, *args, **kwargs)
+
+        version, updated_time = state
+        last_modified = get_last_modified(updated_time)
+        headers = HttpResponse()
+        headers["ETag"] = self.get_etag(request, version, updated_time)
+        if last_modified is not None:
+            headers["Last-Modified"] = http_date(last_modified)
+        self.patch_validation_headers(headers)
+
+        response = get_conditional_response(
+            request._request,
+            etag=headers["ETag"],
+            last_modified=last_modified,
+            response=headers,
+        )
+        if response is not headers:
+            return response
+
+        response = self.get_fresh_response(
+            handler, request, headers["ETag"], *args, **kwargs
+        )
+        if response.status_code == 200:
+            response["ETag"] = headers["ETag"]
+            if last_modified is not None:
+                response["Last-Modified"] = headers["Last-Modified"]
+            self.patch_validation_headers(response)
+        return response
+
+    def get_fresh_response(self, handler, request, etag, *args, **kwargs):
+        """Produit la réponse complète pour une représentation donnée.
+
+        Point d'extension pour les sous-classes (voir
+        ``projects.caching.ResponseCacheMixin``), ``etag`` identifiant la
+        représentation de manière unique.
+        """
+        return handler(request, *args, **kwargs)
+
+    def patch_validation_headers(self, response):
+        """Déclare la réponse privée, à revalider, et variable par client."""
+        patch_vary_headers(response, ("Accept", "Authorization"))
+        patch_cache_control(response, private=True, no_cache=True)
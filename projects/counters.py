@@ -0,0 +1,125 @@
+"""Compteurs dénormalisés des projets et des problèmes.
+
+Ce module maintient les compteurs stockés sur les modèles:
+- Project.issues_count et sa répartition par statut
+  (issues_todo_count, issues_in_progress_count, issues_finished_count)
+- Issue.comments_count
+
+Les mises à jour sont des ``UPDATE ... SET x = x + n`` atomiques via F(),
+déclenchées par les signaux de ``projects.signals`` et appelées
+explicitement par les écritures en masse qui n'émettent pas de signaux.
+``recompute_counters`` recalcule tout depuis les tables sources pour
+corriger une éventuelle dérive.
+"""
+
+from django.db.models import Count, F, IntegerField, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+
+from .models import Comment, Issue, Project
+
+STATUS_COUNT_FIELDS = {
+    "TODO": "issues_todo_count",
+    "IN_PROGRESS": "issues_in_progress_count",
+    "FINISHED": "issues_finished_count",
+}
+
+
+def adjust_issue_counts(project_id, status_deltas):
+    """Ajoute des problèmes aux compteurs d'un projet (ou en retire).
+
+    Args:
+        project_id: Identifiant du projet
+        status_deltas: Dictionnaire {statut: variation}
+    """
+    changes = {}
+    total = 0
+    for status, delta in status_deltas.items():
+        if delta:
+            field = STATUS_COUNT_FIELDS[status]
+            changes[field] = F(field) + delta
+            total += delta
+    if total:
+        changes["issues_count"] = F("issues_count") + total
+    if changes:
+        Project.objects.filter(pk=project_id).update(**changes)
+
+
+def move_issue_status(project_id, old_status, new_status, count=1):
+    """Déplace des problèmes d'un statut à un autre dans les compteurs."""
+    if old_status == new_status:
+        return
+    adjust_issue_counts(project_id, {old_status: -count, new_status: count})
+
+
+def adjust_comment_count(issue_id, delta):
+    """Ajoute des commentaires au compteur d'un problème (ou en retire)."""
+    if delta:
+        Issue.objects.filter(pk=issue_id).update(
+            comments_count=F("comments_count") + delta
+        )
+
+
+def adjust_comment_counts(deltas):
+    """Applique plusieurs variations de compteurs de commentaires.
+
+    Les problèmes sont regroupés par variation: une requête est exécutée
+    par valeur distincte, et non par problème.
+
+    Args:
+        deltas: Dictionnaire {identifiant du problème: variation}
+    """
+    by_delta = {}
+    for issue_id, delta in deltas.items():
+        if delta:
+            by_delta.setdefault(delta, []).append(issue_id)
+    for delta, issue_ids in by_delta.items():
+        Issue.objects.filter(pk__in=issue_ids).update(
+            comments_count=F("comments_count") + delta
+        )
+
+
+def _count_subquery(model, parent_field, **filters):
+    """Sous-requête comptant les lignes de ``model`` rattachées au parent."""
+    rows = (
+        model.objects.filter(**{parent_field: OuterRef("pk")}, **filters)
+        .order_by()
+        .values(parent_field)
+        .annotate(total=Count("pk"))
+        .values("total")
+    )
+    return Coalesce(Subquery(rows, output_field=IntegerField()), 0)
+
+
+def recompute_counters(dry_run=False):
+    """Recalcule tous les compteurs et corrige ceux qui ont dérivé.
+
+    Args:
+        dry_run: Si True, compte les lignes en dérive sans les corriger
+
+    Returns:
+        Dictionnaire {"projects": n, "issues": n} du nombre de lignes dont
+        les compteurs étaient faux
+    """
+    project_counts = {"issues_count": _count_subquery(Issue, "project")}
+    for status, field in STATUS_COUNT_FIELDS.items():
+        project_counts[field] = _count_subquery(
+            Issue, "project", status=status
+        )
+    issue_counts = {"comments_count": _count_subquery(Comment, "issue")}
+
+    drift = {}
+    for key, model, counts in (
+        ("projects", Project, project_counts),
+        ("issues", Issue, issue_counts),
+    ):
+        expected = {
+            f"expected_{field}": value for field, value in counts.items()
+        }
+        mismatch = Q()
+        for field in counts:
+            mismatch |= ~Q(**{field: F(f"expected_{field}")})
+        stale = model.objects.annotate(**expected).filter(mismatch)
+        drift[key] = stale.count()
+        if drift[key] and not dry_run:
+            model.objects.filter(pk__in=stale.values("pk")).update(**counts)
+    return drift
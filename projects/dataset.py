@@ -0,0 +1,322 @@
+"""Génération d'un jeu de données synthétique pour les mesures de charge.
+
+Le jeu de données reproduit les déséquilibres d'une base réelle: quelques
+projets concentrent la plupart des contributeurs, des problèmes et des
+commentaires, tandis que la majorité en a peu (répartition de Pareto).
+Les textes ont des longueurs variables (loi log-normale), bornées par
+celles des modèles.
+
+Tout le contenu est tiré d'un générateur pseudo-aléatoire initialisé par
+une graine: deux générations avec la même graine et les mêmes volumes
+produisent les mêmes données, aux identifiants et aux dates près.
+
+Les lignes sont insérées par ``bulk_create``, par lots, via
+``projects.bulk`` pour les problèmes et commentaires (compteurs et
+versions des projets tenus à jour). Le hachage d'un mot de passe étant
+volontairement lent, il n'est calculé qu'une fois par lot d'utilisateurs,
+avec un sel propre au lot: tous les comptes générés partagent le même mot
+de passe en clair.
+"""
+
+import math
+import random
+import string
+import time
+import uuid
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+
+from .bulk import create_comments, create_issues, get_batch_size
+from .models import Comment, Contributor, Issue, Project
+
+WORDS = (
+    "api authentification base bogue cache champ client code commentaire "
+    "compte configuration connexion contributeur déploiement donnée "
+    "écran erreur export fichier filtre formulaire fonction index "
+    "interface journal lecture liste mise migration mobile modèle module "
+    "navigateur page paramètre performance problème projet requête "
+    "réponse route sauvegarde serveur session statut tâche test "
+    "utilisateur valeur version vue the user cannot load when after "
+    "before should must fails returns empty slow timeout crash login "
+    "android ios backend frontend endpoint token query payload retry "
+    "le la les un une des du de et ou sur dans avec pour sans par"
+).split()
+
+# Poids des valeurs tirées pour les problèmes
+STATUS_WEIGHTS = {"TODO": 3, "IN_PROGRESS": 2, "FINISHED": 5}
+PRIORITY_WEIGHTS = {"LOW": 5, "MEDIUM": 3, "HIGH": 2}
+TAG_WEIGHTS = {"BUG": 5, "FEATURE": 3, "TASK": 4}
+
+# Exposant des répartitions de Pareto: plus il est petit, plus quelques
+# projets ou problèmes concentrent le volume
+SKEW = 1.2
+
+
+def split_skewed(rng, total, parts, alpha=SKEW):
+    """Répartit ``total`` entre ``parts`` parts de tailles très inégales.
+
+    Les poids sont tirés selon une loi de Pareto, puis arrondis par la
+    méthode du plus fort reste: la somme des parts vaut exactement
+    ``total``.
+
+    Returns:
+        Liste de ``parts`` entiers
+    """
+    if parts <= 0:
+        return []
+    weights = [rng.paretovariate(alpha) for _ in range(parts)]
+    scale = total / sum(weights)
+    shares = [weight * scale for weight in weights]
+    counts = [int(share) for share in shares]
+    remainders = sorted(
+        range(parts),
+        key=lambda index: counts[index] - shares[index],
+    )
+    for index in remainders[: total - sum(counts)]:
+        counts[index] += 1
+    return counts
+
+
+class DatasetGenerator:
+    """Génère utilisateurs, projets, contributeurs, problèmes et commentaires.
+
+    Attributes:
+        rng: Générateur pseudo-aléatoire initialisé par la graine
+        users: Nombre d'utilisateurs
+        projects: Nombre de projets
+        issues: Nombre total de problèmes
+        comments: Nombre total de commentaires
+        max_contributors: Nombre maximal de contributeurs par projet
+        password: Mot de passe en clair de tous les comptes
+        prefix: Préfixe des noms d'utilisateur
+        batch_size: Nombre de lignes par lot
+        timings: Durée de chaque étape, en secondes
+    """
+
+    def __init__(
+        self,
+        seed=0,
+        users=1000,
+        projects=100,
+        issues=10000,
+        comments=50000,
+        max_contributors=500,
+        password="Password123",
+        prefix="bench",
+        batch_size=None,
+    ):
+        self.rng = random.Random(seed)
+        self.users = users
+        self.projects = projects
+        self.issues = issues
+        self.comments = comments
+        self.max_contributors = max(1, min(max_contributors, users))
+        self.password = password
+        self.prefix = prefix
+        self.batch_size = batch_size or get_batch_size()
+        self.timings = {}
+        self.user_ids = []
+        self.members = {}
+
+    def run(self, log=None):
+        """Génère tout le jeu de données.
+
+        Args:
+            log: Fonction appelée avec un message après chaque étape
+
+        Returns:
+            Nombre de lignes créées par modèle
+        """
+        created = {}
+        for name, step in (
+            ("users", self.create_users),
+            ("projects", self.create_projects),
+            ("contributors", self.create_contributors),
+            ("issues+comments", self.create_issues_and_comments),
+        ):
+            started = time.perf_counter()
+            result = step()
+            self.timings[name] = time.perf_counter() - started
+            if isinstance(result, dict):
+                created.update(result)
+            else:
+                created[name] = result
+            if log is not None:
+                log(name, result, self.timings[name])
+        return created
+
+    def text(self, mu, sigma, max_length):
+        """Texte de longueur log-normale, tronqué à ``max_length``."""
+        count = max(1, int(self.rng.lognormvariate(mu, sigma)))
+        return " ".join(self.rng.choices(WORDS, k=count))[:max_length]
+
+    def title(self):
+        """Titre court, de 3 à 12 mots."""
+        words = self.rng.choices(WORDS, k=self.rng.randint(3, 12))
+        return " ".join(words).capitalize()[:128]
+
+    def pick(self, weights):
+        """Tire une valeur selon un dictionnaire {valeur: poids}."""
+        return self.rng.choices(list(weights), list(weights.values()))[0]
+
+    def create_users(self):
+        """Crée les utilisateurs, un hachage de mot de passe par lot."""
+        User = get_user_model()
+        alphabet = string.ascii_letters + string.digits
+        for start in range(0, self.users, self.batch_size):
+            salt = "".join(self.rng.choices(alphabet, k=22))
+            password = make_password(self.password, salt=salt)
+            batch = [
+                User(
+                    username=f"{self.prefix}{index:07d}",
+                    email=f"{self.prefix}{index:07d}@example.com",
+                    password=password,
+                    age=self.rng.randint(15, 75),
+                    can_be_contacted=self.rng.random() < 0.4,
+                    can_data_be_shared=self.rng.random() < 0.2,
+                )
+                for index in range(
+                    start, min(start + self.batch_size, self.users)
+                )
+            ]
+            with transaction.atomic():
+                created = User.objects.bulk_create(batch)
+            self.user_ids.extend(user.pk for user in created)
+        return self.users
+
+    def create_projects(self):
+        """Crée les projets, chacun avec un auteur tiré au hasard."""
+        types = [choice for choice, _ in Project.TYPE_CHOICES]
+        projects = [
+            Project(
+                title=self.title(),
+                description=self.text(3.5, 0.8, 2048),
+                type=self.rng.choice(types),
+                author_id=self.rng.choice(self.user_ids),
+            )
+            for _ in range(self.projects)
+        ]
+        with transaction.atomic():
+            projects = Project.objects.bulk_create(
+                projects, batch_size=self.batch_size
+            )
+        self.members = {
+            project.pk: [project.author_id] for project in projects
+        }
+        return self.projects
+
+    def create_contributors(self):
+        """Ajoute à chaque projet son auteur et des contributeurs.
+
+        Le nombre de contributeurs suit une loi de Pareto: la plupart des
+        projets en ont un ou deux, quelques-uns plusieurs centaines.
+        """
+        total = 0
+        contributors = []
+        for project_id, members in self.members.items():
+            author_id = members[0]
+            size = min(
+                self.max_contributors,
+                math.ceil(self.rng.paretovariate(SKEW)),
+            )
+            others = [
+                user_id
+                for user_id in self.rng.sample(self.user_ids, size)
+                if user_id != author_id
+            ][: size - 1]
+            members.extend(others)
+            contributors.append(
+                Contributor(
+                    user_id=author_id, project_id=project_id, role="AUTHOR"
+                )
+            )
+            contributors.extend(
+                Contributor(user_id=user_id, project_id=project_id)
+                for user_id in others
+            )
+            if len(contributors) >= self.batch_size:
+                total += self.save_contributors(contributors)
+                contributors = []
+        return total + self.save_contributors(contributors)
+
+    def save_contributors(self, contributors):
+        """Insère un lot de contributeurs."""
+        with transaction.atomic():
+            Contributor.objects.bulk_create(
+                contributors, batch_size=self.batch_size
+            )
+        return len(contributors)
+
+    def create_issues_and_comments(self):
+        """Crée les problèmes puis leurs commentaires, projet par projet.
+
+        Problèmes et commentaires sont répartis de façon inégale entre les
+        projets, puis les commentaires d'un projet entre ses problèmes.
+        Les commentaires d'un lot de problèmes sont écrits aussitôt après
+        lui: la mémoire utilisée ne dépend que de la taille des lots.
+        """
+        project_ids = list(self.members)
+        issue_counts = split_skewed(self.rng, self.issues, len(project_ids))
+        comment_counts = [0] * len(project_ids)
+        with_issues = [
+            index for index, count in enumerate(issue_counts) if count
+        ]
+        for index, count in zip(
+            with_issues,
+            split_skewed(self.rng, self.comments, len(with_issues)),
+        ):
+            comment_counts[index] = count
+
+        issues = comments = 0
+        for project_id, issue_count, comment_count in zip(
+            project_ids, issue_counts, comment_counts
+        ):
+            members = self.members[project_id]
+            per_issue = split_skewed(self.rng, comment_count, issue_count)
+            for start in range(0, issue_count, self.batch_size):
+                batch = [
+                    self.build_issue(project_id, members)
+                    for _ in range(min(self.batch_size, issue_count - start))
+                ]
+                created = create_issues(batch)
+                issues += len(created)
+                new_comments = [
+                    self.build_comment(issue.pk, members)
+                    for issue, count in zip(
+                        created, per_issue[start : start + len(created)]
+                    )
+                    for _ in range(count)
+                ]
+                for offset in range(0, len(new_comments), self.batch_size):
+                    comments += len(
+                        create_comments(
+                            new_comments[offset : offset + self.batch_size]
+                        )
+                    )
+        return {"issues": issues, "comments": comments}
+
+    def build_issue(self, project_id, members):
+        """Construit un problème non sauvegardé."""
+        return Issue(
+            project_id=project_id,
+            title=self.title(),
+            description=self.text(3.5, 0.8, 2048),
+            status=self.pick(STATUS_WEIGHTS),
+            priority=self.pick(PRIORITY_WEIGHTS),
+            tag=self.pick(TAG_WEIGHTS),
+            author_id=self.rng.choice(members),
+            assignee_id=(
+                self.rng.choice(members) if self.rng.random() < 0.8 else None
+            ),
+        )
+
+    def build_comment(self, issue_id, members):
+        """Construit un commentaire non sauvegardé."""
+        return Comment(
+            issue_id=issue_id,
+            description=self.text(2.8, 0.9, 2048),
+            author_id=self.rng.choice(members),
+            uuid=uuid.UUID(int=self.rng.getrandbits(128), version=4),
+        )
@@ -0,0 +1,129 @@
+"""Export d'un projet au format NDJSON (un objet JSON par ligne).
+
+Le flux commence par une ligne décrivant le projet, suivie de chaque
+problème puis de ses commentaires, dans l'ordre des identifiants:
+
+    {"type": "project", "id": 1, "title": "...", ...}
+    {"type": "issue", "id": 7, "title": "...", "author": "alice", ...}
+    {"type": "comment", "id": 31, "issue": 7, "author": "bob", ...}
+
+Problèmes et commentaires sont lus par deux curseurs ``.iterator()`` triés
+par problème et fusionnés au fil de l'eau: la mémoire utilisée ne dépend
+pas de la taille du projet. Les utilisateurs sont désignés par leur nom,
+ce qui rend le flux réimportable dans une autre base.
+"""
+
+from django.conf import settings
+
+from .models import Comment, Issue
+from .renderers import dumps
+
+ISSUE_FIELDS = {
+    "id": "id",
+    "title": "title",
+    "description": "description",
+    "tag": "tag",
+    "priority": "priority",
+    "status": "status",
+    "author": "author__username",
+    "assignee": "assignee__username",
+    "created_time": "created_time",
+    "updated_time": "updated_time",
+}
+
+COMMENT_FIELDS = {
+    "id": "id",
+    "uuid": "uuid",
+    "issue": "issue_id",
+    "description": "description",
+    "author": "author__username",
+    "created_time": "created_time",
+    "updated_time": "updated_time",
+}
+
+
+def get_chunk_size():
+    """Nombre de lignes lues par aller-retour avec la base."""
+    return getattr(settings, "EXPORT_CHUNK_SIZE", 2000)
+
+
+def _rows(queryset, fields, record_type):
+    """Itère sur les lignes de ``queryset`` sous forme de dictionnaires."""
+    names = list(fields)
+    for values in queryset.values_list(*fields.values()).iterator(
+        chunk_size=get_chunk_size()
+    ):
+        row = {"type": record_type}
+        row.update(zip(names, values))
+        yield row
+
+
+def export_records(project, since=None):
+    """Itère sur les enregistrements à exporter pour un projet.
+
+    Args:
+        project: Projet à exporter
+        since: Si fourni, seuls les problèmes et commentaires créés ou
+            modifiés depuis cette date sont exportés
+
+    Yields:
+        Dictionnaires ``{"type": ..., ...}`` dans l'ordre du flux
+    """
+    yield {
+        "type": "project",
+        "id": project.pk,
+        "title": project.title,
+        "description": project.description,
+        "project_type": project.type,
+        "created_time": project.created_time,
+        "updated_time": project.updated_time,
+        "since": since,
+    }
+
+    issues = Issue.objects.filter(project=project).order_by("id")
+    comments = Comment.objects.filter(issue__project=project).order_by(
+        "issue_id", "id"
+    )
+    if since is not None:
+        issues = issues.filter(updated_time__gte=since)
+        comments = comments.filter(updated_time__gte=since)
+
+    # Avec ``since``, un commentaire récent peut concerner un problème qui
+    # ne l'est pas: il est alors émis seul, à sa place dans l'ordre
+    comment_rows = _rows(comments, COMMENT_FIELDS, "comment")
+    comment = next(comment_rows, None)
+    for issue in _rows(issues, ISSUE_FIELDS, "issue"):
+        while comment is not None and comment["issue"] < issue["id"]:
+            yield comment
+            comment = next(comment_rows, None)
+        yield issue
+        while comment is not None and comment["issue"] == issue["id"]:
+            yield comment
+            comment = next(comment_rows, None)
+    while comment is not None:
+        yield comment
+        comment = next(comment_rows, None)
+
+
+def export_ndjson(project, since=None):
+    """Itère sur les lignes NDJSON de l'export, encodées en UTF-8.
+
+    Les dates et UUID sont encodés par ``projects.renderers.dumps``.
+    """
+    for record in export_records(project, since):
+        yield dumps(record) + b"\n"
+
+
+def buffered(chunks, buffer_size=64 * 1024):
+    """Regroupe les lignes en blocs d'environ ``buffer_size`` octets."""
+    pending = []
+    size = 0
+    for chunk in chunks:
+        pending.append(chunk)
+        size += len(chunk)
+        if size >= buffer_size:
+            yield b"".join(pending)
+            pending = []
+            size = 0
+    if pending:
+        yield b"".join(pending)
@@ -0,0 +1,240 @@
+"""Réponses partielles de l'API: paramètres ``?fields=`` et ``?omit=``.
+
+Un client peut restreindre les champs d'une réponse en lecture:
+- ``?fields=id,title,author.username`` ne garde que les champs listés;
+  un chemin pointé désigne un champ d'un objet imbriqué, et un objet
+  imbriqué listé sans chemin est gardé en entier
+- ``?omit=description,contributors.user.email`` retire les champs listés
+
+Les champs écartés sont retirés du sérialiseur avant la sérialisation
+(``SparseFieldsetMixin``): un ``SerializerMethodField`` écarté n'est pas
+appelé et n'exécute donc pas ses requêtes. Côté base, ``defer_unused``
+restreint le queryset par ``.only()`` aux colonnes lues par les champs
+restants (``SparseQuerysetMixin`` pour les ViewSets).
+
+Les champs inconnus sont ignorés. Les requêtes d'écriture ne sont pas
+concernées: leurs sérialiseurs gardent tous leurs champs.
+"""
+
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
+
+FIELDS_PARAM = "fields"
+OMIT_PARAM = "omit"
+
+# Clé du contexte portant le chemin d'un sérialiseur créé par un
+# SerializerMethodField, hors de l'arbre des champs de son parent
+PATH_CONTEXT_KEY = "sparse_path"
+
+
+def parse_paths(values):
+    """Convertit des valeurs ``a,b.c`` en ensemble de chemins.
+
+    Returns:
+        Ensemble de tuples de noms: {("a",), ("b", "c")}
+    """
+    return {
+        tuple(part for part in item.strip().split(".") if part)
+        for value in values
+        for item in value.split(",")
+        if item.strip()
+    }
+
+
+def get_sparse_paths(request):
+    """Chemins demandés et écartés par une requête de lecture.
+
+    Returns:
+        Tuple (chemins de ``fields``, chemins de ``omit``), vides hors
+        d'une requête de lecture
+    """
+    if request is None or request.method not in SAFE_METHODS:
+        return set(), set()
+    params = getattr(request, "query_params", request.GET)
+    return (
+        parse_paths(params.getlist(FIELDS_PARAM)),
+        parse_paths(params.getlist(OMIT_PARAM)),
+    )
+
+
+def select_names(only, path):
+    """Noms des champs à garder au niveau ``path`` de la représentation.
+
+    Returns:
+        Ensemble de noms, ou None pour garder tous les champs (aucune
+        restriction, ou objet demandé en entier)
+    """
+    if not only:
+        return None
+    depth = len(path)
+    if any(entry == path[: len(entry)] for entry in only):
+        return None
+    names = {
+        entry[depth]
+        for entry in only
+        if len(entry) > depth and entry[:depth] == path
+    }
+    return names or None
+
+
+class SparseFieldsetMixin:
+    """Retire d'un sérialiseur les champs écartés par la requête.
+
+    Le chemin du sérialiseur dans la représentation est déduit de ses
+    parents; un sérialiseur créé par un ``SerializerMethodField`` doit
+    recevoir ``nested_context(nom du champ)`` comme contexte.
+
+    Dans ``Meta.sparse_sources``, chaque ``SerializerMethodField`` déclare
+    les colonnes du modèle qu'il lit, pour ``defer_unused``.
+    """
+
+    @property
+    def sparse_path(self):
+        """Chemin du sérialiseur depuis la racine de la représentation."""
+        names = []
+        node = self
+        while node.parent is not None:
+            if node.field_name:
+                names.append(node.field_name)
+            node = node.parent
+        prefix = tuple(self.context.get(PATH_CONTEXT_KEY, ()))
+        return prefix + tuple(reversed(names))
+
+    def nested_context(self, field_name):
+        """Contexte d'un sérialiseur créé pour le champ ``field_name``."""
+        return {
+            **self.context,
+            PATH_CONTEXT_KEY: self.sparse_path + (field_name,),
+        }
+
+    def get_fields(self):
+        """Champs du sérialiseur, sans ceux écartés par la requête.
+
+        Returns:
+            Dictionnaire {nom: champ} des champs gardés à ce niveau de la
+            représentation
+        """
+        fields = super().get_fields()
+        only, omit = get_sparse_paths(self.context.get("request"))
+        if not only and not omit:
+            return fields
+        path = self.sparse_path
+        selected = select_names(only, path)
+        return {
+            name: field
+            for name, field in fields.items()
+            if (selected is None or name in selected)
+            and path + (name,) not in omit
+        }
+
+
+def sparse_columns(serializer, model, related):
+    """Colonnes du modèle lues par les champs restants d'un sérialiseur.
+
+    Args:
+        serializer: Sérialiseur (ou sérialiseur de liste) déjà restreint
+        model: Modèle sérialisé
+        related: Arbre ``select_related`` du queryset ({} si aucun)
+
+    Returns:
+        Ensemble de noms utilisables par ``QuerySet.only()``, ou None si
+        un champ ne peut pas être rapporté à des colonnes
+    """
+    if isinstance(serializer, serializers.ListSerializer):
+        serializer = serializer.child
+    meta = getattr(serializer, "Meta", None)
+    sources = getattr(meta, "sparse_sources", {})
+    related = related if isinstance(related, dict) else {}
+    # Une relation jointe ne peut pas être différée
+    columns = set(related)
+    for name, field in serializer.fields.items():
+        if name in sources:
+            columns.update(sources[name])
+            continue
+        if isinstance(field, serializers.SerializerMethodField):
+            return None
+        if field.source == "*":
+            return None
+        attname = field.source_attrs[0]
+        try:
+            model_field = model._meta.get_field(attname)
+        except FieldDoesNotExist:
+            return None
+        if not model_field.concrete:
+            return None
+        columns.add(attname)
+        if (
+            isinstance(field, serializers.BaseSerializer)
+            and attname in related
+        ):
+            nested = sparse_columns(
+                field, model_field.related_model, related[attname]
+            )
+            if nested is None:
+                return None
+            columns.update(f"{attname}__{column}" for column in nested)
+    return columns
+
+
+def defer_unused(queryset, serializer, required=()):
+    """Restreint un queryset aux colonnes lues par un sérialiseur.
+
+    Args:
+        queryset: Queryset des objets sérialisés
+        serializer: Sérialiseur restreint par la requête
+        required: Colonnes lues ailleurs (pagination, permissions...)
+
+    Returns:
+        Le queryset limité par ``.only()``, ou inchangé si les colonnes
+        lues ne peuvent pas être déterminées
+    """
+    columns = sparse_columns(
+        serializer, queryset.model, queryset.query.select_related
+    )
+    if columns is None:
+        return queryset
+    return queryset.only(*columns, *required)
+
+
+class SparseQuerysetMixin:
+    """Diffère, dans les ViewSets, les colonnes des champs écartés.
+
+    S'applique aux actions ``list`` et ``retrieve``; ``keeps_field``
+    permet à ``get_queryset`` de ne joindre ou précharger que les
+    relations affichées.
+
+    Attributes:
+        sparse_required_fields: Colonnes toujours chargées, en plus de
+            celles des champs restants et de la clé de pagination
+    """
+
+    sparse_required_fields = ()
+
+    def sparse_requested(self):
+        """Indique si la requête restreint les champs de la réponse."""
+        only, omit = get_sparse_paths(self.request)
+        return bool(only or omit)
+
+    def keeps_field(self, name):
+        """Indique si le champ ``name`` figure dans la réponse."""
+        if not self.sparse_requested():
+            return True
+        if not hasattr(self, "_sparse_fields"):
+            self._sparse_fields = set(self.get_serializer().fields)
+        return name in self._sparse_fields
+
+    def filter_queryset(self, queryset):
+        """Filtre le queryset, puis diffère les colonnes non affichées.
+
+        Seules les actions ``list`` et ``retrieve`` d'une requête qui
+        restreint ses champs sont concernées.
+        """
+        queryset = super().filter_queryset(queryset)
+        if self.action not in ("list", "retrieve"):
+            return queryset
+        if not self.sparse_requested():
+            return queryset
+        required = tuple(self.sparse_required_fields)
+        required += tuple(getattr(self.paginator, "ordering", ()) or ())
+        return defer_unused(queryset, self.get_serializer(), required)
@@ -0,0 +1,163 @@
+"""Filtres pour l'application de projets.
+
+Ce module définit les backends de filtrage utilisés par les ViewSets:
+- IssueFilterBackend: Filtre la liste des problèmes côté serveur
+- IssueOrderingFilter: Trie la liste des problèmes avec un ordre stable
+"""
+
+from datetime import datetime, time
+
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend, OrderingFilter
+
+from .models import Issue
+
+
+class IssueFilterBackend(BaseFilterBackend):
+    """Filtre la liste des problèmes selon les paramètres de la requête.
+
+    Paramètres acceptés (les valeurs multiples sont séparées par des
+    virgules):
+    - status, priority, tag: Une ou plusieurs valeurs parmi les choix
+      du modèle Issue
+    - assignee, author: Identifiant d'utilisateur, ``me`` pour
+      l'utilisateur connecté, ou ``none`` (assignee uniquement)
+    - created_after, created_before: Date ou date-heure ISO 8601
+
+    Chaque combinaison courante est servie par un index composite déclaré
+    sur Issue (voir ``Issue.Meta.indexes``). Le filtrage ne s'applique
+    qu'à la liste, pour ne pas masquer un problème consulté par son id.
+    """
+
+    choice_params = {
+        "status": Issue.STATUS_CHOICES,
+        "priority": Issue.PRIORITY_CHOICES,
+        "tag": Issue.TAG_CHOICES,
+    }
+    user_params = ("assignee", "author")
+
+    def filter_queryset(self, request, queryset, view):
+        """Applique les filtres présents dans la requête."""
+        if getattr(view, "action", None) != "list":
+            return queryset
+        params = request.query_params
+
+        for name, choices in self.choice_params.items():
+            if name in params:
+                values = self.parse_choices(name, params[name], choices)
+                queryset = queryset.filter(**{f"{name}__in": values})
+
+        for name in self.user_params:
+            if name in params:
+                queryset = self.filter_user(
+                    queryset, request, name, params[name]
+                )
+
+        if "created_after" in params:
+            queryset = queryset.filter(
+                created_time__gte=self.parse_time(
+                    "created_after", params["created_after"]
+                )
+            )
+        if "created_before" in params:
+            queryset = queryset.filter(
+                created_time__lt=self.parse_time(
+                    "created_before", params["created_before"]
+                )
+            )
+        return queryset
+
+    def parse_choices(self, name, raw, choices):
+        """Valide une liste de valeurs séparées par des virgules.
+
+        Raises:
+            ValidationError: Si une valeur ne fait pas partie des choix
+        """
+        allowed = {value for value, _ in choices}
+        values = [value.strip().upper() for value in raw.split(",") if value]
+        invalid = [value for value in values if value not in allowed]
+        if invalid or not values:
+            raise ValidationError(
+                {
+                    name: "Valeur invalide. Choix possibles: "
+                    + ", ".join(sorted(allowed))
+                }
+            )
+        return values
+
+    def filter_user(self, queryset, request, name, raw):
+        """Filtre sur un utilisateur (auteur ou assigné).
+
+        Raises:
+            ValidationError: Si la valeur n'est pas un identifiant valide
+        """
+        value = raw.strip().lower()
+        if value == "me":
+            return queryset.filter(**{f"{name}_id": request.user.pk})
+        if value == "none" and name == "assignee":
+            return queryset.filter(assignee__isnull=True)
+        try:
+            return queryset.filter(**{f"{name}_id": int(value)})
+        except ValueError:
+            raise ValidationError(
+                {name: "Identifiant d'utilisateur invalide."}
+            )
+
+    def parse_time(self, name, raw):
+        """Convertit une date ou une date-heure ISO 8601 en date-heure.
+
+        Une date seule désigne minuit dans le fuseau horaire courant.
+
+        Raises:
+            ValidationError: Si la valeur n'est pas une date valide
+        """
+        try:
+            value = parse_datetime(raw)
+            if value is None:
+                day = parse_date(raw)
+                if day is not None:
+                    value = datetime.combine(day, time.min)
+        except ValueError:
+            value = None
+        if value is None:
+            raise ValidationError(
+                {name: "Date invalide, format ISO 8601 attendu."}
+            )
+        if timezone.is_naive(value):
+            value = timezone.make_aware(value)
+        return value
+
+
+class IssueOrderingFilter(OrderingFilter):
+    """Tri de la liste des problèmes via ``?ordering=``.
+
+    L'identifiant est ajouté en dernier critère pour que l'ordre soit total
+    et la pagination stable. La pagination par curseur impose son propre
+    ordre ``(created_time, id)`` et ignore ce paramètre.
+
+    ``priority`` et ``status`` suivent l'ordre de leurs choix (LOW, MEDIUM,
+    HIGH; TODO, IN_PROGRESS, FINISHED), par leurs rangs stockés et
+    indexés (``Issue.priority_rank``, ``Issue.status_rank``).
+    """
+
+    ordering_fields = ("created_time", "priority", "status", "id")
+    ranked_fields = {"priority": "priority_rank", "status": "status_rank"}
+
+    def get_ordering(self, request, queryset, view):
+        """Retourne l'ordre demandé, complété par l'identifiant."""
+        ordering = super().get_ordering(request, queryset, view)
+        if ordering:
+            ordering = [self.ranked_term(term) for term in ordering]
+        if ordering and not {"id", "-id"} & set(ordering):
+            ordering = list(ordering) + ["id"]
+        return ordering
+
+    def ranked_term(self, term):
+        """Remplace un champ à choix par son rang, en gardant le sens."""
+        descending = term.startswith("-")
+        name = term.lstrip("-")
+        if name not in self.ranked_fields:
+            return term
+        return ("-" if descending else "") + self.ranked_fields[name]
@@ -0,0 +1,410 @@
+"""Import en masse de problèmes et de commentaires (NDJSON ou CSV).
+
+Le format NDJSON est celui de l'export (voir ``projects.export``): une
+ligne ``{"type": "issue", ...}`` par problème et ``{"type": "comment",
+...}`` par commentaire, la ligne ``project`` étant ignorée. En CSV, une
+colonne ``type`` distingue les deux; sans elle, chaque ligne est un
+problème. Les colonnes reprennent les noms des champs de l'export:
+
+- problème: ``id`` (identifiant d'origine, facultatif), ``title``,
+  ``description``, ``tag``, ``priority``, ``status``, ``author``,
+  ``assignee``
+- commentaire: ``issue`` (identifiant d'origine du problème, importé plus
+  haut dans le même fichier), ``description``, ``author``
+
+Les utilisateurs sont désignés par leur nom, et doivent être
+contributeurs du projet. Si l'importateur reçoit un auteur (l'utilisateur
+qui envoie le fichier à l'API), il est l'auteur de tout ce qui est importé
+et la colonne ``author`` est ignorée. Le fichier est lu ligne par
+ligne et traité par lots: chaque lot est validé, ses noms d'utilisateur
+résolus en une requête (les noms déjà connus ne sont pas redemandés),
+puis écrit par ``bulk_create`` dans sa propre transaction. Un point de
+reprise peut être enregistré après chaque lot pour reprendre un import
+interrompu là où il s'est arrêté.
+"""
+
+import codecs
+import csv
+import json
+import os
+from itertools import islice
+
+from django.conf import settings
+from django.db import transaction
+
+from .bulk import create_comments, create_issues
+from .models import Comment, Contributor, Issue
+from .renderers import loads
+
+FORMATS = ("ndjson", "csv")
+
+# Nombre maximal d'erreurs détaillées conservées dans le rapport (les
+# suivantes sont seulement comptées)
+MAX_REPORTED_ERRORS = 100
+
+
+def get_import_batch_size():
+    """Nombre de lignes validées et écrites par transaction."""
+    return getattr(settings, "IMPORT_BATCH_SIZE", 2000)
+
+
+def guess_format(filename):
+    """Déduit le format du nom de fichier (NDJSON par défaut)."""
+    if filename and filename.lower().endswith(".csv"):
+        return "csv"
+    return "ndjson"
+
+
+def is_utf8(stream, chunk_size=1 << 20):
+    """Indique si un flux binaire est entièrement du texte UTF-8.
+
+    Le flux est lu par blocs puis ramené au début: un fichier mal encodé
+    est refusé avant l'écriture du premier lot.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    try:
+        while True:
+            chunk = stream.read(chunk_size)
+            decoder.decode(chunk, final=not chunk)
+            if not chunk:
+                return True
+    except UnicodeDecodeError:
+        return False
+    finally:
+        stream.seek(0)
+
+
+def read_records(stream, file_format, skip=0):
+    """Lit les enregistrements d'un flux texte, au fil de l'eau.
+
+    Args:
+        stream: Flux texte (fichier ouvert, fichier téléversé décodé, etc.)
+        file_format: "ndjson" ou "csv"
+        skip: Nombre d'enregistrements déjà importés à sauter
+
+    Yields:
+        Tuples (numéro de ligne, dictionnaire ou None si la ligne n'est pas
+        un objet JSON valide)
+    """
+    if file_format == "csv":
+        reader = csv.DictReader(stream)
+        for record in islice(reader, skip, None):
+            yield reader.line_num, record
+        return
+
+    lines = (
+        (number, line)
+        for number, line in enumerate(stream, start=1)
+        if line.strip()
+    )
+    for number, line in islice(lines, skip, None):
+        try:
+            record = loads(line)
+        except ValueError:
+            record = None
+        yield number, record if isinstance(record, dict) else None
+
+
+class Checkpoint:
+    """Point de reprise d'un import, enregistré dans un fichier.
+
+    Le fichier est un journal NDJSON complété après chaque lot écrit: il
+    contient le nombre d'enregistrements traités et la correspondance entre
+    identifiants d'origine et identifiants créés pour les problèmes du lot,
+    nécessaire pour rattacher les commentaires des lots suivants. Il est
+    écrit juste après la validation de la transaction du lot: une
+    interruption entre les deux peut au pire faire réimporter ce lot.
+
+    Attributes:
+        path: Chemin du fichier de reprise
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+    def load(self):
+        """Relit le point de reprise.
+
+        Returns:
+            Tuple (nombre d'enregistrements traités, correspondance
+            {identifiant d'origine: identifiant créé}); (0, {}) si aucun
+            lot n'a encore été enregistré
+        """
+        position = 0
+        issue_ids = {}
+        try:
+            with open(self.path, encoding="utf-8") as journal:
+                for line in journal:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # Dernière ligne tronquée par une interruption
+                        break
+                    position = entry["position"]
+                    issue_ids.update(entry["issues"])
+        except FileNotFoundError:
+            pass
+        return position, issue_ids
+
+    def save(self, position, issue_ids):
+        """Ajoute un lot traité au journal."""
+        with open(self.path, "a", encoding="utf-8") as journal:
+            journal.write(
+                json.dumps({"position": position, "issues": issue_ids}) + "\n"
+            )
+            journal.flush()
+
+    def clear(self):
+        """Supprime le journal à la fin d'un import réussi."""
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+
+class IssueImporter:
+    """Importe des problèmes et commentaires dans un projet, par lots.
+
+    Attributes:
+        project: Projet de destination
+        author: Auteur de tous les problèmes et commentaires importés, ou
+            None pour reprendre la colonne ``author`` du fichier
+        batch_size: Nombre d'enregistrements par lot
+        checkpoint: Point de reprise (Checkpoint) ou None
+        issue_ids: Correspondance {identifiant d'origine: identifiant créé}
+        position: Nombre d'enregistrements traités
+        issues: Nombre de problèmes créés
+        comments: Nombre de commentaires créés
+        errors: Erreurs détaillées (ligne, erreurs), les premières seulement
+        error_count: Nombre total de lignes refusées
+    """
+
+    ISSUE_FIELDS = ("title", "description", "tag", "priority", "status")
+    COMMENT_FIELDS = ("description",)
+
+    def __init__(self, project, batch_size=None, checkpoint=None, author=None):
+        self.project = project
+        self.author = author
+        self.batch_size = batch_size or get_import_batch_size()
+        self.checkpoint = checkpoint
+        self.issue_ids = {}
+        self.position = 0
+        self.issues = 0
+        self.comments = 0
+        self.errors = []
+        self.error_count = 0
+        self.user_ids = {}
+        self.rules = {
+            model: {
+                field.name: (
+                    not (field.has_default() or field.blank),
+                    field.max_length,
+                    {choice for choice, _ in field.choices or ()},
+                )
+                for field in model._meta.concrete_fields
+                if field.name in fields
+            }
+            for model, fields in (
+                (Issue, self.ISSUE_FIELDS),
+                (Comment, self.COMMENT_FIELDS),
+            )
+        }
+
+    def resume(self):
+        """Reprend au dernier point enregistré.
+
+        Returns:
+            Nombre d'enregistrements à sauter dans le fichier
+        """
+        if self.checkpoint is not None:
+            self.position, self.issue_ids = self.checkpoint.load()
+        return self.position
+
+    def run(self, records):
+        """Importe tous les enregistrements, lot par lot.
+
+        Args:
+            records: Itérable de tuples (numéro de ligne, enregistrement),
+                tel que produit par ``read_records``
+
+        Returns:
+            Le rapport d'import (voir ``report``)
+        """
+        records = iter(records)
+        while True:
+            batch = list(islice(records, self.batch_size))
+            if not batch:
+                break
+            self.import_batch(batch)
+        if self.checkpoint is not None:
+            self.checkpoint.clear()
+        return self.report()
+
+    def report(self):
+        """Résumé de l'import."""
+        return {
+            "issues": self.issues,
+            "comments": self.comments,
+            "error_count": self.error_count,
+            "errors": sorted(self.errors, key=lambda error: error["line"]),
+        }
+
+    def import_batch(self, batch):
+        """Valide et écrit un lot d'enregistrements.
+
+        Les problèmes du lot sont écrits avant ses commentaires, pour que
+        ceux-ci puissent viser un problème importé dans le même lot.
+        """
+        self.resolve_users(batch)
+
+        issues = []
+        comments = []
+        for number, record in batch:
+            record_type = (record or {}).get("type") or "issue"
+            if record is None:
+                self.add_error(number, {"error": "Ligne JSON invalide."})
+            elif record_type == "issue":
+                issues.append((number, record))
+            elif record_type == "comment":
+                comments.append((number, record))
+            elif record_type != "project":
+                self.add_error(
+                    number, {"type": f"Type inconnu: {record_type}."}
+                )
+
+        with transaction.atomic():
+            new_issues = []
+            for number, record in issues:
+                issue = self.build_issue(number, record)
+                if issue is not None:
+                    new_issues.append((record.get("id"), issue))
+            created = create_issues([issue for _, issue in new_issues])
+            batch_ids = {
+                str(source_id): issue.pk
+                for (source_id, _), issue in zip(new_issues, created)
+                if source_id not in (None, "")
+            }
+            self.issue_ids.update(batch_ids)
+            self.issues += len(created)
+
+            new_comments = []
+            for number, record in comments:
+                comment = self.build_comment(number, record)
+                if comment is not None:
+                    new_comments.append(comment)
+            self.comments += len(create_comments(new_comments))
+
+        self.position += len(batch)
+        if self.checkpoint is not None:
+            self.checkpoint.save(self.position, batch_ids)
+
+    def resolve_users(self, batch):
+        """Charge en une requête les contributeurs du lot encore inconnus.
+
+        Les noms d'utilisateurs qui ne contribuent pas au projet restent
+        inconnus: les lignes qui les citent sont refusées.
+        """
+        fields = ("assignee",) if self.author else ("author", "assignee")
+        usernames = set()
+        for _, record in batch:
+            if record:
+                usernames.update(record.get(field) for field in fields)
+        usernames -= self.user_ids.keys()
+        usernames.discard(None)
+        usernames.discard("")
+        if usernames:
+            self.user_ids.update(
+                Contributor.objects.filter(
+                    project=self.project, user__username__in=usernames
+                ).values_list("user__username", "user_id")
+            )
+
+    def build_issue(self, number, record):
+        """Construit un problème à partir d'un enregistrement valide.
+
+        Returns:
+            Instance Issue non sauvegardée, ou None si l'enregistrement est
+            refusé (l'erreur est alors ajoutée au rapport)
+        """
+        values, errors = self.clean_fields(Issue, record)
+        values["author_id"] = self.get_user_id(record, "author", errors)
+        assignee = record.get("assignee")
+        values["assignee_id"] = (
+            self.get_user_id(record, "assignee", errors) if assignee else None
+        )
+        if errors:
+            self.add_error(number, errors)
+            return None
+        return Issue(project=self.project, **values)
+
+    def build_comment(self, number, record):
+        """Construit un commentaire à partir d'un enregistrement valide.
+
+        Returns:
+            Instance Comment non sauvegardée, ou None si l'enregistrement
+            est refusé
+        """
+        values, errors = self.clean_fields(Comment, record)
+        values["author_id"] = self.get_user_id(record, "author", errors)
+        values["issue_id"] = self.issue_ids.get(str(record.get("issue")))
+        if values["issue_id"] is None:
+            errors["issue"] = "Problème inconnu dans ce fichier."
+        if errors:
+            self.add_error(number, errors)
+            return None
+        return Comment(**values)
+
+    def clean_fields(self, model, record):
+        """Vérifie les champs texte d'un enregistrement.
+
+        Seules les contraintes des champs du modèle (obligatoire, longueur
+        maximale, choix) sont vérifiées, sans passer par un sérialiseur, ce
+        qui suffit pour des champs texte et reste rapide sur de gros
+        volumes. Un champ absent prend la valeur par défaut du modèle.
+
+        Returns:
+            Tuple (valeurs nettoyées, erreurs par champ)
+        """
+        values = {}
+        errors = {}
+        for name, (required, max_length, choices) in self.rules[model].items():
+            value = record.get(name)
+            if value in (None, ""):
+                if required:
+                    errors[name] = "Ce champ est obligatoire."
+                continue
+            value = str(value)
+            if max_length and len(value) > max_length:
+                errors[name] = (
+                    f"Au plus {max_length} caractères sont autorisés."
+                )
+            elif choices and value not in choices:
+                errors[name] = f"« {value} » n'est pas un choix valide."
+            else:
+                values[name] = value
+        return values, errors
+
+    def get_user_id(self, record, field, errors):
+        """Retourne l'identifiant du contributeur nommé dans ``field``.
+
+        L'auteur imposé à l'importateur, s'il y en a un, remplace la
+        colonne ``author``.
+        """
+        if field == "author" and self.author is not None:
+            return self.author.pk
+        username = record.get(field)
+        user_id = self.user_ids.get(username)
+        if user_id is None:
+            errors[field] = (
+                f"Utilisateur inconnu ou non contributeur du projet: "
+                f"{username}."
+                if username
+                else "Ce champ est obligatoire."
+            )
+        return user_id
+
+    def add_error(self, number, errors):
+        """Ajoute une ligne refusée au rapport."""
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"line": number, "errors": errors})
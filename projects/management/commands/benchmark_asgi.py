@@ -0,0 +1,256 @@
+"""Commande de comparaison des lectures servies en WSGI et en ASGI."""
+
+import asyncio
+import io
+import json
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from itertools import cycle, islice
+
+from django.core.handlers.asgi import ASGIHandler
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Count
+from rest_framework_simplejwt.tokens import AccessToken
+
+from projects.models import Project
+
+HOST = "localhost"
+
+
+class Command(BaseCommand):
+    """Mesure le débit des routes de lecture servies en WSGI puis en ASGI.
+
+    Les mêmes requêtes (liste et détail des projets, des problèmes, liste
+    des commentaires) sont envoyées, sur les mêmes données, aux vues
+    synchrones par le handler WSGI de Django, exécuté par un nombre fixe de
+    threads comme un serveur WSGI multi-thread, puis aux vues asynchrones
+    (``/api/async/``) par le handler ASGI, sur une seule boucle
+    d'évènements. ``--client-delay`` simule des clients lents qui mettent
+    du temps à recevoir la réponse: un thread WSGI reste alors occupé,
+    une connexion ASGI non.
+    """
+
+    help = (
+        "Compare le débit des lectures de l'API servies en WSGI (vues "
+        "synchrones) et en ASGI (vues asynchrones) sur les mêmes données."
+    )
+
+    def add_arguments(self, parser):
+        """Ajoute les paramètres de la mesure."""
+        parser.add_argument(
+            "--project",
+            type=int,
+            help="Projet lu (par défaut, celui qui a le plus de problèmes).",
+        )
+        parser.add_argument(
+            "--requests",
+            type=int,
+            default=500,
+            help="Nombre de requêtes par mode (500 par défaut).",
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=50,
+            help="Nombre de clients simultanés (50 par défaut).",
+        )
+        parser.add_argument(
+            "--threads",
+            type=int,
+            default=8,
+            help="Nombre de threads du serveur WSGI simulé (8 par défaut).",
+        )
+        parser.add_argument(
+            "--client-delay",
+            type=float,
+            default=0.0,
+            help="Temps de réception de chaque réponse par le client, en "
+            "secondes (0 par défaut).",
+        )
+        parser.add_argument(
+            "--json",
+            action="store_true",
+            help="Affiche le résultat en JSON.",
+        )
+
+    def handle(self, *args, **options):
+        """Exécute les deux mesures et affiche leur comparaison."""
+        project = self.get_project(options["project"])
+        token = str(AccessToken.for_user(project.author))
+        paths = self.get_paths(project)
+        total = options["requests"]
+        requests = list(islice(cycle(paths), total))
+
+        results = {
+            "wsgi": self.run_wsgi(
+                requests,
+                token,
+                options["concurrency"],
+                options["threads"],
+                options["client_delay"],
+            ),
+            "asgi": self.run_asgi(
+                requests,
+                token,
+                options["concurrency"],
+                options["client_delay"],
+            ),
+        }
+
+        if options["json"]:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+        for mode, result in results.items():
+            self.stdout.write(
+                f"{mode.upper()}: {result['requests']} requêtes en "
+                f"{result['seconds']:.2f} s, "
+                f"{result['throughput']:.1f} req/s, "
+                f"p50 {result['p50_ms']:.1f} ms, "
+                f"p95 {result['p95_ms']:.1f} ms, "
+                f"erreurs: {result['errors']}"
+            )
+        ratio = results["asgi"]["throughput"] / results["wsgi"]["throughput"]
+        self.stdout.write(self.style.SUCCESS(f"ASGI / WSGI: x{ratio:.2f}"))
+
+    def get_project(self, project_id):
+        """Retourne le projet à lire."""
+        projects = Project.objects.select_related("author")
+        if project_id is not None:
+            project = projects.filter(pk=project_id).first()
+        else:
+            project = (
+                projects.annotate(total=Count("issues"))
+                .order_by("-total")
+                .first()
+            )
+        if project is None:
+            raise CommandError("Aucun projet à lire.")
+        return project
+
+    def get_paths(self, project):
+        """Retourne les chemins lus, relatifs à ``/api/``."""
+        paths = ["projects/", f"projects/{project.pk}/"]
+        issues = f"projects/{project.pk}/issues/"
+        paths.append(issues)
+        issue = project.issues.order_by("-comments_count").first()
+        if issue is not None:
+            paths.append(f"{issues}{issue.pk}/")
+            paths.append(f"{issues}{issue.pk}/comments/")
+        return paths
+
+    def run_wsgi(self, requests, token, concurrency, threads, delay):
+        """Envoie les requêtes aux vues synchrones via le handler WSGI.
+
+        Chaque client attend qu'un des ``threads`` du serveur soit libre;
+        la latence mesurée inclut cette attente.
+        """
+        app = WSGIHandler()
+        workers = threading.BoundedSemaphore(threads)
+
+        def call(path):
+            environ = {
+                "REQUEST_METHOD": "GET",
+                "PATH_INFO": f"/api/{path}",
+                "QUERY_STRING": "",
+                "SERVER_NAME": HOST,
+                "SERVER_PORT": "80",
+                "SERVER_PROTOCOL": "HTTP/1.1",
+                "HTTP_HOST": HOST,
+                "HTTP_AUTHORIZATION": f"Bearer {token}",
+                "wsgi.input": io.BytesIO(),
+                "wsgi.errors": io.StringIO(),
+                "wsgi.url_scheme": "http",
+                "wsgi.version": (1, 0),
+                "wsgi.multithread": True,
+                "wsgi.multiprocess": False,
+                "wsgi.run_once": False,
+            }
+            statuses = []
+
+            def start_response(status, headers, exc_info=None):
+                statuses.append(int(status.split()[0]))
+
+            started = time.perf_counter()
+            with workers:
+                response = app(environ, start_response)
+                try:
+                    for _ in response:
+                        if delay:
+                            time.sleep(delay)
+                finally:
+                    response.close()
+            return statuses[0], time.perf_counter() - started
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            outcomes = list(executor.map(call, requests))
+        return self.summarize(outcomes, time.perf_counter() - started)
+
+    def run_asgi(self, requests, token, concurrency, delay):
+        """Envoie les requêtes aux vues asynchrones via le handler ASGI."""
+        app = ASGIHandler()
+
+        async def call(path, clients):
+            scope = {
+                "type": "http",
+                "asgi": {"version": "3.0"},
+                "http_version": "1.1",
+                "method": "GET",
+                "scheme": "http",
+                "path": f"/api/async/{path}",
+                "raw_path": f"/api/async/{path}".encode(),
+                "query_string": b"",
+                "root_path": "",
+                "server": (HOST, 80),
+                "client": ("127.0.0.1", 0),
+                "headers": [
+                    (b"host", HOST.encode()),
+                    (b"authorization", f"Bearer {token}".encode()),
+                ],
+            }
+            received = asyncio.Event()
+            statuses = []
+
+            async def receive():
+                if not received.is_set():
+                    received.set()
+                    return {"type": "http.request", "body": b""}
+                # Le client ne se déconnecte pas avant la fin de la réponse
+                await asyncio.Event().wait()
+
+            async def send(message):
+                if message["type"] == "http.response.start":
+                    statuses.append(message["status"])
+                elif delay:
+                    await asyncio.sleep(delay)
+
+            async with clients:
+                started = time.perf_counter()
+                await app(scope, receive, send)
+                return statuses[0], time.perf_counter() - started
+
+        async def run_all():
+            clients = asyncio.Semaphore(concurrency)
+            return await asyncio.gather(
+                *(call(path, clients) for path in requests)
+            )
+
+        started = time.perf_counter()
+        outcomes = asyncio.run(run_all())
+        return self.summarize(outcomes, time.perf_counter() - started)
+
+    def summarize(self, outcomes, seconds):
+        """Résume une série de (statut, durée) en débit et latences."""
+        latencies = sorted(duration for _, duration in outcomes)
+        quantiles = statistics.quantiles(latencies, n=100, method="inclusive")
+        return {
+            "requests": len(outcomes),
+            "errors": sum(1 for status, _ in outcomes if status != 200),
+            "seconds": round(seconds, 3),
+            "throughput": round(len(outcomes) / seconds, 1),
+            "p50_ms": round(quantiles[49] * 1000, 2),
+            "p95_ms": round(quantiles[94] * 1000, 2),
+        }
@@ -0,0 +1,199 @@
+"""Commande de mesure de la latence des routes de l'API."""
+
+import json
+import logging
+import platform
+import time
+
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from projects.benchmark import (
+    EndpointBenchmark,
+    build_scenarios,
+    compare,
+    find_fixture,
+    missing_routes,
+    regressions,
+)
+
+
+class Command(BaseCommand):
+    """Mesure toutes les routes de l'API sur la base locale.
+
+    À lancer sur une base remplie par ``generate_dataset``: chaque route
+    est appelée ``--requests`` fois par ``--concurrency`` clients
+    simultanés, et le rapport JSON donne pour chacune les quantiles de
+    latence, le débit, le nombre de requêtes SQL et la mémoire résidente
+    maximale. Avec ``--baseline``, le rapport est comparé à un rapport
+    précédent et la commande échoue en cas de régression.
+    """
+
+    help = (
+        "Mesure latence (p50/p95/p99), débit, requêtes SQL et mémoire de "
+        "chaque route de l'API, et compare à une référence."
+    )
+
+    def add_arguments(self, parser):
+        """Ajoute les options de la mesure."""
+        parser.add_argument(
+            "--requests",
+            type=int,
+            default=100,
+            help="Nombre de requêtes mesurées par route (100 par défaut).",
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=1,
+            help="Nombre de clients simultanés (1 par défaut).",
+        )
+        parser.add_argument(
+            "--warmup",
+            type=int,
+            default=5,
+            help="Requêtes non mesurées avant chaque route (5 par défaut).",
+        )
+        parser.add_argument(
+            "--username",
+            help="Utilisateur pour lequel mesurer (par défaut, l'auteur du "
+            "projet qui a le plus de problèmes).",
+        )
+        parser.add_argument(
+            "--password",
+            default="Password123",
+            help="Mot de passe de l'utilisateur, pour la route de connexion "
+            "(celui de generate_dataset par défaut).",
+        )
+        parser.add_argument(
+            "--writes",
+            action="store_true",
+            help="Mesure aussi les routes qui modifient la base.",
+        )
+        parser.add_argument(
+            "--only",
+            nargs="+",
+            metavar="SCENARIO",
+            help="Ne mesure que ces scénarios.",
+        )
+        parser.add_argument(
+            "--output",
+            help="Fichier où écrire le rapport JSON (sortie standard par "
+            "défaut).",
+        )
+        parser.add_argument(
+            "--baseline",
+            help="Rapport de référence auquel comparer les résultats.",
+        )
+        parser.add_argument(
+            "--save-baseline",
+            action="store_true",
+            help="Enregistre le rapport comme nouvelle référence "
+            "(--baseline).",
+        )
+        parser.add_argument(
+            "--threshold",
+            type=float,
+            default=0.2,
+            help="Dégradation tolérée de la latence et du débit, en "
+            "proportion (0.2 par défaut).",
+        )
+
+    def handle(self, *args, **options):
+        """Exécute la mesure, écrit le rapport et le compare."""
+        if options["requests"] < 1 or options["concurrency"] < 1:
+            raise CommandError("--requests et --concurrency doivent être ≥ 1.")
+        if options["save_baseline"] and not options["baseline"]:
+            raise CommandError("--save-baseline demande --baseline.")
+
+        baseline = None
+        if options["baseline"] and not options["save_baseline"]:
+            try:
+                with open(options["baseline"], encoding="utf-8") as f:
+                    baseline = json.load(f)
+            except (OSError, ValueError) as exc:
+                raise CommandError(f"Référence illisible: {exc}")
+
+        fixture = find_fixture(options["username"])
+        if fixture is None:
+            raise CommandError(
+                "Aucun projet avec des problèmes en base: lancez d'abord "
+                "generate_dataset."
+            )
+        scenarios = build_scenarios(fixture, options["password"])
+        missing = missing_routes(scenarios)
+        if missing:
+            raise CommandError(
+                f"Routes sans scénario de mesure: {', '.join(missing)}."
+            )
+        if not options["writes"]:
+            scenarios = [s for s in scenarios if not s.write]
+        if options["only"]:
+            unknown = set(options["only"]) - {s.name for s in scenarios}
+            if unknown:
+                raise CommandError(
+                    f"Scénarios inconnus: {', '.join(sorted(unknown))}."
+                )
+            scenarios = [s for s in scenarios if s.name in options["only"]]
+
+        benchmark = EndpointBenchmark(
+            fixture["user"],
+            requests=options["requests"],
+            concurrency=options["concurrency"],
+            warmup=options["warmup"],
+        )
+        results = {}
+        # Les journaux de chaque requête fausseraient la mesure; les
+        # erreurs restent comptées par statut dans le rapport
+        logging.disable(logging.CRITICAL)
+        try:
+            for scenario in scenarios:
+                results[scenario.name] = result = benchmark.run(scenario)
+                self.stderr.write(
+                    f"{scenario.name:<30} p50 {result['p50_ms']:>8.2f} ms  "
+                    f"p95 {result['p95_ms']:>8.2f} ms  "
+                    f"{result['throughput']:>8.1f} req/s  "
+                    f"{result['queries_mean']:>5.1f} SQL"
+                )
+        finally:
+            logging.disable(logging.NOTSET)
+
+        report = {
+            "meta": {
+                "date": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+                "python": platform.python_version(),
+                "django": django.get_version(),
+                "sqlite": connection.Database.sqlite_version,
+                "debug": settings.DEBUG,
+                "user": fixture["user"].username,
+                "project": fixture["project"].pk,
+                "requests": options["requests"],
+                "concurrency": options["concurrency"],
+            },
+            "endpoints": results,
+        }
+
+        failures = []
+        if baseline is not None:
+            report["comparison"] = compare(
+                results, baseline.get("endpoints", {}), options["threshold"]
+            )
+            failures = regressions(report["comparison"])
+
+        text = json.dumps(report, indent=2, ensure_ascii=False) + "\n"
+        if options["save_baseline"]:
+            with open(options["baseline"], "w", encoding="utf-8") as f:
+                f.write(text)
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as f:
+                f.write(text)
+        elif not options["save_baseline"]:
+            self.stdout.write(text, ending="")
+
+        if failures:
+            raise CommandError(
+                "Régressions: "
+                + ", ".join(f"{name} ({metric})" for name, metric in failures)
+            )
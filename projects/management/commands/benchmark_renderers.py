@@ -0,0 +1,179 @@
+"""Commande de comparaison des rendus et analyses JSON de l'API."""
+
+import io
+import random
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from django.core.management.base import BaseCommand
+from django.core.serializers.json import DjangoJSONEncoder
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from projects import renderers
+from projects.dataset import WORDS
+from projects.models import Issue
+from projects.serializers import IssueListSerializer
+
+
+class Command(BaseCommand):
+    """Compare le JSON de DRF à ``projects.renderers`` sur des données types.
+
+    Deux charges sont mesurées, sans base de données:
+    - la sortie d'IssueListSerializer pour ``--items`` problèmes, rendue
+      puis relue comme le ferait l'API
+    - des lignes de l'export NDJSON, avec dates et UUID bruts, encodées par
+      l'encodeur de Django puis par ``renderers.dumps``
+
+    Pour chaque charge, la commande affiche la durée médiane d'une
+    opération et le gain par rapport à l'implémentation de référence.
+    """
+
+    help = (
+        "Mesure le rendu et l'analyse JSON (DRF/bibliothèque standard, "
+        "orjson, MessagePack) de la sortie d'IssueListSerializer."
+    )
+
+    def add_arguments(self, parser):
+        """Ajoute les paramètres de la mesure."""
+        parser.add_argument(
+            "--items",
+            type=int,
+            default=1000,
+            help="Nombre de problèmes sérialisés (1000 par défaut).",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=20,
+            help="Nombre de répétitions de chaque mesure (20 par défaut).",
+        )
+
+    def handle(self, *args, **options):
+        """Prépare les données, mesure chaque implémentation et compare."""
+        rng = random.Random(0)
+        issues = [
+            self.build_issue(rng, index) for index in range(options["items"])
+        ]
+        data = IssueListSerializer(issues, many=True).data
+        records = [self.build_record(rng, issue) for issue in issues]
+        repeat = options["repeat"]
+
+        if renderers.orjson is None:
+            self.stdout.write(
+                self.style.WARNING(
+                    "orjson n'est pas installé: FastJSONRenderer utilise la "
+                    "bibliothèque standard."
+                )
+            )
+
+        body = JSONRenderer().render(data)
+        cases = [
+            ("Rendu", "DRF JSONRenderer", lambda: JSONRenderer().render(data)),
+            (
+                "Rendu",
+                "FastJSONRenderer",
+                lambda: renderers.FastJSONRenderer().render(data),
+            ),
+            (
+                "Analyse",
+                "DRF JSONParser",
+                lambda: JSONParser().parse(io.BytesIO(body)),
+            ),
+            (
+                "Analyse",
+                "FastJSONParser",
+                lambda: renderers.FastJSONParser().parse(io.BytesIO(body)),
+            ),
+        ]
+        if renderers.msgpack is not None:
+            packed = renderers.MessagePackRenderer().render(data)
+            cases += [
+                (
+                    "Rendu",
+                    "MessagePackRenderer",
+                    lambda: renderers.MessagePackRenderer().render(data),
+                ),
+                (
+                    "Analyse",
+                    "MessagePackParser",
+                    lambda: renderers.MessagePackParser().parse(
+                        io.BytesIO(packed)
+                    ),
+                ),
+            ]
+        encoder = DjangoJSONEncoder(ensure_ascii=False)
+        cases += [
+            (
+                "Export",
+                "json + encodeur Django",
+                lambda: [
+                    (encoder.encode(record) + "\n").encode()
+                    for record in records
+                ],
+            ),
+            (
+                "Export",
+                "renderers.dumps",
+                lambda: [
+                    renderers.dumps(record) + b"\n" for record in records
+                ],
+            ),
+        ]
+
+        self.stdout.write(
+            f"{options['items']} problèmes, JSON de {len(body) / 1024:.0f} Ko"
+        )
+        baselines = {}
+        for group, name, operation in cases:
+            seconds = self.measure(operation, repeat)
+            baseline = baselines.setdefault(group, seconds)
+            self.stdout.write(
+                f"{group:<8} {name:<24} {seconds * 1000:>8.2f} ms  "
+                f"x{baseline / seconds:.1f}"
+            )
+
+    def measure(self, operation, repeat):
+        """Durée médiane d'une opération, en secondes."""
+        operation()
+        durations = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            operation()
+            durations.append(time.perf_counter() - started)
+        durations.sort()
+        return durations[len(durations) // 2]
+
+    def build_issue(self, rng, index):
+        """Problème non sauvegardé, aux textes de longueur variable."""
+        created = datetime(2024, 1, 1, tzinfo=timezone.utc) + timedelta(
+            minutes=index
+        )
+        return Issue(
+            id=index + 1,
+            title=" ".join(rng.choices(WORDS, k=rng.randint(3, 12)))[:128],
+            description=" ".join(rng.choices(WORDS, k=rng.randint(5, 300))),
+            project_id=1,
+            author_id=rng.randint(1, 100),
+            assignee_id=rng.randint(1, 100),
+            priority=rng.choice(("LOW", "MEDIUM", "HIGH")),
+            tag=rng.choice(("BUG", "FEATURE", "TASK")),
+            status=rng.choice(("TODO", "IN_PROGRESS", "FINISHED")),
+            created_time=created,
+            updated_time=created,
+            comments_count=rng.randint(0, 50),
+        )
+
+    def build_record(self, rng, issue):
+        """Ligne d'export d'un commentaire: dates et UUID bruts."""
+        return {
+            "type": "comment",
+            "id": issue.pk,
+            "uuid": uuid.UUID(int=rng.getrandbits(128), version=4),
+            "issue": issue.pk,
+            "description": issue.description,
+            "author": f"bench{issue.author_id:07d}",
+            "created_time": issue.created_time,
+            "updated_time": issue.updated_time,
+        }
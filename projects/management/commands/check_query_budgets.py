@@ -0,0 +1,83 @@
+"""Commande de vérification des budgets de requêtes SQL."""
+
+import logging
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import (
+    setup_test_environment,
+    teardown_test_environment,
+)
+
+from projects.querybudget import QUERY_BUDGETS, SIZES, check_budgets
+
+
+class Command(BaseCommand):
+    """Vérifie que chaque route de lecture tient son budget de requêtes.
+
+    Les données sont créées dans une base de test, détruite à la fin: la
+    base configurée n'est pas modifiée. La commande échoue, avec le SQL et
+    la pile d'appels des requêtes en cause, si une action dépasse son
+    budget pour l'un des volumes, ou si une route de lecture n'en a pas.
+    """
+
+    help = (
+        "Vérifie le nombre de requêtes SQL de chaque route de lecture pour "
+        "1, 10 et 1000 objets liés, sur une base de test."
+    )
+
+    def add_arguments(self, parser):
+        """Ajoute les options de la vérification."""
+        parser.add_argument(
+            "--sizes",
+            type=int,
+            nargs="+",
+            default=list(SIZES),
+            help="Volumes des objets liés (1 10 1000 par défaut).",
+        )
+        parser.add_argument(
+            "--action",
+            nargs="+",
+            dest="actions",
+            metavar="ACTION",
+            help="Ne vérifie que ces actions (ProjectViewSet.list...).",
+        )
+
+    def handle(self, *args, **options):
+        """Crée la base de test, vérifie les budgets et affiche le bilan."""
+        unknown = set(options["actions"] or ()) - set(QUERY_BUDGETS)
+        if unknown:
+            raise CommandError(
+                f"Actions sans budget: {', '.join(sorted(unknown))}."
+            )
+
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(
+            verbosity=0, autoclobber=True
+        )
+        # Les journaux de chaque requête noieraient le bilan
+        logging.disable(logging.CRITICAL)
+        try:
+            counts, errors = check_budgets(
+                sizes=options["sizes"], actions=options["actions"]
+            )
+        finally:
+            logging.disable(logging.NOTSET)
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        header = "".join(f"{size:>7}" for size in options["sizes"])
+        self.stdout.write(f"{'Action':<30}{header}  Budget")
+        for action, by_size in counts.items():
+            values = "".join(
+                f"{by_size.get(size, '-'):>7}" for size in options["sizes"]
+            )
+            self.stdout.write(
+                f"{action:<30}{values}  {QUERY_BUDGETS[action]:>6}"
+            )
+
+        if errors:
+            for error in errors:
+                self.stderr.write(str(error))
+            raise CommandError(f"{len(errors)} budget(s) non respecté(s).")
+        self.stdout.write(self.style.SUCCESS("Tous les budgets sont tenus."))
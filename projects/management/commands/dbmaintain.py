@@ -0,0 +1,79 @@
+"""Commande de maintenance de la base SQLite."""
+
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.core.exceptions import ImproperlyConfigured
+
+from projects.sqlite import database_size, maintain_database
+
+
+class Command(BaseCommand):
+    """Met à jour les statistiques et compacte la base SQLite.
+
+    À lancer périodiquement (cron, tâche planifiée) et après un import
+    massif: ``ANALYZE`` et ``PRAGMA optimize`` gardent les plans de
+    requêtes adaptés aux volumes, ``incremental_vacuum`` rend les pages
+    libres au système et le point de contrôle vide le journal WAL.
+    """
+
+    help = (
+        "Exécute ANALYZE, PRAGMA optimize, incremental_vacuum et un point "
+        "de contrôle WAL, et affiche la durée de chaque étape."
+    )
+
+    def add_arguments(self, parser):
+        """Ajoute les options de la maintenance."""
+        parser.add_argument(
+            "--database",
+            default="default",
+            help="Alias de la base de données (défaut: default).",
+        )
+        parser.add_argument(
+            "--vacuum",
+            action="store_true",
+            help="Exécute un VACUUM complet (bloque les écritures pendant "
+            "sa durée) et passe la base en auto_vacuum=incremental.",
+        )
+        parser.add_argument(
+            "--pages",
+            type=int,
+            default=0,
+            help="Nombre maximal de pages rendues par incremental_vacuum "
+            "(0, par défaut, pour toutes).",
+        )
+        parser.add_argument(
+            "--json",
+            action="store_true",
+            help="Affiche le rapport en JSON.",
+        )
+
+    def handle(self, *args, **options):
+        """Exécute la maintenance et affiche le rapport."""
+        using = options["database"]
+        before = database_size(using)
+        try:
+            steps = maintain_database(
+                using, vacuum=options["vacuum"], vacuum_pages=options["pages"]
+            )
+        except ImproperlyConfigured as exc:
+            raise CommandError(str(exc))
+        after = database_size(using)
+
+        if options["json"]:
+            report = {"steps": steps, "before": before, "after": after}
+            self.stdout.write(json.dumps(report, indent=2))
+            return
+        for step in steps:
+            self.stdout.write(
+                f"{step['step']:<16} {step['seconds'] * 1000:>10.1f} ms"
+                f"  {step['detail']}"
+            )
+        total = sum(step["seconds"] for step in steps)
+        self.stdout.write(
+            f"Base: {before['database']} -> {after['database']} octets, "
+            f"WAL: {before['wal']} -> {after['wal']} octets"
+        )
+        self.stdout.write(
+            self.style.SUCCESS(f"Maintenance terminée en {total:.2f} s.")
+        )
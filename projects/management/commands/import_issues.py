@@ -0,0 +1,104 @@
+"""Commande d'import en masse de problèmes et de commentaires."""
+
+import sys
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from projects.importer import (
+    FORMATS,
+    Checkpoint,
+    IssueImporter,
+    guess_format,
+    read_records,
+)
+from projects.models import Project
+
+
+class Command(BaseCommand):
+    """Importe un fichier NDJSON ou CSV dans un projet existant.
+
+    Le fichier est lu au fil de l'eau et écrit par lots, chacun dans sa
+    propre transaction. Avec ``--checkpoint``, un import interrompu reprend
+    après le dernier lot écrit lorsqu'il est relancé avec le même fichier
+    de reprise.
+    """
+
+    help = (
+        "Importe des problèmes et commentaires (NDJSON ou CSV) dans un "
+        "projet, par lots, avec reprise possible après interruption."
+    )
+
+    def add_arguments(self, parser):
+        """Ajoute le projet, le fichier et les options d'import."""
+        parser.add_argument("project_id", type=int, help="Projet cible.")
+        parser.add_argument(
+            "path", help="Fichier à importer, ou - pour l'entrée standard."
+        )
+        parser.add_argument(
+            "--format",
+            choices=FORMATS,
+            help="Format du fichier (déduit de l'extension par défaut).",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            help="Nombre de lignes par lot (IMPORT_BATCH_SIZE par défaut).",
+        )
+        parser.add_argument(
+            "--checkpoint",
+            help="Fichier de reprise, complété après chaque lot écrit.",
+        )
+
+    def handle(self, *args, **options):
+        """Exécute l'import et affiche le rapport."""
+        try:
+            project = Project.objects.get(pk=options["project_id"])
+        except Project.DoesNotExist:
+            raise CommandError(f"Projet {options['project_id']} introuvable.")
+
+        path = options["path"]
+        file_format = options["format"] or guess_format(path)
+        checkpoint = None
+        if options["checkpoint"]:
+            checkpoint = Checkpoint(options["checkpoint"])
+        importer = IssueImporter(
+            project,
+            batch_size=options["batch_size"],
+            checkpoint=checkpoint,
+        )
+        skip = importer.resume()
+        if skip:
+            self.stdout.write(f"Reprise après {skip} lignes déjà importées.")
+
+        started = time.perf_counter()
+        try:
+            if path == "-":
+                report = importer.run(
+                    read_records(sys.stdin, file_format, skip)
+                )
+            else:
+                with open(path, encoding="utf-8", newline="") as stream:
+                    report = importer.run(
+                        read_records(stream, file_format, skip)
+                    )
+        except UnicodeDecodeError as exc:
+            raise CommandError(
+                f"Le fichier n'est pas encodé en UTF-8 ({exc.reason}), après "
+                f"{importer.position} lignes importées."
+            )
+        elapsed = time.perf_counter() - started
+
+        rows = report["issues"] + report["comments"]
+        self.stdout.write(
+            f"Problèmes: {report['issues']}, commentaires: "
+            f"{report['comments']}, refusés: {report['error_count']} "
+            f"({elapsed:.2f} s, {rows / elapsed if elapsed else 0:.0f} "
+            "lignes/s)"
+        )
+        for error in report["errors"]:
+            self.stdout.write(
+                self.style.WARNING(f"Ligne {error['line']}: {error['errors']}")
+            )
+        if not report["error_count"]:
+            self.stdout.write(self.style.SUCCESS("Import terminé."))
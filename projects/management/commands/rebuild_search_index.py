@@ -0,0 +1,37 @@
+"""Commande de reconstruction de l'index de recherche plein texte."""
+
+from django.core.management.base import BaseCommand
+
+from projects.search import rebuild_search_index
+
+
+class Command(BaseCommand):
+    """Reconstruit l'index FTS5 des problèmes et des commentaires.
+
+    L'index est maintenu en continu par des triggers SQLite; cette commande
+    sert à le réparer ou à le compacter après un import massif.
+    """
+
+    help = "Reconstruit l'index de recherche plein texte (SQLite FTS5)."
+
+    def add_arguments(self, parser):
+        """Ajoute l'option de choix de la base de données."""
+        parser.add_argument(
+            "--database",
+            default="default",
+            help="Alias de la base de données (défaut: default).",
+        )
+
+    def handle(self, *args, **options):
+        """Exécute la reconstruction de l'index."""
+        if rebuild_search_index(options["database"]):
+            self.stdout.write(
+                self.style.SUCCESS("Index de recherche reconstruit.")
+            )
+        else:
+            self.stdout.write(
+                self.style.WARNING(
+                    "Index FTS5 indisponible sur cette base: la recherche "
+                    "utilise le filtre LIKE de repli."
+                )
+            )
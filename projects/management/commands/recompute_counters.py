@@ -0,0 +1,38 @@
+"""Commande de recalcul des compteurs dénormalisés."""
+
+from django.core.management.base import BaseCommand
+
+from projects.counters import recompute_counters
+
+
+class Command(BaseCommand):
+    """Recalcule les compteurs de problèmes et de commentaires.
+
+    Les compteurs sont maintenus en continu par les signaux et les
+    écritures en masse; cette commande détecte et corrige une dérive
+    éventuelle (écriture SQL directe, mise à jour concurrente, etc.).
+    """
+
+    help = (
+        "Recalcule les compteurs de problèmes par projet et de commentaires "
+        "par problème, et corrige ceux qui ont dérivé."
+    )
+
+    def add_arguments(self, parser):
+        """Ajoute l'option de simulation."""
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Signale les compteurs faux sans les corriger.",
+        )
+
+    def handle(self, *args, **options):
+        """Exécute le recalcul et affiche le nombre de lignes en dérive."""
+        drift = recompute_counters(dry_run=options["dry_run"])
+        verb = "à corriger" if options["dry_run"] else "corrigés"
+        self.stdout.write(
+            f"Projets {verb}: {drift['projects']}, "
+            f"problèmes {verb}: {drift['issues']}"
+        )
+        if not any(drift.values()):
+            self.stdout.write(self.style.SUCCESS("Aucune dérive détectée."))
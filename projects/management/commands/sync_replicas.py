@@ -0,0 +1,75 @@
+"""Commande de copie de la base principale vers ses répliques SQLite."""
+
+import sqlite3
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from projects.replicas import get_replicas
+
+
+class Command(BaseCommand):
+    """Recopie la base SQLite principale dans chaque réplique.
+
+    Tient lieu de réplication pour essayer les répliques en local: la copie
+    passe par l'API de sauvegarde de SQLite, qui produit un état cohérent
+    de la base sans interrompre les écritures. Avec ``--interval``, la
+    copie est répétée, et le retard des répliques vaut au plus cet
+    intervalle.
+    """
+
+    help = (
+        "Copie la base SQLite principale vers les répliques en lecture "
+        "(REPLICA_DATABASES), une fois ou à intervalle régulier."
+    )
+
+    def add_arguments(self, parser):
+        """Ajoute l'option de copie périodique."""
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=0,
+            help="Répète la copie toutes les N secondes (0, par défaut, "
+            "pour une seule copie).",
+        )
+
+    def handle(self, *args, **options):
+        """Exécute une ou plusieurs copies."""
+        replicas = get_replicas()
+        if not replicas:
+            raise CommandError(
+                "Aucune réplique configurée (variable DB_REPLICAS)."
+            )
+        for alias in [DEFAULT_DB_ALIAS, *replicas]:
+            if connections[alias].vendor != "sqlite":
+                raise CommandError(
+                    f"La base {alias} n'est pas une base SQLite."
+                )
+
+        while True:
+            started = time.perf_counter()
+            self.copy(replicas)
+            self.stdout.write(
+                f"{len(replicas)} réplique(s) à jour en "
+                f"{(time.perf_counter() - started) * 1000:.0f} ms"
+            )
+            if not options["interval"]:
+                break
+            time.sleep(options["interval"])
+
+    def copy(self, replicas):
+        """Copie la base principale dans chaque réplique."""
+        source_path = connections[DEFAULT_DB_ALIAS].settings_dict["NAME"]
+        source = sqlite3.connect(source_path)
+        try:
+            for alias in replicas:
+                target = sqlite3.connect(
+                    connections[alias].settings_dict["NAME"]
+                )
+                try:
+                    source.backup(target)
+                finally:
+                    target.close()
+        finally:
+            source.close()
@@ -0,0 +1,116 @@
+"""Résolution de l'appartenance d'un utilisateur à un projet.
+
+Ce module répond à la question « l'utilisateur U est-il membre du projet P,
+et avec quel rôle ? » au moyen d'une seule requête indexée sur la contrainte
+d'unicité ``(user, project)`` de Contributor. Le résultat est mémorisé à
+deux niveaux:
+- pour la durée de la requête HTTP, sur l'objet requête
+- dans le cache partagé de Django, invalidé à la création et à la
+  suppression d'un Contributor (voir ``projects.signals``)
+"""
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import router
+
+from .models import Contributor
+
+# Valeur stockée dans le cache pour un non-membre, afin de mémoriser
+# aussi les réponses négatives
+NOT_A_MEMBER = ""
+
+
+def membership_cache_key(project_id, user_id):
+    """Retourne la clé de cache de l'appartenance d'un utilisateur."""
+    return f"projects:membership:{project_id}:{user_id}"
+
+
+def get_project_role(request, project_id):
+    """Retourne le rôle de l'utilisateur de la requête dans un projet.
+
+    Args:
+        request: La requête HTTP (DRF ou Django)
+        project_id: Identifiant du projet
+
+    Returns:
+        Le rôle ("AUTHOR" ou "CONTRIBUTOR"), ou None si l'utilisateur
+        n'est pas membre du projet
+    """
+    user, project_id, roles = _memoized_roles(request, project_id)
+    if user is None or project_id in roles:
+        return roles.get(project_id)
+
+    key = membership_cache_key(project_id, user.pk)
+    role = cache.get(key)
+    if role is None:
+        role = _role_queryset(project_id, user).first() or NOT_A_MEMBER
+        cache.set(key, role, _get_timeout())
+
+    roles[project_id] = role or None
+    return roles[project_id]
+
+
+async def aget_project_role(request, project_id):
+    """Variante asynchrone de ``get_project_role``."""
+    user, project_id, roles = _memoized_roles(request, project_id)
+    if user is None or project_id in roles:
+        return roles.get(project_id)
+
+    key = membership_cache_key(project_id, user.pk)
+    role = await cache.aget(key)
+    if role is None:
+        role = await _role_queryset(project_id, user).afirst() or NOT_A_MEMBER
+        await cache.aset(key, role, _get_timeout())
+
+    roles[project_id] = role or None
+    return roles[project_id]
+
+
+def _memoized_roles(request, project_id):
+    """Prépare la résolution d'un rôle pour une requête.
+
+    Returns:
+        Tuple (utilisateur, identifiant du projet, rôles déjà résolus pour
+        cette requête); l'utilisateur vaut None s'il est anonyme ou si
+        l'identifiant du projet est invalide
+    """
+    roles = getattr(request, "_project_roles", None)
+    if roles is None:
+        roles = {}
+        request._project_roles = roles
+    user = request.user
+    if user is None or not user.is_authenticated:
+        return None, project_id, roles
+    try:
+        project_id = int(project_id)
+    except (TypeError, ValueError):
+        return None, project_id, roles
+    return user, project_id, roles
+
+
+def _role_queryset(project_id, user):
+    """Requête du rôle d'un utilisateur dans un projet.
+
+    Le rôle est lu sur la base principale: lu sur une réplique en retard,
+    un refus serait mémorisé pour toute la durée du cache.
+    """
+    return (
+        Contributor.objects.using(router.db_for_write(Contributor))
+        .filter(project_id=project_id, user_id=user.pk)
+        .values_list("role", flat=True)
+    )
+
+
+def _get_timeout():
+    """Durée de mémorisation d'une appartenance dans le cache partagé."""
+    return getattr(settings, "PROJECT_MEMBERSHIP_CACHE_TIMEOUT", 300)
+
+
+def is_project_member(request, project_id):
+    """Indique si l'utilisateur de la requête est membre du projet."""
+    return get_project_role(request, project_id) is not None
+
+
+def invalidate_membership(project_id, user_id):
+    """Supprime l'appartenance mémorisée d'un utilisateur à un projet."""
+    cache.delete(membership_cache_key(project_id, user_id))
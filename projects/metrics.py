@@ -0,0 +1,510 @@
+"""Métriques de l'API au format d'exposition texte de Prometheus.
+
+Les mesures sont tenues en mémoire par chaque processus et publiées par
+``/metrics``:
+- ``softdesk_http_request_duration_seconds``: histogramme des durées par
+  nom de route (``project-list``, ``project-issues-detail``...) et méthode
+- ``softdesk_http_requests_total``: nombre de requêtes par route, méthode
+  et statut
+- ``softdesk_db_queries_per_request``: histogramme du nombre de requêtes
+  SQL par requête HTTP et par route
+- ``softdesk_cache_requests_total``: lectures du cache de Django par
+  préfixe de clé (``api:response``, ``projects:membership``...) et
+  résultat (``hit``/``miss``), d'où le taux de succès de chaque cache
+- ``softdesk_http_requests_in_flight``: requêtes en cours
+
+Avec plusieurs processus (workers gunicorn, uvicorn...), chacun écrit ses
+valeurs dans un fichier de ``METRICS_DIR``, au plus toutes les
+``METRICS_FLUSH_INTERVAL`` secondes, et ``/metrics`` additionne les
+fichiers de tous les processus. Les compteurs et histogrammes des
+processus terminés restent comptés, pour que les totaux ne décroissent
+pas; les requêtes en cours ne le sont que pour les processus vivants.
+À chaque lecture, les fichiers des processus terminés sont additionnés
+dans un fichier unique (``metrics-dead.json``) puis supprimés, comme le
+fait ``prometheus_client`` en mode multiprocessus: le dossier ne grossit
+pas à chaque redémarrage des workers. Sans ``METRICS_DIR``, ``/metrics``
+ne montre que le processus qui répond.
+"""
+
+import atexit
+import hmac
+import json
+import os
+import re
+import threading
+import uuid
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.cache.backends.locmem import LocMemCache
+from django.http import HttpResponse
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+COUNTER = "counter"
+GAUGE = "gauge"
+HISTOGRAM = "histogram"
+
+LATENCY_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+QUERY_COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100)
+
+# Nom: (type, description, seuils des histogrammes)
+METRICS = {
+    "softdesk_http_request_duration_seconds": (
+        HISTOGRAM,
+        "Durée de traitement des requêtes HTTP, en secondes.",
+        LATENCY_BUCKETS,
+    ),
+    "softdesk_http_requests_total": (
+        COUNTER,
+        "Nombre de requêtes HTTP traitées.",
+        None,
+    ),
+    "softdesk_db_queries_per_request": (
+        HISTOGRAM,
+        "Nombre de requêtes SQL par requête HTTP.",
+        QUERY_COUNT_BUCKETS,
+    ),
+    "softdesk_cache_requests_total": (
+        COUNTER,
+        "Lectures du cache par préfixe de clé et résultat.",
+        None,
+    ),
+    "softdesk_http_requests_in_flight": (
+        GAUGE,
+        "Requêtes HTTP en cours de traitement.",
+        None,
+    ),
+}
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+FILE_NAME = re.compile(r"^metrics-(\d+)-\w+\.json$")
+
+# Valeurs additionnées des processus terminés, et verrou de la compaction
+DEAD_FILE_NAME = "metrics-dead.json"
+LOCK_FILE_NAME = "metrics.lock"
+
+
+def get_metrics_dir():
+    """Dossier partagé des fichiers de métriques, ou None."""
+    return getattr(settings, "METRICS_DIR", None)
+
+
+def get_flush_interval():
+    """Délai maximal avant l'écriture des métriques du processus."""
+    return getattr(settings, "METRICS_FLUSH_INTERVAL", 1.0)
+
+
+def metrics_enabled():
+    """Indique si les métriques sont collectées."""
+    return getattr(settings, "METRICS_ENABLED", True)
+
+
+class MetricsRegistry:
+    """Valeurs des métriques d'un processus.
+
+    Les valeurs sont indexées par (nom, étiquettes), les étiquettes étant
+    un tuple trié de paires (nom, valeur). Un histogramme est une liste
+    [compte par seuil..., compte au-delà, somme].
+
+    Attributes:
+        values: Valeurs courantes des métriques
+        pid: Processus propriétaire
+        path: Fichier où les valeurs sont publiées, ou None
+    """
+
+    def __init__(self):
+        self.values = {}
+        self.lock = threading.Lock()
+        self.pid = None
+        self.path = None
+        self.timer = None
+        self.flush_lock = threading.Lock()
+
+    def inc(self, name, labels, amount=1):
+        """Augmente un compteur ou une jauge."""
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            self.values[key] = self.values.get(key, 0) + amount
+        self.schedule_flush()
+
+    def observe(self, name, labels, value):
+        """Ajoute une observation à un histogramme."""
+        buckets = METRICS[name][2]
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            counts = self.values.get(key)
+            if counts is None:
+                counts = self.values[key] = [0] * (len(buckets) + 1) + [0]
+            for index, bound in enumerate(buckets):
+                if value <= bound:
+                    counts[index] += 1
+                    break
+            else:
+                counts[len(buckets)] += 1
+            counts[-1] += value
+        self.schedule_flush()
+
+    def schedule_flush(self):
+        """Programme l'écriture des valeurs dans le fichier du processus.
+
+        Après un ``fork`` (workers créés par un serveur), le processus
+        enfant repart de valeurs vides et écrit dans son propre fichier.
+        """
+        directory = get_metrics_dir()
+        if not directory:
+            return
+        with self.lock:
+            if self.pid != os.getpid():
+                if self.pid is not None:
+                    self.values.clear()
+                self.pid = os.getpid()
+                self.path = os.path.join(
+                    directory,
+                    f"metrics-{self.pid}-{uuid.uuid4().hex[:8]}.json",
+                )
+                self.timer = None
+            if self.timer is not None:
+                return
+            self.timer = threading.Timer(get_flush_interval(), self.flush)
+            self.timer.daemon = True
+            self.timer.start()
+
+    def flush(self):
+        """Écrit les valeurs du processus dans son fichier."""
+        with self.lock:
+            self.timer = None
+            path = self.path
+            if path is None or self.pid != os.getpid():
+                return
+        with self.flush_lock:
+            entries = self.local_entries()
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            write_json(path, entries)
+
+    def local_entries(self):
+        """Valeurs du processus courant, sous la forme des fichiers."""
+        with self.lock:
+            return [
+                [
+                    name,
+                    list(labels),
+                    list(value) if isinstance(value, list) else value,
+                ]
+                for (name, labels), value in self.values.items()
+            ]
+
+
+registry = MetricsRegistry()
+atexit.register(registry.flush)
+
+
+def process_alive(pid):
+    """Indique si le processus ``pid`` existe encore."""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def write_json(path, data):
+    """Écrit ``data`` dans ``path`` par remplacement atomique."""
+    temporary = f"{path}.tmp"
+    with open(temporary, "w", encoding="utf-8") as output:
+        json.dump(data, output)
+    os.replace(temporary, path)
+
+
+def read_json(path, default):
+    """Contenu JSON de ``path``, ou ``default`` s'il est illisible."""
+    try:
+        with open(path, encoding="utf-8") as source:
+            return json.load(source)
+    except (OSError, ValueError):
+        return default
+
+
+@contextmanager
+def directory_lock(directory):
+    """Verrou exclusif entre les processus qui lisent ``directory``.
+
+    Sans ``fcntl`` (Windows), le verrou n'est pas pris: les fichiers des
+    processus terminés ne sont alors pas compactés, mais restent comptés.
+    """
+    if fcntl is None:
+        yield
+        return
+    with open(os.path.join(directory, LOCK_FILE_NAME), "a") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def compact_dead_files(directory, names):
+    """Additionne les fichiers des processus terminés dans ``DEAD_FILE_NAME``.
+
+    Les fichiers additionnés sont ensuite supprimés. Le fichier compacté
+    retient leurs noms: un fichier resté en place après une interruption
+    entre l'écriture et la suppression n'est pas compté deux fois.
+
+    Args:
+        directory: Dossier des fichiers de métriques
+        names: Noms des fichiers du dossier
+
+    Returns:
+        Noms des fichiers restants, ceux des processus vivants
+    """
+    dead_path = os.path.join(directory, DEAD_FILE_NAME)
+    compacted = read_json(dead_path, {"files": [], "entries": []})
+    merged = set(compacted["files"])
+    live, dead = [], []
+    for name in names:
+        match = FILE_NAME.match(name)
+        if match is None:
+            continue
+        if process_alive(int(match.group(1))):
+            live.append(name)
+        else:
+            dead.append(name)
+    if not dead:
+        return live
+
+    totals = merge({}, compacted["entries"], alive=False)
+    for name in dead:
+        if name not in merged:
+            entries = read_json(os.path.join(directory, name), [])
+            merge(totals, entries, alive=False)
+    write_json(
+        dead_path,
+        {
+            "files": sorted(dead),
+            "entries": [
+                [name, [list(pair) for pair in labels], value]
+                for (name, labels), value in totals.items()
+            ],
+        },
+    )
+    for name in dead:
+        try:
+            os.remove(os.path.join(directory, name))
+        except FileNotFoundError:
+            pass
+    return live
+
+
+def read_entries():
+    """Valeurs de tous les processus, à additionner.
+
+    Les fichiers des processus terminés sont d'abord compactés (voir
+    ``compact_dead_files``).
+
+    Returns:
+        Liste de tuples (entrées, processus vivant)
+    """
+    directory = get_metrics_dir()
+    if not directory:
+        return [(registry.local_entries(), True)]
+
+    registry.flush()
+    if not os.path.isdir(directory):
+        return []
+    with directory_lock(directory):
+        names = os.listdir(directory)
+        if fcntl is not None:
+            names = compact_dead_files(directory, names)
+        compacted = read_json(os.path.join(directory, DEAD_FILE_NAME), {})
+        sources = [(compacted.get("entries", []), False)]
+        for name in names:
+            match = FILE_NAME.match(name)
+            if match is None:
+                continue
+            entries = read_json(os.path.join(directory, name), None)
+            if entries is not None:
+                sources.append((entries, process_alive(int(match.group(1)))))
+    return sources
+
+
+def merge(totals, entries, alive):
+    """Ajoute à ``totals`` les entrées d'un fichier de métriques.
+
+    Les jauges ne sont ajoutées que pour un processus vivant.
+
+    Returns:
+        ``totals``, dictionnaire {(nom, étiquettes): valeur}
+    """
+    for name, labels, value in entries:
+        if name not in METRICS:
+            continue
+        if METRICS[name][0] == GAUGE and not alive:
+            continue
+        key = (name, tuple(tuple(pair) for pair in labels))
+        if isinstance(value, list):
+            total = totals.setdefault(key, [0] * len(value))
+            for index, item in enumerate(value):
+                total[index] += item
+        else:
+            totals[key] = totals.get(key, 0) + value
+    return totals
+
+
+def collect():
+    """Additionne les valeurs de tous les processus.
+
+    Returns:
+        Dictionnaire {(nom, étiquettes): valeur}
+    """
+    totals = {}
+    for entries, alive in read_entries():
+        merge(totals, entries, alive)
+    return totals
+
+
+def _escape(value):
+    """Échappe une valeur d'étiquette."""
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace("\n", "\\n")
+        .replace('"', '\\"')
+    )
+
+
+def _labels(pairs):
+    """Formate des étiquettes: ``{nom="valeur",...}``."""
+    if not pairs:
+        return ""
+    return (
+        "{"
+        + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs)
+        + "}"
+    )
+
+
+def _number(value):
+    """Formate une valeur numérique."""
+    if isinstance(value, float) and not value.is_integer():
+        return repr(value)
+    return str(int(value))
+
+
+def render(totals):
+    """Produit le texte d'exposition Prometheus."""
+    lines = []
+    for name, (kind, description, buckets) in METRICS.items():
+        series = sorted(
+            (labels, value)
+            for (metric, labels), value in totals.items()
+            if metric == name
+        )
+        lines.append(f"# HELP {name} {description}")
+        lines.append(f"# TYPE {name} {kind}")
+        for labels, value in series:
+            if kind != HISTOGRAM:
+                lines.append(f"{name}{_labels(labels)} {_number(value)}")
+                continue
+            cumulative = 0
+            for bound, count in zip((*buckets, "+Inf"), value[:-1]):
+                cumulative += count
+                le = bound if bound == "+Inf" else _number(float(bound))
+                lines.append(
+                    f"{name}_bucket{_labels((*labels, ('le', le)))} "
+                    f"{cumulative}"
+                )
+            lines.append(f"{name}_sum{_labels(labels)} {value[-1]!r}")
+            lines.append(f"{name}_count{_labels(labels)} {cumulative}")
+    return "\n".join(lines) + "\n"
+
+
+def observe_request(route, method, status, duration, queries):
+    """Enregistre une requête HTTP traitée."""
+    labels = {"route": route, "method": method}
+    registry.observe(
+        "softdesk_http_request_duration_seconds", labels, duration
+    )
+    registry.observe("softdesk_db_queries_per_request", labels, queries)
+    registry.inc(
+        "softdesk_http_requests_total", {**labels, "status": str(status)}
+    )
+
+
+def track_in_flight(amount):
+    """Ajoute ``amount`` (1 ou -1) aux requêtes en cours."""
+    registry.inc("softdesk_http_requests_in_flight", {}, amount)
+
+
+def get_route(request):
+    """Nom de la route de la requête (``unmatched`` si aucune)."""
+    match = getattr(request, "resolver_match", None)
+    if match is None or not match.view_name:
+        return "unmatched"
+    return match.view_name
+
+
+def metrics_view(request):
+    """Publie les métriques de tous les processus.
+
+    Si ``METRICS_TOKEN`` est défini, la requête doit porter l'en-tête
+    ``Authorization: Bearer <METRICS_TOKEN>``.
+    """
+    token = getattr(settings, "METRICS_TOKEN", "")
+    if token:
+        expected = f"Bearer {token}"
+        received = request.headers.get("Authorization", "")
+        if not hmac.compare_digest(received.encode(), expected.encode()):
+            return HttpResponse(status=401)
+    return HttpResponse(render(collect()), content_type=CONTENT_TYPE)
+
+
+# Lecture en cache manquée, distincte d'une valeur None enregistrée
+_MISSING = object()
+
+
+def cache_key_prefix(key):
+    """Préfixe d'une clé de cache: ses deux premiers segments."""
+    return ":".join(str(key).split(":", 2)[:2])
+
+
+class CacheMetricsMixin:
+    """Compte les lectures réussies et manquées d'un cache Django.
+
+    À combiner avec une classe de cache de Django; ``get_many`` et les
+    variantes asynchrones passent par ``get``.
+    """
+
+    def get(self, key, default=None, version=None):
+        """Lit une valeur du cache et compte la lecture par préfixe de clé."""
+        value = super().get(key, _MISSING, version)
+        if metrics_enabled():
+            registry.inc(
+                "softdesk_cache_requests_total",
+                {
+                    "prefix": cache_key_prefix(key),
+                    "result": "miss" if value is _MISSING else "hit",
+                },
+            )
+        return default if value is _MISSING else value
+
+
+class MetricsLocMemCache(CacheMetricsMixin, LocMemCache):
+    """Cache en mémoire locale dont les lectures sont comptées."""
@@ -0,0 +1,141 @@
+"""Middleware de mesure du temps de traitement des requêtes.
+
+Pour chaque requête échantillonnée (``REQUEST_TIMING_SAMPLE_RATE``), le
+middleware mesure la durée totale, le nombre et la durée des requêtes SQL,
+la durée de sérialisation (voir ``projects.timing``) et la taille de la
+réponse. Il les écrit dans le journal ``projects.middleware`` sous la
+forme d'une ligne ``clé=valeur``, reprise en ``extra`` pour les
+formateurs structurés, et dans l'en-tête ``Server-Timing`` de la réponse,
+affiché par les outils de développement des navigateurs.
+
+Les requêtes non échantillonnées ne sont ni journalisées ni mesurées,
+sauf si les métriques Prometheus sont actives (``METRICS_ENABLED``, voir
+``projects.metrics``): toutes les requêtes les alimentent alors. Pour une
+réponse en flux (export), seul le travail fait avant l'envoi du premier
+octet est mesuré, et la taille n'est pas connue.
+"""
+
+import logging
+import random
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+from .metrics import (
+    get_route,
+    metrics_enabled,
+    observe_request,
+    track_in_flight,
+)
+from .timing import RequestTiming, current_timing
+
+logger = logging.getLogger(__name__)
+
+
+def get_sample_rate():
+    """Proportion des requêtes mesurées, entre 0 et 1."""
+    return getattr(settings, "REQUEST_TIMING_SAMPLE_RATE", 1.0)
+
+
+class RequestTimingMiddleware:
+    """Mesure les requêtes et publie leurs durées.
+
+    À placer en tête de ``MIDDLEWARE`` pour que la durée totale couvre
+    les autres middlewares.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        sampled, collected = self.sampled(), metrics_enabled()
+        if not (sampled or collected):
+            return self.get_response(request)
+        timing = RequestTiming()
+        token = current_timing.set(timing)
+        if collected:
+            track_in_flight(1)
+        try:
+            response = self.get_response(request)
+        finally:
+            current_timing.reset(token)
+            if collected:
+                track_in_flight(-1)
+        return self.publish(request, response, timing, sampled, collected)
+
+    async def __acall__(self, request):
+        sampled, collected = self.sampled(), metrics_enabled()
+        if not (sampled or collected):
+            return await self.get_response(request)
+        timing = RequestTiming()
+        token = current_timing.set(timing)
+        if collected:
+            track_in_flight(1)
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_timing.reset(token)
+            if collected:
+                track_in_flight(-1)
+        return self.publish(request, response, timing, sampled, collected)
+
+    def sampled(self):
+        """Tire au sort la journalisation de la requête."""
+        rate = get_sample_rate()
+        return rate >= 1 or random.random() < rate
+
+    def publish(self, request, response, timing, sampled, collected):
+        """Alimente les métriques et, si échantillonnée, le journal."""
+        if collected:
+            observe_request(
+                get_route(request),
+                request.method,
+                response.status_code,
+                timing.elapsed,
+                timing.queries,
+            )
+        if sampled:
+            self.report(request, response, timing)
+        return response
+
+    def report(self, request, response, timing):
+        """Journalise les mesures et les ajoute à la réponse."""
+        total = timing.elapsed
+        size = None if response.streaming else len(response.content)
+        measures = {
+            "method": request.method,
+            "path": request.path,
+            "status": response.status_code,
+            "duration_ms": round(total * 1000, 2),
+            "db_queries": timing.queries,
+            "db_ms": round(timing.db_time * 1000, 2),
+            "serializer_ms": round(timing.serializer_time * 1000, 2),
+            "response_bytes": size,
+        }
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "request %s",
+                " ".join(
+                    f"{name}={'-' if value is None else value}"
+                    for name, value in measures.items()
+                ),
+                extra={"timing": measures},
+            )
+
+        if getattr(settings, "REQUEST_TIMING_HEADER", True):
+            response["Server-Timing"] = ", ".join(
+                (
+                    f"total;dur={measures['duration_ms']}",
+                    f'db;dur={measures["db_ms"]};desc="{timing.queries} SQL"',
+                    f"serializer;dur={measures['serializer_ms']}",
+                )
+            )
+        return response
@@ -0,0 +1,84 @@
+# Index plein texte SQLite FTS5 des problèmes et des commentaires.
+#
+# Le rowid de l'index vaut 2 * id pour un problème et 2 * id + 1 pour un
+# commentaire, ce qui permet aux triggers de mettre l'index à jour par
+# rowid. La colonne ``project`` contient le jeton ``p<id>`` pour restreindre
+# une recherche aux projets d'un utilisateur directement dans l'index.
+# Les triggers sont (ré)installés après chaque migrate par
+# ``projects.search.install_search_triggers``, car SQLite les supprime
+# lorsqu'une migration reconstruit la table des problèmes ou commentaires.
+# Sur les autres bases, ou si FTS5 n'est pas disponible, la migration ne
+# fait rien et la recherche utilise un filtre LIKE.
+
+from django.db import migrations
+
+CREATE_SQL = [
+    """
+    CREATE VIRTUAL TABLE projects_search USING fts5(
+        title,
+        body,
+        project,
+        issue_id UNINDEXED,
+        tokenize = 'unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    INSERT INTO projects_search (rowid, title, body, project, issue_id)
+    SELECT id * 2, title, description, 'p' || project_id, id
+    FROM projects_issue
+    """,
+    """
+    INSERT INTO projects_search (rowid, title, body, project, issue_id)
+    SELECT
+        projects_comment.id * 2 + 1, '', projects_comment.description,
+        'p' || projects_issue.project_id, projects_comment.issue_id
+    FROM projects_comment
+    JOIN projects_issue ON projects_issue.id = projects_comment.issue_id
+    """,
+]
+
+DROP_SQL = [
+    "DROP TRIGGER IF EXISTS projects_issue_search_insert",
+    "DROP TRIGGER IF EXISTS projects_issue_search_update",
+    "DROP TRIGGER IF EXISTS projects_issue_search_delete",
+    "DROP TRIGGER IF EXISTS projects_comment_search_insert",
+    "DROP TRIGGER IF EXISTS projects_comment_search_update",
+    "DROP TRIGGER IF EXISTS projects_comment_search_delete",
+    "DROP TABLE IF EXISTS projects_search",
+]
+
+
+def fts5_available(schema_editor):
+    """Indique si la base est SQLite et compilée avec FTS5."""
+    connection = schema_editor.connection
+    if connection.vendor != "sqlite":
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute("PRAGMA compile_options")
+        options = {row[0] for row in cursor.fetchall()}
+    return "ENABLE_FTS5" in options
+
+
+def create_search_index(apps, schema_editor):
+    if not fts5_available(schema_editor):
+        return
+    for statement in CREATE_SQL:
+        schema_editor.execute(statement)
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    for statement in DROP_SQL:
+        schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("projects", "0004_issue_filter_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,69 @@
+# Generated by Django 5.0 on 2026-10-17 04:15
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def count_subquery(model, parent_field, **filters):
+    rows = (
+        model.objects.filter(**{parent_field: OuterRef("pk")}, **filters)
+        .order_by()
+        .values(parent_field)
+        .annotate(total=Count("pk"))
+        .values("total")
+    )
+    return Coalesce(Subquery(rows, output_field=IntegerField()), 0)
+
+
+def populate_counters(apps, schema_editor):
+    Project = apps.get_model("projects", "Project")
+    Issue = apps.get_model("projects", "Issue")
+    Comment = apps.get_model("projects", "Comment")
+    Project.objects.update(
+        issues_count=count_subquery(Issue, "project"),
+        issues_todo_count=count_subquery(Issue, "project", status="TODO"),
+        issues_in_progress_count=count_subquery(
+            Issue, "project", status="IN_PROGRESS"
+        ),
+        issues_finished_count=count_subquery(
+            Issue, "project", status="FINISHED"
+        ),
+    )
+    Issue.objects.update(comments_count=count_subquery(Comment, "issue"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("projects", "0005_search_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="issue",
+            name="comments_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="project",
+            name="issues_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="project",
+            name="issues_finished_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="project",
+            name="issues_in_progress_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="project",
+            name="issues_todo_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(populate_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 5.0 on 2026-10-17 04:20
+
+import django.utils.timezone
+from django.db import migrations, models
+from django.db.models import F
+
+
+def initialize_updated_time(apps, schema_editor):
+    for model_name in ("Project", "Issue", "Comment"):
+        model = apps.get_model("projects", model_name)
+        model.objects.update(updated_time=F("created_time"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("projects", "0006_denormalized_counters"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="comment",
+            name="updated_time",
+            field=models.DateTimeField(
+                auto_now=True, default=django.utils.timezone.now
+            ),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name="issue",
+            name="updated_time",
+            field=models.DateTimeField(
+                auto_now=True, default=django.utils.timezone.now
+            ),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name="project",
+            name="updated_time",
+            field=models.DateTimeField(
+                auto_now=True, default=django.utils.timezone.now
+            ),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name="project",
+            name="version",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(
+            initialize_updated_time, migrations.RunPython.noop
+        ),
+    ]
@@ -0,0 +1,78 @@
+# Generated by Django 5.0 on 2026-10-17 05:13
+
+from django.conf import settings
+from django.db import migrations, models
+
+# Ajouter une colonne générée stockée oblige SQLite à reconstruire la table
+# des problèmes, et le renommage de la nouvelle table échoue tant que les
+# triggers de l'index de recherche sur les commentaires y font référence.
+# Ils sont supprimés ici puis réinstallés après le migrate par
+# ``projects.search.install_search_triggers``.
+DROP_COMMENT_TRIGGERS_SQL = [
+    "DROP TRIGGER IF EXISTS projects_comment_search_insert",
+    "DROP TRIGGER IF EXISTS projects_comment_search_update",
+    "DROP TRIGGER IF EXISTS projects_comment_search_delete",
+]
+
+
+def drop_comment_search_triggers(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    for statement in DROP_COMMENT_TRIGGERS_SQL:
+        schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("projects", "0007_updated_time_and_version"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            drop_comment_search_triggers, migrations.RunPython.noop
+        ),
+        migrations.AddField(
+            model_name="issue",
+            name="priority_rank",
+            field=models.GeneratedField(
+                db_persist=True,
+                expression=models.Case(
+                    models.When(priority="LOW", then=models.Value(0)),
+                    models.When(priority="MEDIUM", then=models.Value(1)),
+                    models.When(priority="HIGH", then=models.Value(2)),
+                    output_field=models.PositiveSmallIntegerField(),
+                ),
+                output_field=models.PositiveSmallIntegerField(),
+            ),
+        ),
+        migrations.AddField(
+            model_name="issue",
+            name="status_rank",
+            field=models.GeneratedField(
+                db_persist=True,
+                expression=models.Case(
+                    models.When(status="TODO", then=models.Value(0)),
+                    models.When(status="IN_PROGRESS", then=models.Value(1)),
+                    models.When(status="FINISHED", then=models.Value(2)),
+                    output_field=models.PositiveSmallIntegerField(),
+                ),
+                output_field=models.PositiveSmallIntegerField(),
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="issue",
+            index=models.Index(
+                fields=["project", "priority_rank", "id"],
+                name="issue_project_priority_rank",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="issue",
+            index=models.Index(
+                fields=["project", "status_rank", "id"],
+                name="issue_project_status_rank",
+            ),
+        ),
+    ]
@@ -12,6 +12,21 @@ from django.db import models
 import uuid
 
 
+def choice_rank(field, choices):
+    """Rang de la valeur de ``field`` dans l'ordre de ``choices``.
+
+    Sert de tri aux champs à choix, que l'ordre alphabétique de leurs
+    valeurs ne rend pas (HIGH, LOW, MEDIUM).
+    """
+    return models.Case(
+        *(
+            models.When(**{field: value}, then=models.Value(rank))
+            for rank, (value, _) in enumerate(choices)
+        ),
+        output_field=models.PositiveSmallIntegerField(),
+    )
+
+
 class Project(models.Model):
     """Modèle de projet pour la gestion des projets de développement logiciel.
 
@@ -24,6 +39,13 @@ class Project(models.Model):
         type: Type de projet (Backend, Frontend, iOS, Android)
         author: Utilisateur qui a créé le projet
         created_time: Horodatage de la création du projet
+        updated_time: Dernière modification du projet ou de son contenu
+        version: Numéro de version incrémenté à chaque écriture dans le
+            projet (contributeurs, problèmes, commentaires)
+        issues_count: Nombre de problèmes du projet (dénormalisé)
+        issues_todo_count: Nombre de problèmes à faire (dénormalisé)
+        issues_in_progress_count: Nombre de problèmes en cours (dénormalisé)
+        issues_finished_count: Nombre de problèmes terminés (dénormalisé)
     """
 
     TYPE_CHOICES = [
@@ -42,6 +64,17 @@ class Project(models.Model):
         related_name="authored_projects",
     )
     created_time = models.DateTimeField(auto_now_add=True)
+    updated_time = models.DateTimeField(auto_now=True)
+    version = models.PositiveIntegerField(default=0, editable=False)
+    # Compteurs maintenus par projects.counters
+    issues_count = models.PositiveIntegerField(default=0, editable=False)
+    issues_todo_count = models.PositiveIntegerField(default=0, editable=False)
+    issues_in_progress_count = models.PositiveIntegerField(
+        default=0, editable=False
+    )
+    issues_finished_count = models.PositiveIntegerField(
+        default=0, editable=False
+    )
 
     def __str__(self):
         """Retourne la représentation textuelle du projet."""
@@ -85,6 +118,12 @@ class Contributor(models.Model):
         """Options Meta pour le modèle Contributor."""
 
         unique_together = ("user", "project")
+        indexes = [
+            models.Index(
+                fields=["project", "created_time", "id"],
+                name="contributor_project_keyset",
+            ),
+        ]
 
     def __str__(self):
         """Retourne la représentation textuelle de la contribution."""
@@ -108,6 +147,11 @@ class Issue(models.Model):
         tag: Type de problème (Bug/Fonctionnalité/Tâche)
         status: Statut actuel (À faire/En cours/Terminé)
         created_time: Moment où le problème a été créé
+        updated_time: Moment de la dernière modification du problème
+        comments_count: Nombre de commentaires du problème (dénormalisé)
+        priority_rank: Rang de la priorité (0 pour LOW à 2 pour HIGH),
+            calculé et stocké par la base, pour le tri
+        status_rank: Rang du statut (0 pour TODO à 2 pour FINISHED)
     """
 
     PRIORITY_CHOICES = [
@@ -152,6 +196,69 @@ class Issue(models.Model):
         max_length=11, choices=STATUS_CHOICES, default="TODO"
     )
     created_time = models.DateTimeField(auto_now_add=True)
+    updated_time = models.DateTimeField(auto_now=True)
+    # Compteur maintenu par projects.counters
+    comments_count = models.PositiveIntegerField(default=0, editable=False)
+    priority_rank = models.GeneratedField(
+        expression=choice_rank("priority", PRIORITY_CHOICES),
+        output_field=models.PositiveSmallIntegerField(),
+        db_persist=True,
+    )
+    status_rank = models.GeneratedField(
+        expression=choice_rank("status", STATUS_CHOICES),
+        output_field=models.PositiveSmallIntegerField(),
+        db_persist=True,
+    )
+
+    class Meta:
+        """Options Meta pour le modèle Issue.
+
+        Les index composites servent la pagination par curseur, les
+        filtres et les tris de la liste des problèmes (voir
+        ``projects.filters``).
+        """
+
+        indexes = [
+            models.Index(
+                fields=["project", "created_time", "id"],
+                name="issue_project_keyset",
+            ),
+            models.Index(
+                fields=["project", "status", "created_time"],
+                name="issue_project_status",
+            ),
+            models.Index(
+                fields=["project", "priority", "created_time"],
+                name="issue_project_priority",
+            ),
+            models.Index(
+                fields=["project", "tag", "created_time"],
+                name="issue_project_tag",
+            ),
+            models.Index(
+                fields=["project", "priority_rank", "id"],
+                name="issue_project_priority_rank",
+            ),
+            models.Index(
+                fields=["project", "status_rank", "id"],
+                name="issue_project_status_rank",
+            ),
+            models.Index(
+                fields=["assignee", "status"],
+                name="issue_assignee_status",
+            ),
+            models.Index(
+                fields=["author", "status"],
+                name="issue_author_status",
+            ),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Mémorise le statut chargé pour détecter ses changements."""
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_status = instance.__dict__.get("status")
+        return instance
 
     def __str__(self):
         """Retourne la représentation textuelle du problème."""
@@ -171,6 +278,7 @@ class Comment(models.Model):
         issue: Problème sur lequel porte le commentaire
         uuid: Identifiant unique pour le commentaire
         created_time: Moment où le commentaire a été publié
+        updated_time: Moment de la dernière modification du commentaire
     """
 
     description = models.TextField(max_length=2048)
@@ -186,6 +294,17 @@ class Comment(models.Model):
     )
     uuid = models.UUIDField(default=uuid.uuid4, editable=False, unique=True)
     created_time = models.DateTimeField(auto_now_add=True)
+    updated_time = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        """Options Meta pour le modèle Comment."""
+
+        indexes = [
+            models.Index(
+                fields=["issue", "created_time", "id"],
+                name="comment_issue_keyset",
+            ),
+        ]
 
     def __str__(self):
         """Retourne la représentation textuelle du commentaire."""
@@ -0,0 +1,249 @@
+"""Pagination pour l'application de projets.
+
+Ce module fournit une pagination hybride pour les ressources imbriquées
+(contributeurs, problèmes, commentaires):
+- Mode par numéro de page (par défaut), identique à la pagination globale
+- Mode curseur (keyset), activé par ``?pagination=cursor`` ou par la
+  présence d'un paramètre ``cursor``, qui évite le ``COUNT(*)`` et le
+  parcours ``OFFSET`` des pages profondes
+"""
+
+import base64
+import binascii
+import json
+from collections import OrderedDict
+from datetime import datetime
+
+from django.conf import settings
+from django.core.paginator import InvalidPage, Page
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(PageNumberPagination):
+    """Pagination par numéro de page avec un mode curseur sur (date, id).
+
+    En mode curseur, chaque page est obtenue par une requête bornée sur
+    l'index composite ``(parent, created_time, id)``: le coût d'une page
+    ne dépend pas de sa position, et parcourir toute la collection est
+    linéaire en nombre d'éléments.
+
+    Attributes:
+        cursor_query_param: Paramètre portant le curseur opaque
+        mode_query_param: Paramètre permettant de choisir le mode
+        ordering: Champs formant la clé du curseur, dans l'ordre
+    """
+
+    page_size_query_param = "page_size"
+    cursor_query_param = "cursor"
+    mode_query_param = "pagination"
+    ordering = ("created_time", "id")
+    invalid_cursor_message = "Curseur invalide."
+
+    @property
+    def max_page_size(self):
+        """Taille de page maximale, configurable dans les paramètres."""
+        return getattr(settings, "CURSOR_PAGINATION_MAX_PAGE_SIZE", 100)
+
+    def is_cursor_mode(self, request):
+        """Indique si la requête demande la pagination par curseur."""
+        return (
+            self.cursor_query_param in request.query_params
+            or request.query_params.get(self.mode_query_param) == "cursor"
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """Pagine le queryset selon le mode demandé par le client.
+
+        En mode page, un tri déjà demandé (``?ordering=``) est conservé;
+        le mode curseur impose toujours l'ordre de sa clé.
+        """
+        self.cursor_mode = self.is_cursor_mode(request)
+        if not self.cursor_mode:
+            if not queryset.ordered:
+                queryset = queryset.order_by(*self.ordering)
+            return super().paginate_queryset(queryset, request, view)
+
+        queryset = self.get_cursor_queryset(queryset, request)
+        return self.set_cursor_page(list(queryset))
+
+    async def apaginate_queryset(self, queryset, request):
+        """Variante asynchrone de ``paginate_queryset``.
+
+        Les deux modes sont servis par l'ORM asynchrone; en mode page, le
+        nombre total est compté par ``acount()`` et transmis au Paginator
+        de Django, qui n'exécute alors plus aucune requête.
+        """
+        self.cursor_mode = self.is_cursor_mode(request)
+        if self.cursor_mode:
+            queryset = self.get_cursor_queryset(queryset, request)
+            return self.set_cursor_page([obj async for obj in queryset])
+
+        page_size = self.get_page_size(request)
+        if not queryset.ordered:
+            queryset = queryset.order_by(*self.ordering)
+        paginator = self.django_paginator_class(queryset, page_size)
+        paginator.count = await queryset.acount()
+        page_number = self.get_page_number(request, paginator)
+        try:
+            number = paginator.validate_number(page_number)
+        except InvalidPage as exc:
+            raise NotFound(
+                self.invalid_page_message.format(
+                    page_number=page_number, message=str(exc)
+                )
+            )
+        bottom = (number - 1) * page_size
+        results = [obj async for obj in queryset[bottom : bottom + page_size]]
+        self.page = Page(results, number, paginator)
+        self.request = request
+        return results
+
+    def get_cursor_queryset(self, queryset, request):
+        """Restreint le queryset à la page demandée en mode curseur.
+
+        Un élément de plus que la taille de page est demandé pour savoir
+        s'il existe une page suivante.
+        """
+        queryset = queryset.order_by(*self.ordering)
+
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.cursor_page_size = self.get_page_size(request)
+        self.position, self.reverse = self.decode_cursor(request)
+
+        if self.position is not None:
+            queryset = queryset.filter(
+                self.position_filter(self.position, self.reverse)
+            )
+        if self.reverse:
+            queryset = queryset.reverse()
+        return queryset[: self.cursor_page_size + 1]
+
+    def set_cursor_page(self, results):
+        """Retient la page lue en mode curseur et ses voisines."""
+        has_more = len(results) > self.cursor_page_size
+        results = results[: self.cursor_page_size]
+        if self.reverse:
+            results.reverse()
+            self.has_next = self.position is not None
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = self.position is not None
+        self.page_results = results
+        return results
+
+    def position_filter(self, position, reverse):
+        """Construit la condition ``(created_time, id) > position``.
+
+        La borne large sur ``created_time`` permet à SQLite de parcourir
+        l'index par intervalle; la disjonction ne départage que les égalités.
+        """
+        created_time, pk = position
+        if reverse:
+            return Q(created_time__lte=created_time) & (
+                Q(created_time__lt=created_time) | Q(id__lt=pk)
+            )
+        return Q(created_time__gte=created_time) & (
+            Q(created_time__gt=created_time) | Q(id__gt=pk)
+        )
+
+    def get_paginated_response(self, data):
+        """Retourne la réponse paginée selon le mode utilisé."""
+        return Response(self.get_paginated_data(data))
+
+    def get_paginated_data(self, data):
+        """Retourne le corps de la réponse paginée selon le mode utilisé."""
+        if not self.cursor_mode:
+            return OrderedDict(
+                [
+                    ("count", self.page.paginator.count),
+                    ("next", self.get_next_link()),
+                    ("previous", self.get_previous_link()),
+                    ("results", data),
+                ]
+            )
+        return OrderedDict(
+            [
+                ("next", self.get_next_link()),
+                ("previous", self.get_previous_link()),
+                ("results", data),
+            ]
+        )
+
+    def get_paginated_response_schema(self, schema):
+        """Décrit la réponse paginée (sans ``count`` en mode curseur)."""
+        response_schema = super().get_paginated_response_schema(schema)
+        response_schema["required"] = ["results"]
+        return response_schema
+
+    def get_next_link(self):
+        """Retourne le lien vers la page suivante."""
+        if not self.cursor_mode:
+            return super().get_next_link()
+        if not self.has_next or not self.page_results:
+            return None
+        return self.build_link(self.page_results[-1], reverse=False)
+
+    def get_previous_link(self):
+        """Retourne le lien vers la page précédente."""
+        if not self.cursor_mode:
+            return super().get_previous_link()
+        if not self.has_previous or not self.page_results:
+            return None
+        return self.build_link(self.page_results[0], reverse=True)
+
+    def build_link(self, instance, reverse):
+        """Construit l'URL portant le curseur positionné sur ``instance``."""
+        url = remove_query_param(self.base_url, self.mode_query_param)
+        return replace_query_param(
+            url,
+            self.cursor_query_param,
+            self.encode_cursor(instance, reverse),
+        )
+
+    def encode_cursor(self, instance, reverse):
+        """Encode la position d'un objet en curseur opaque."""
+        payload = {
+            "t": instance.created_time.isoformat(),
+            "i": instance.pk,
+        }
+        if reverse:
+            payload["r"] = 1
+        raw = json.dumps(payload, separators=(",", ":")).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    def decode_cursor(self, request):
+        """Décode le curseur de la requête.
+
+        Returns:
+            Tuple ``((created_time, id), reverse)``, la position valant
+            ``None`` pour la première page
+
+        Raises:
+            NotFound: Si le curseur est mal formé
+        """
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+        try:
+            padding = "=" * (-len(encoded) % 4)
+            raw = base64.urlsafe_b64decode(encoded + padding)
+            payload = json.loads(raw)
+            position = (
+                datetime.fromisoformat(payload["t"]),
+                int(payload["i"]),
+            )
+            return position, bool(payload.get("r"))
+        except (
+            binascii.Error,
+            ValueError,
+            TypeError,
+            KeyError,
+            AttributeError,
+        ):
+            raise NotFound(self.invalid_cursor_message)
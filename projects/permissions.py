@@ -6,20 +6,43 @@ quels utilisateurs peuvent accéder aux différentes ressources du projet.
 
 from rest_framework import permissions
 
+from .membership import is_project_member
+
 
 class IsProjectContributor(permissions.BasePermission):
     """Permission permettant uniquement aux contributeurs d'un projet d'y accéder.
 
     Cette permission vérifie si l'utilisateur faisant la demande est un contributeur
     du projet concerné, quel que soit le type d'objet évalué (projet, problème
-    ou commentaire).
+    ou commentaire). L'appartenance est résolue par une requête indexée unique,
+    mémorisée pour la requête HTTP et dans le cache partagé.
     """
 
+    def has_permission(self, request, view):
+        """Vérifie l'appartenance au projet des routes imbriquées.
+
+        Sur les routes ``/projects/{id}/...``, les non-membres sont rejetés
+        avant toute requête de listing ou de création.
+
+        Args:
+            request: La requête HTTP
+            view: La vue appelée
+
+        Returns:
+            Boolean: True si la route n'est pas imbriquée dans un projet
+                    ou si l'utilisateur en est contributeur
+        """
+        project_pk = view.kwargs.get("project_pk")
+        if project_pk is None:
+            return True
+        return is_project_member(request, project_pk)
+
     def has_object_permission(self, request, view, obj):
         """Vérifie si l'utilisateur est contributeur du projet.
 
-        Cette méthode détermine d'abord le projet associé à l'objet évalué,
-        puis vérifie si l'utilisateur fait partie des contributeurs de ce projet.
+        Cette méthode détermine d'abord l'identifiant du projet associé à
+        l'objet évalué, sans charger le projet, puis vérifie si l'utilisateur
+        fait partie des contributeurs de ce projet.
 
         Args:
             request: La requête HTTP
@@ -31,16 +54,14 @@ class IsProjectContributor(permissions.BasePermission):
         """
         if hasattr(obj, "contributors"):
             # L'objet est un projet
-            project = obj
-        elif hasattr(obj, "project"):
+            project_id = obj.pk
+        elif hasattr(obj, "project_id"):
             # L'objet est lié directement à un projet (ex: issue)
-            project = obj.project
+            project_id = obj.project_id
         else:
             # L'objet est lié indirectement à un projet (ex: commentaire)
-            project = obj.issue.project
-        return request.user in [
-            contributor.user for contributor in project.contributors.all()
-        ]
+            project_id = obj.issue.project_id
+        return is_project_member(request, project_id)
 
 
 class IsAuthorOrReadOnly(permissions.BasePermission):
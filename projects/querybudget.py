@@ -0,0 +1,352 @@
+"""Budgets de requêtes SQL des routes de lecture de l'API.
+
+``QUERY_BUDGETS`` fixe, pour chaque action de lecture (``ViewSet.action``
+pour les ViewSets, ``Vue.méthode`` pour les autres vues), le nombre
+maximal de requêtes SQL d'une requête HTTP, cache vide. Le budget doit
+tenir quel que soit le volume des objets liés: ``check_budgets`` construit
+des jeux de données de 1, 10 et 1000 contributeurs, problèmes et
+commentaires, appelle chaque route et signale tout dépassement avec le SQL
+exécuté et la pile d'appels de chaque requête, ce qui désigne la ligne à
+l'origine d'une requête N+1.
+
+Une route de lecture sans budget est aussi signalée: toute nouvelle route
+doit être ajoutée à ``QUERY_BUDGETS`` et à ``ENDPOINTS``.
+
+Les vérifications s'exécutent sur une base de test jetable: avec la suite
+de tests (``projects/tests/test_query_budgets.py``), ou via la commande
+``check_query_budgets``, qui affiche en plus le nombre de requêtes de
+chaque action.
+"""
+
+import os
+import traceback
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client
+from django.urls import get_resolver
+from rest_framework_simplejwt.tokens import AccessToken
+
+from users.models import User
+from .bulk import create_comments, create_issues
+from .models import Comment, Contributor, Issue, Project
+
+# Nombre maximal de requêtes SQL par action, cache vide. Une requête
+# authentifiée en coûte au moins une (l'utilisateur), une route imbriquée
+# une de plus (l'appartenance au projet), une liste ou un détail
+# conditionnel une de plus (la version du projet)
+QUERY_BUDGETS = {
+    "ProjectViewSet.list": 4,
+    "ProjectViewSet.retrieve": 4,
+    "ProjectViewSet.search": 4,
+    "ProjectViewSet.search_all": 4,
+    "ProjectViewSet.export": 4,
+    "ContributorViewSet.list": 5,
+    "ContributorViewSet.retrieve": 4,
+    "IssueViewSet.list": 5,
+    "IssueViewSet.retrieve": 5,
+    "CommentViewSet.list": 5,
+    "CommentViewSet.retrieve": 4,
+    "UserDetailView.get": 1,
+}
+
+# Chemin de chaque action, complété par les identifiants du jeu de données
+ENDPOINTS = {
+    "ProjectViewSet.list": "/api/projects/",
+    "ProjectViewSet.retrieve": "/api/projects/{project}/",
+    "ProjectViewSet.search": "/api/projects/{project}/search/?q=api",
+    "ProjectViewSet.search_all": "/api/projects/search/?q=api",
+    "ProjectViewSet.export": "/api/projects/{project}/export/",
+    "ContributorViewSet.list": "/api/projects/{project}/users/",
+    "ContributorViewSet.retrieve": (
+        "/api/projects/{project}/users/{contributor}/"
+    ),
+    "IssueViewSet.list": "/api/projects/{project}/issues/",
+    "IssueViewSet.retrieve": "/api/projects/{project}/issues/{issue}/",
+    "CommentViewSet.list": (
+        "/api/projects/{project}/issues/{issue}/comments/"
+    ),
+    "CommentViewSet.retrieve": (
+        "/api/projects/{project}/issues/{issue}/comments/{comment}/"
+    ),
+    "UserDetailView.get": "/api/auth/account/",
+}
+
+# Volumes des objets liés pour lesquels les budgets doivent tenir
+SIZES = (1, 10, 1000)
+
+URLCONFS = ("projects.urls", "users.urls")
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Une action a dépassé son budget de requêtes SQL.
+
+    Attributes:
+        action: Action en cause (``ViewSet.action``)
+        size: Volume des objets liés
+        budget: Nombre maximal de requêtes
+        queries: Requêtes exécutées (voir ``QueryRecorder``)
+    """
+
+    def __init__(self, action, size, budget, queries):
+        self.action = action
+        self.size = size
+        self.budget = budget
+        self.queries = queries
+        super().__init__(self.describe())
+
+    def describe(self):
+        """Message détaillé: requêtes répétées, SQL et piles d'appels."""
+        lines = [
+            f"{self.action}: {len(self.queries)} requêtes SQL pour "
+            f"{self.size} objet(s) lié(s), budget {self.budget}."
+        ]
+        repeated = Counter(sql for sql, _ in self.queries)
+        for sql, count in repeated.most_common():
+            if count > 1:
+                lines.append(f"  Répétée {count} fois: {sql}")
+        for index, (sql, stack) in enumerate(self.queries, 1):
+            lines.append(f"  [{index}] {sql}")
+            lines.extend(
+                f"      {line}"
+                for line in "".join(stack).rstrip().splitlines()
+            )
+        return "\n".join(lines)
+
+
+class QueryRecorder:
+    """Enregistre le SQL et la pile d'appels des requêtes exécutées.
+
+    Seuls les appels faits depuis le code du projet sont gardés dans la
+    pile (ni Django, ni DRF, ni les bibliothèques installées).
+
+    Attributes:
+        queries: Liste de tuples (SQL, lignes de pile formatées)
+    """
+
+    def __init__(self, using=None):
+        self.connection = connection if using is None else using
+        self.queries = []
+        self.wrapper = None
+
+    def __call__(self, execute, sql, params, many, context):
+        frames = [
+            frame
+            for frame in traceback.extract_stack()[:-1]
+            if is_project_frame(frame)
+        ]
+        self.queries.append((sql, traceback.format_list(frames)))
+        return execute(sql, params, many, context)
+
+    def __enter__(self):
+        self.wrapper = self.connection.execute_wrapper(self)
+        self.wrapper.__enter__()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.wrapper.__exit__(*exc_info)
+
+
+def is_project_frame(frame):
+    """Indique si un appel de la pile appartient au code du projet.
+
+    Les appels des points de mesure (ce module, ``record_query``) sont
+    écartés.
+    """
+    return (
+        frame.filename.startswith(str(settings.BASE_DIR))
+        and "site-packages" not in frame.filename
+        and os.path.basename(frame.filename) != "querybudget.py"
+        and frame.name != "record_query"
+    )
+
+
+def read_actions():
+    """Actions de lecture exposées par les routes de l'API.
+
+    Returns:
+        Ensemble de noms ``ViewSet.action`` ou ``Vue.get``
+    """
+    actions = set()
+
+    def walk(resolver):
+        for pattern in resolver.url_patterns:
+            if hasattr(pattern, "url_patterns"):
+                walk(pattern)
+                continue
+            callback = pattern.callback
+            mapping = getattr(callback, "actions", None)
+            if mapping is not None:
+                if "get" in mapping:
+                    actions.add(f"{callback.cls.__name__}.{mapping['get']}")
+                continue
+            view_class = getattr(callback, "view_class", None)
+            if view_class is not None and hasattr(view_class, "get"):
+                actions.add(f"{view_class.__name__}.get")
+
+    for urlconf in URLCONFS:
+        walk(get_resolver(urlconf))
+    return actions
+
+
+def resolved_action(response):
+    """Action qui a traité une réponse du client de test."""
+    callback = response.resolver_match.func
+    mapping = getattr(callback, "actions", None)
+    if mapping is not None:
+        return f"{callback.cls.__name__}.{mapping['get']}"
+    return f"{callback.view_class.__name__}.get"
+
+
+def build_fixture(size, prefix="budget"):
+    """Construit un jeu de données où chaque relation compte ``size`` objets.
+
+    L'utilisateur mesuré est auteur de ``size`` projets; le premier a
+    ``size`` contributeurs et ``size`` problèmes, dont le premier a
+    ``size`` commentaires.
+
+    Returns:
+        Dictionnaire {"user", "project", "contributor", "issue",
+        "comment"}
+    """
+    users = User.objects.bulk_create(
+        User(
+            username=f"{prefix}{size}-{index}",
+            email=f"{prefix}{size}-{index}@example.com",
+            password="!",
+            age=30,
+        )
+        for index in range(size)
+    )
+    user = users[0]
+    projects = Project.objects.bulk_create(
+        Project(
+            title=f"Projet api {index}",
+            description="Projet de mesure des requêtes.",
+            type="BACKEND",
+            author=user,
+        )
+        for index in range(size)
+    )
+    project = projects[0]
+    Contributor.objects.bulk_create(
+        [
+            Contributor(user=user, project=other, role="AUTHOR")
+            for other in projects
+        ]
+        + [Contributor(user=other, project=project) for other in users[1:]]
+    )
+    issues = create_issues(
+        [
+            Issue(
+                title=f"Problème api {index}",
+                description="Problème de mesure des requêtes.",
+                tag="BUG",
+                priority="LOW",
+                project=project,
+                author=users[index % size],
+                assignee=users[(index + 1) % size],
+            )
+            for index in range(size)
+        ]
+    )
+    issue = issues[0]
+    comments = create_comments(
+        [
+            Comment(
+                description=f"Commentaire api {index}",
+                issue=issue,
+                author=users[index % size],
+            )
+            for index in range(size)
+        ]
+    )
+    return {
+        "user": user,
+        "project": project.pk,
+        "contributor": project.contributors.order_by("id").first().pk,
+        "issue": issue.pk,
+        "comment": comments[0].pk,
+    }
+
+
+def measure(client, path):
+    """Appelle une route, cache vide, et enregistre ses requêtes SQL.
+
+    Returns:
+        Tuple (réponse, QueryRecorder)
+    """
+    cache.clear()
+    with QueryRecorder() as recorder:
+        response = client.get(path)
+        if response.streaming:
+            for _ in response.streaming_content:
+                pass
+    return response, recorder
+
+
+def check_budgets(sizes=SIZES, actions=None, budgets=QUERY_BUDGETS):
+    """Vérifie le budget de chaque action pour chaque volume.
+
+    À exécuter sur une base de test: des données y sont créées.
+
+    Args:
+        sizes: Volumes des objets liés
+        actions: Actions à vérifier (toutes par défaut)
+        budgets: Table des budgets
+
+    Returns:
+        Tuple (comptes, erreurs): ``comptes`` est un dictionnaire
+        {action: {volume: nombre de requêtes}}, ``erreurs`` une liste
+        d'exceptions (QueryBudgetExceeded ou AssertionError)
+    """
+    errors = [
+        AssertionError(f"{action}: aucun budget de requêtes défini.")
+        for action in sorted(read_actions() - set(budgets))
+    ]
+    errors += [
+        AssertionError(f"{action}: aucun chemin dans ENDPOINTS.")
+        for action in sorted(set(budgets) - set(ENDPOINTS))
+    ]
+    selected = [
+        action
+        for action in budgets
+        if action in ENDPOINTS and (not actions or action in actions)
+    ]
+
+    counts = {action: {} for action in selected}
+    for size in sizes:
+        fixture = build_fixture(size)
+        token = AccessToken.for_user(fixture["user"])
+        client = Client(
+            raise_request_exception=True,
+            headers={"Authorization": f"Bearer {token}"},
+        )
+        for action in selected:
+            response, recorder = measure(
+                client, ENDPOINTS[action].format(**fixture)
+            )
+            counts[action][size] = len(recorder.queries)
+            if response.status_code != 200:
+                errors.append(
+                    AssertionError(
+                        f"{action}: statut {response.status_code} pour "
+                        f"{size} objet(s) lié(s)."
+                    )
+                )
+            elif resolved_action(response) != action:
+                errors.append(
+                    AssertionError(
+                        f"{action}: la route de ENDPOINTS mène à "
+                        f"{resolved_action(response)}."
+                    )
+                )
+            elif len(recorder.queries) > budgets[action]:
+                errors.append(
+                    QueryBudgetExceeded(
+                        action, size, budgets[action], recorder.queries
+                    )
+                )
+    return counts, errors
@@ -0,0 +1,165 @@
+"""Rendu et analyse rapides du JSON de l'API, et MessagePack facultatif.
+
+``FastJSONRenderer`` et ``FastJSONParser`` remplacent les classes JSON de
+DRF (voir ``REST_FRAMEWORK`` dans les paramètres). Ils utilisent orjson
+s'il est installé, et sinon le module ``json`` de la bibliothèque
+standard, comme DRF. orjson encode lui-même les dates (RFC 3339, ``Z``
+pour UTC) et les UUID, fréquents dans les données brutes comme l'export
+(``Comment.uuid``); les autres types (Decimal, chaînes traduisibles...)
+passent par l'encodeur de DRF. La sortie compacte est ainsi identique,
+octet pour octet, à celle de ``JSONRenderer``, sauf pour les flottants en
+notation exponentielle (``1e16`` au lieu de ``1e+16``).
+
+Si la bibliothèque msgpack est installée, ``MessagePackRenderer`` et
+``MessagePackParser`` servent aussi le type ``application/msgpack`` aux
+clients qui le demandent (``Accept`` / ``Content-Type``).
+"""
+
+import json
+
+from django.conf import settings
+from rest_framework import renderers
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser, JSONParser
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+# Séparateurs de ligne et de paragraphe Unicode (U+2028, U+2029) en
+# UTF-8, échappés pour que la sortie reste du JavaScript valide (comme le
+# fait JSONRenderer)
+LINE_SEPARATORS = (
+    (b"\xe2\x80\xa8", b"\\u2028"),
+    (b"\xe2\x80\xa9", b"\\u2029"),
+)
+
+_encoder = JSONEncoder()
+
+
+def encode_default(obj):
+    """Convertit les types qu'orjson ou msgpack n'encodent pas eux-mêmes."""
+    return _encoder.default(obj)
+
+
+def dumps(data, indent=False):
+    """Encode ``data`` en JSON UTF-8.
+
+    Args:
+        data: Données à encoder
+        indent: Si True, la sortie est indentée
+
+    Returns:
+        Octets JSON
+    """
+    if orjson is not None:
+        option = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        try:
+            output = orjson.dumps(data, default=encode_default, option=option)
+        except orjson.JSONEncodeError:
+            # Entier hors de 64 bits, par exemple: encodé par la
+            # bibliothèque standard
+            pass
+        else:
+            for raw, escaped in LINE_SEPARATORS:
+                if raw in output:
+                    output = output.replace(raw, escaped)
+            return output
+    return renderers.JSONRenderer().render(
+        data, renderer_context={"indent": 2 if indent else None}
+    )
+
+
+def loads(data):
+    """Décode du JSON (octets ou texte).
+
+    Raises:
+        ValueError: Si le document n'est pas du JSON valide
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+class FastJSONRenderer(renderers.JSONRenderer):
+    """Rendu JSON par orjson, ou par la bibliothèque standard à défaut.
+
+    Les réponses indentées (``; indent=N`` dans ``Accept``, API
+    navigable) le sont toujours de deux espaces avec orjson.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        """Rend ``data`` en JSON UTF-8, indenté si le client le demande."""
+        if orjson is None or self.ensure_ascii:
+            return super().render(data, accepted_media_type, renderer_context)
+        if data is None:
+            return b""
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        return dumps(data, indent=bool(indent))
+
+
+class FastJSONParser(JSONParser):
+    """Analyse du JSON par orjson, ou par la bibliothèque standard à défaut."""
+
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        """Décode le corps JSON de la requête.
+
+        Raises:
+            ParseError: Si le corps n'est pas du JSON valide
+        """
+        parser_context = parser_context or {}
+        encoding = parser_context.get("encoding", settings.DEFAULT_CHARSET)
+        if orjson is None or encoding.lower().replace("-", "") != "utf8":
+            return super().parse(stream, media_type, parser_context)
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError(f"JSON parse error - {exc}")
+
+
+class MessagePackRenderer(renderers.BaseRenderer):
+    """Rendu MessagePack, pour les clients non navigateurs.
+
+    Les dates, UUID et autres types non natifs sont encodés comme en JSON,
+    sous forme de chaînes.
+    """
+
+    media_type = "application/msgpack"
+    format = "msgpack"
+    charset = None
+    render_style = "binary"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        """Rend ``data`` en MessagePack."""
+        if data is None:
+            return b""
+        return msgpack.packb(data, default=encode_default, use_bin_type=True)
+
+
+class MessagePackParser(BaseParser):
+    """Analyse des corps de requête MessagePack."""
+
+    media_type = "application/msgpack"
+    renderer_class = MessagePackRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        """Décode le corps MessagePack de la requête.
+
+        Raises:
+            ParseError: Si le corps n'est pas du MessagePack valide
+        """
+        try:
+            return msgpack.unpackb(stream.read(), raw=False)
+        except (ValueError, msgpack.UnpackException) as exc:
+            raise ParseError(f"MessagePack parse error - {exc}")
@@ -0,0 +1,181 @@
+"""Répartition des lectures entre la base principale et ses répliques.
+
+Les lectures des applications ``projects`` et ``users`` faites pendant une
+requête GET, HEAD ou OPTIONS sont envoyées à une réplique en lecture
+(``REPLICA_DATABASES``); toutes les écritures, et toutes les lectures hors
+de ces requêtes (autres méthodes, commandes, shell), vont à la base
+principale.
+
+Une réplique est choisie au début de la requête et sert toutes ses
+lectures: la version d'un projet (ETag, cache des réponses) et les
+données renvoyées proviennent ainsi du même état de la base.
+
+Une réplique peut être en retard sur la base principale. Pour qu'un
+utilisateur voie ses propres modifications, chacune de ses écritures
+épingle ses lectures à la base principale pendant
+``REPLICA_PIN_SECONDS`` secondes. L'épinglage est conservé dans le cache
+de Django: il n'est partagé entre les processus que si ce cache l'est.
+L'utilisateur est identifié par son jeton JWT, vérifié sans accès à la
+base.
+"""
+
+import random
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+from rest_framework_simplejwt.settings import api_settings
+
+from users.authentication import CachedJWTAuthentication
+
+# Alias de la réplique qui sert les lectures de la requête en cours, ou
+# None pour la base principale
+read_alias = ContextVar("read_alias", default=None)
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+def get_replicas():
+    """Alias des bases de données en lecture seule."""
+    return list(getattr(settings, "REPLICA_DATABASES", []))
+
+
+def get_pin_timeout():
+    """Durée d'épinglage à la base principale après une écriture."""
+    return getattr(settings, "REPLICA_PIN_SECONDS", 5)
+
+
+def pin_cache_key(user_id):
+    """Clé de cache de l'épinglage d'un utilisateur."""
+    return f"db:pinned:{user_id}"
+
+
+def get_token_user_id(request):
+    """Identifiant d'utilisateur porté par le jeton JWT de la requête.
+
+    Le jeton est vérifié par sa signature seulement, sans charger
+    l'utilisateur.
+
+    Returns:
+        L'identifiant, ou None si la requête ne porte pas de jeton valide
+    """
+    authentication = CachedJWTAuthentication()
+    header = authentication.get_header(request)
+    if header is None:
+        return None
+    raw_token = authentication.get_raw_token(header)
+    if raw_token is None:
+        return None
+    try:
+        token = authentication.get_validated_token(raw_token)
+    except (InvalidToken, TokenError):
+        return None
+    return token.get(api_settings.USER_ID_CLAIM)
+
+
+class ReplicaRouter:
+    """Routeur de bases de données des applications projects et users.
+
+    Attributes:
+        app_labels: Applications dont les lectures peuvent aller aux
+            répliques
+    """
+
+    app_labels = {"projects", "users"}
+
+    def db_for_read(self, model, **hints):
+        """Réplique choisie pour la requête en cours, sinon la principale."""
+        if model._meta.app_label not in self.app_labels:
+            return None
+        return read_alias.get() or DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        """Toujours la base principale.
+
+        Sans cela, Django écrirait un objet lu sur une réplique dans cette
+        même réplique.
+        """
+        if model._meta.app_label not in self.app_labels:
+            return None
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        """Autorise les relations entre la principale et ses répliques."""
+        databases = {DEFAULT_DB_ALIAS, *get_replicas()}
+        if {obj1._state.db, obj2._state.db} <= databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        """Les migrations ne s'appliquent qu'à la base principale.
+
+        Les répliques reçoivent le schéma par la réplication.
+        """
+        if db in get_replicas():
+            return False
+        return None
+
+
+class ReplicaRoutingMiddleware:
+    """Choisit la base qui sert les lectures de chaque requête.
+
+    Les requêtes sûres d'un utilisateur non épinglé lisent sur une
+    réplique tirée au hasard; les autres lisent sur la base principale.
+    Une requête d'écriture authentifiée épingle ensuite l'utilisateur.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        replicas = get_replicas()
+        if not replicas:
+            return self.get_response(request)
+
+        user_id = get_token_user_id(request)
+        alias = None
+        if request.method in SAFE_METHODS:
+            if user_id is None or not cache.get(pin_cache_key(user_id)):
+                alias = random.choice(replicas)
+
+        token = read_alias.set(alias)
+        try:
+            response = self.get_response(request)
+        finally:
+            read_alias.reset(token)
+
+        if request.method not in SAFE_METHODS and user_id is not None:
+            cache.set(pin_cache_key(user_id), True, get_pin_timeout())
+        return response
+
+    async def __acall__(self, request):
+        replicas = get_replicas()
+        if not replicas:
+            return await self.get_response(request)
+
+        user_id = get_token_user_id(request)
+        alias = None
+        if request.method in SAFE_METHODS:
+            if user_id is None or not await cache.aget(pin_cache_key(user_id)):
+                alias = random.choice(replicas)
+
+        token = read_alias.set(alias)
+        try:
+            response = await self.get_response(request)
+        finally:
+            read_alias.reset(token)
+
+        if request.method not in SAFE_METHODS and user_id is not None:
+            await cache.aset(pin_cache_key(user_id), True, get_pin_timeout())
+        return response
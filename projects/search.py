@@ -0,0 +1,279 @@
+"""Recherche plein texte sur les problèmes et les commentaires.
+
+Ce module interroge l'index SQLite FTS5 ``projects_search`` créé par la
+migration 0005, qui indexe ``Issue.title``, ``Issue.description`` et
+``Comment.description``. L'index est tenu à jour par des triggers SQLite,
+donc aussi pour les ``bulk_create`` et ``update`` qui n'émettent pas de
+signaux Django. Sur une base sans FTS5, la recherche se replie sur un
+filtre ``LIKE``, sans classement par pertinence.
+"""
+
+import re
+
+from django.db import connections
+from django.db.models import Q
+
+from .models import Comment, Issue
+
+SEARCH_TABLE = "projects_search"
+
+# Poids BM25 par colonne (title, body, project, issue_id): un terme trouvé
+# dans le titre compte davantage que dans le corps du texte
+BM25_WEIGHTS = "10.0, 1.0, 0.0, 0.0"
+
+TRIGGERS_SQL = [
+    """
+    CREATE TRIGGER IF NOT EXISTS projects_issue_search_insert
+    AFTER INSERT ON projects_issue BEGIN
+        INSERT INTO projects_search (rowid, title, body, project, issue_id)
+        VALUES (
+            new.id * 2, new.title, new.description,
+            'p' || new.project_id, new.id
+        );
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS projects_issue_search_update
+    AFTER UPDATE OF title, description, project_id ON projects_issue BEGIN
+        DELETE FROM projects_search WHERE rowid = old.id * 2;
+        INSERT INTO projects_search (rowid, title, body, project, issue_id)
+        VALUES (
+            new.id * 2, new.title, new.description,
+            'p' || new.project_id, new.id
+        );
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS projects_issue_search_delete
+    AFTER DELETE ON projects_issue BEGIN
+        DELETE FROM projects_search WHERE rowid = old.id * 2;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS projects_comment_search_insert
+    AFTER INSERT ON projects_comment BEGIN
+        INSERT INTO projects_search (rowid, title, body, project, issue_id)
+        SELECT
+            new.id * 2 + 1, '', new.description,
+            'p' || projects_issue.project_id, new.issue_id
+        FROM projects_issue WHERE projects_issue.id = new.issue_id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS projects_comment_search_update
+    AFTER UPDATE OF description, issue_id ON projects_comment BEGIN
+        DELETE FROM projects_search WHERE rowid = old.id * 2 + 1;
+        INSERT INTO projects_search (rowid, title, body, project, issue_id)
+        SELECT
+            new.id * 2 + 1, '', new.description,
+            'p' || projects_issue.project_id, new.issue_id
+        FROM projects_issue WHERE projects_issue.id = new.issue_id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS projects_comment_search_delete
+    AFTER DELETE ON projects_comment BEGIN
+        DELETE FROM projects_search WHERE rowid = old.id * 2 + 1;
+    END
+    """,
+]
+
+REBUILD_SQL = [
+    "DELETE FROM projects_search",
+    """
+    INSERT INTO projects_search (rowid, title, body, project, issue_id)
+    SELECT id * 2, title, description, 'p' || project_id, id
+    FROM projects_issue
+    """,
+    """
+    INSERT INTO projects_search (rowid, title, body, project, issue_id)
+    SELECT
+        projects_comment.id * 2 + 1, '', projects_comment.description,
+        'p' || projects_issue.project_id, projects_comment.issue_id
+    FROM projects_comment
+    JOIN projects_issue ON projects_issue.id = projects_comment.issue_id
+    """,
+    "INSERT INTO projects_search (projects_search) VALUES ('optimize')",
+]
+
+SEARCH_SQL = f"""
+    SELECT
+        projects_search.rowid,
+        projects_issue.id,
+        projects_issue.project_id,
+        projects_issue.title,
+        snippet(projects_search, -1, '[', ']', '…', 16),
+        bm25(projects_search, {BM25_WEIGHTS}) AS score
+    FROM projects_search
+    JOIN projects_issue ON projects_issue.id = projects_search.issue_id
+    WHERE projects_search MATCH %s
+    ORDER BY score
+    LIMIT %s OFFSET %s
+"""
+
+TERM_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+def search_index_exists(using="default"):
+    """Indique si l'index FTS5 est présent dans la base ``using``."""
+    connection = connections[using]
+    if connection.vendor != "sqlite":
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s",
+            [SEARCH_TABLE],
+        )
+        return cursor.fetchone() is not None
+
+
+def install_search_triggers(using="default"):
+    """Installe les triggers de synchronisation de l'index s'ils manquent.
+
+    Appelée après chaque ``migrate``: SQLite supprime les triggers d'une
+    table lorsqu'une migration la reconstruit.
+    """
+    if not search_index_exists(using):
+        return
+    with connections[using].cursor() as cursor:
+        for statement in TRIGGERS_SQL:
+            cursor.execute(statement)
+
+
+def rebuild_search_index(using="default"):
+    """Reconstruit entièrement l'index à partir des tables sources.
+
+    Returns:
+        Boolean: False si la base ne dispose pas de l'index FTS5
+    """
+    if not search_index_exists(using):
+        return False
+    install_search_triggers(using)
+    with connections[using].cursor() as cursor:
+        for statement in REBUILD_SQL:
+            cursor.execute(statement)
+    return True
+
+
+def parse_terms(query):
+    """Découpe la saisie de l'utilisateur en termes de recherche."""
+    return TERM_PATTERN.findall(query)
+
+
+def build_match_expression(terms, project_ids):
+    """Construit l'expression FTS5 MATCH à partir de termes déjà découpés.
+
+    Chaque terme est cité pour neutraliser la syntaxe FTS5; le dernier est
+    recherché comme préfixe. La restriction aux projets est évaluée par
+    l'index lui-même, via les jetons ``p<id>`` de la colonne ``project``.
+    """
+    phrases = [f'"{term}"' for term in terms]
+    phrases[-1] += "*"
+    projects = " OR ".join(f"p{int(project_id)}" for project_id in project_ids)
+    return f"project : ({projects}) AND {{title body}} : ({' '.join(phrases)})"
+
+
+def search(query, project_ids, offset=0, limit=10, using="default"):
+    """Recherche les problèmes et commentaires correspondant à ``query``.
+
+    Args:
+        query: Texte saisi par l'utilisateur
+        project_ids: Projets dans lesquels chercher (ceux dont
+            l'utilisateur est membre)
+        offset: Nombre de résultats à sauter
+        limit: Nombre maximal de résultats à retourner
+        using: Alias de la base de données
+
+    Returns:
+        Liste de dictionnaires (type, id, issue, project, title, snippet,
+        rank), du plus pertinent au moins pertinent
+    """
+    terms = parse_terms(query)
+    project_ids = list(project_ids)
+    if not terms or not project_ids:
+        return []
+    if search_index_exists(using):
+        return _search_fts(terms, project_ids, offset, limit, using)
+    return _search_like(terms, project_ids, offset, limit, using)
+
+
+def _search_fts(terms, project_ids, offset, limit, using):
+    """Recherche classée via l'index FTS5."""
+    expression = build_match_expression(terms, project_ids)
+    with connections[using].cursor() as cursor:
+        cursor.execute(SEARCH_SQL, [expression, limit, offset])
+        rows = cursor.fetchall()
+    return [
+        {
+            "type": "comment" if rowid % 2 else "issue",
+            "id": rowid // 2,
+            "issue": issue_id,
+            "project": project_id,
+            "title": title,
+            "snippet": snippet,
+            "rank": -score,
+        }
+        for rowid, issue_id, project_id, title, snippet, score in rows
+    ]
+
+
+def _search_like(terms, project_ids, offset, limit, using):
+    """Recherche de repli par ``LIKE``, les problèmes avant les commentaires.
+
+    Sans index plein texte, chaque terme doit apparaître dans le titre ou
+    la description; les résultats sont triés du plus récent au plus ancien.
+    """
+    issue_filter = Q()
+    comment_filter = Q()
+    for term in terms:
+        issue_filter &= Q(title__icontains=term) | Q(
+            description__icontains=term
+        )
+        comment_filter &= Q(description__icontains=term)
+
+    end = offset + limit
+    issues = list(
+        Issue.objects.using(using)
+        .filter(issue_filter, project_id__in=project_ids)
+        .order_by("-created_time", "-id")
+        .values("id", "project_id", "title", "description")[:end]
+    )
+    comments = []
+    if len(issues) < end:
+        comments = list(
+            Comment.objects.using(using)
+            .filter(comment_filter, issue__project_id__in=project_ids)
+            .order_by("-created_time", "-id")
+            .values(
+                "id",
+                "issue_id",
+                "issue__project_id",
+                "issue__title",
+                "description",
+            )[: end - len(issues)]
+        )
+
+    hits = [
+        {
+            "type": "issue",
+            "id": issue["id"],
+            "issue": issue["id"],
+            "project": issue["project_id"],
+            "title": issue["title"],
+            "snippet": issue["description"][:160],
+            "rank": None,
+        }
+        for issue in issues
+    ] + [
+        {
+            "type": "comment",
+            "id": comment["id"],
+            "issue": comment["issue_id"],
+            "project": comment["issue__project_id"],
+            "title": comment["issue__title"],
+            "snippet": comment["description"][:160],
+            "rank": None,
+        }
+        for comment in comments
+    ]
+    return hits[offset:end]
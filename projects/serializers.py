@@ -6,21 +6,36 @@ Ce module contient tous les sérialiseurs pour l'application projects:
 - ProjectDetailSerializer: Informations détaillées sur les projets avec
   données associées
 - ContributorSerializer: Informations sur les contributeurs du projet
+- PartialListSerializer: Validation d'une liste élément par élément
 - IssueListSerializer: Informations de base sur les problèmes pour les vues
-  de liste
+  de liste et la création en masse
+- IssueBatchUpdateSerializer: Modification groupée de problèmes
 - IssueDetailSerializer: Informations détaillées sur les problèmes avec
-  commentaires
+  leurs derniers commentaires
 - CommentSerializer: Informations sur les commentaires
+- SearchHitSerializer: Résultats de la recherche plein texte
+
+En lecture, les paramètres ``?fields=`` et ``?omit=`` restreignent les
+champs de tous ces sérialiseurs (voir ``projects.fieldsets``).
 """
 
+from django.conf import settings
+from django.urls import reverse
 from rest_framework import serializers
+from rest_framework.utils.urls import replace_query_param
 import django.contrib.auth
 
 from users.serializers import UserSerializer
+from .counters import STATUS_COUNT_FIELDS
+from .fieldsets import SparseFieldsetMixin
 from .models import Project, Contributor, Issue, Comment
+from .pagination import KeysetPagination
+from .timing import TimedSerializerMixin
 
 
-class ProjectListSerializer(serializers.ModelSerializer):
+class ProjectListSerializer(
+    SparseFieldsetMixin, TimedSerializerMixin, serializers.ModelSerializer
+):
     """Sérialiseur pour la vue de liste des projets.
 
     Fournit des informations de base sur les projets adaptées aux affichages
@@ -33,8 +48,13 @@ class ProjectListSerializer(serializers.ModelSerializer):
         type: Type de projet
         author: Créateur du projet
         created_time: Horodatage de création du projet
+        updated_time: Dernière modification du projet ou de son contenu
+        issues_count: Nombre de problèmes dans le projet
+        issues_by_status: Nombre de problèmes par statut
     """
 
+    issues_by_status = serializers.SerializerMethodField()
+
     class Meta:
         """Options Meta pour ProjectListSerializer."""
 
@@ -46,32 +66,54 @@ class ProjectListSerializer(serializers.ModelSerializer):
             "type",
             "author",
             "created_time",
+            "updated_time",
+            "issues_count",
+            "issues_by_status",
         )
-        read_only_fields = ("author", "created_time")
+        read_only_fields = ("author", "created_time", "issues_count")
+        sparse_sources = {
+            "issues_by_status": tuple(STATUS_COUNT_FIELDS.values())
+        }
+
+    def get_issues_by_status(self, obj):
+        """Obtient la répartition des problèmes par statut.
+
+        Les compteurs sont stockés sur le projet: aucune requête n'est
+        exécutée.
+
+        Args:
+            obj: Instance du projet
+
+        Returns:
+            Dictionnaire {statut: nombre de problèmes}
+        """
+        return {
+            status: getattr(obj, field)
+            for status, field in STATUS_COUNT_FIELDS.items()
+        }
 
 
 class ProjectDetailSerializer(ProjectListSerializer):
     """Sérialiseur pour la vue détaillée des projets.
 
     Étend ProjectListSerializer avec des données associées supplémentaires,
-    notamment les contributeurs et le nombre de problèmes.
+    notamment les contributeurs.
 
     Attributs supplémentaires:
         contributors: Liste des contributeurs du projet
-        issues_count: Nombre de problèmes dans le projet
     """
 
     author = UserSerializer(read_only=True)
     contributors = serializers.SerializerMethodField()
-    issues_count = serializers.SerializerMethodField()
 
     class Meta(ProjectListSerializer.Meta):
         """Options Meta pour ProjectDetailSerializer."""
 
-        fields = ProjectListSerializer.Meta.fields + (
-            "contributors",
-            "issues_count",
-        )
+        fields = ProjectListSerializer.Meta.fields + ("contributors",)
+        sparse_sources = {
+            **ProjectListSerializer.Meta.sparse_sources,
+            "contributors": (),
+        }
 
     def get_contributors(self, obj):
         """Obtient tous les contributeurs d'un projet.
@@ -83,21 +125,16 @@ class ProjectDetailSerializer(ProjectListSerializer):
             Liste des données sérialisées des contributeurs
         """
         contributors = obj.contributors.all()
-        return ContributorSerializer(contributors, many=True).data
-
-    def get_issues_count(self, obj):
-        """Obtient le nombre de problèmes d'un projet.
+        return ContributorSerializer(
+            contributors,
+            many=True,
+            context=self.nested_context("contributors"),
+        ).data
 
-        Args:
-            obj: Instance du projet
-
-        Returns:
-            Nombre entier de problèmes du projet
-        """
-        return obj.issues.count()
 
-
-class ContributorSerializer(serializers.ModelSerializer):
+class ContributorSerializer(
+    SparseFieldsetMixin, TimedSerializerMixin, serializers.ModelSerializer
+):
     """Sérialiseur pour les contributeurs de projets.
 
     Gère les informations des contributeurs, y compris leur rôle dans le
@@ -121,7 +158,9 @@ class ContributorSerializer(serializers.ModelSerializer):
         read_only_fields = ("created_time",)
 
 
-class ContributorCreateSerializer(serializers.ModelSerializer):
+class ContributorCreateSerializer(
+    SparseFieldsetMixin, TimedSerializerMixin, serializers.ModelSerializer
+):
     """Sérialiseur pour la création de contributeurs.
 
     Version simplifiée du ContributorSerializer où les champs project et user
@@ -141,7 +180,40 @@ class ContributorCreateSerializer(serializers.ModelSerializer):
         read_only_fields = ("project", "role")
 
 
-class IssueListSerializer(serializers.ModelSerializer):
+class PartialListSerializer(serializers.ListSerializer):
+    """Sérialiseur de liste qui conserve les éléments valides.
+
+    Contrairement à ListSerializer, une liste partiellement invalide ne
+    lève pas d'erreur: ``validated_data`` contient None à la place de
+    chaque élément invalide et ``item_errors`` les erreurs de chaque
+    élément ({} pour un élément valide). Les erreurs portant sur la liste
+    elle-même (type, liste vide, longueur maximale) restent levées.
+    """
+
+    def to_internal_value(self, data):
+        """Valide chaque élément séparément, sans interrompre la liste."""
+        if (
+            not isinstance(data, list)
+            or not data
+            or (self.max_length is not None and len(data) > self.max_length)
+        ):
+            return super().to_internal_value(data)
+
+        validated = []
+        self.item_errors = []
+        for item in data:
+            try:
+                validated.append(self.child.run_validation(item))
+                self.item_errors.append({})
+            except serializers.ValidationError as exc:
+                validated.append(None)
+                self.item_errors.append(exc.detail)
+        return validated
+
+
+class IssueListSerializer(
+    SparseFieldsetMixin, TimedSerializerMixin, serializers.ModelSerializer
+):
     """Sérialiseur pour la vue de liste des problèmes.
 
     Fournit des informations de base sur les problèmes adaptées aux affichages
@@ -158,6 +230,8 @@ class IssueListSerializer(serializers.ModelSerializer):
         tag: Type de problème
         status: Statut actuel
         created_time: Horodatage de création
+        updated_time: Horodatage de la dernière modification
+        comments_count: Nombre de commentaires
     """
 
     class Meta:
@@ -175,31 +249,167 @@ class IssueListSerializer(serializers.ModelSerializer):
             "tag",
             "status",
             "created_time",
+            "updated_time",
+            "comments_count",
         )
-        read_only_fields = ("author", "created_time", "project")
+        read_only_fields = (
+            "author",
+            "created_time",
+            "project",
+            "comments_count",
+        )
+        list_serializer_class = PartialListSerializer
+
+
+class IssueBatchUpdateSerializer(serializers.Serializer):
+    """Sérialiseur pour la modification groupée de problèmes.
+
+    Attributes:
+        ids: Identifiants des problèmes à modifier
+        status: Nouveau statut (facultatif)
+        priority: Nouvelle priorité (facultative)
+        assignee: Nouvel utilisateur assigné, ou null (facultatif)
+    """
+
+    BATCH_FIELDS = ("status", "priority", "assignee")
+
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=getattr(settings, "ISSUE_BATCH_UPDATE_MAX_ITEMS", 1000),
+    )
+    status = serializers.ChoiceField(
+        choices=Issue.STATUS_CHOICES, required=False
+    )
+    priority = serializers.ChoiceField(
+        choices=Issue.PRIORITY_CHOICES, required=False
+    )
+    assignee = serializers.PrimaryKeyRelatedField(
+        queryset=django.contrib.auth.get_user_model().objects.all(),
+        allow_null=True,
+        required=False,
+    )
+
+    def validate(self, attrs):
+        """Vérifie qu'au moins un champ est modifié."""
+        if not any(field in attrs for field in self.BATCH_FIELDS):
+            raise serializers.ValidationError(
+                "Indiquez au moins un champ à modifier: "
+                + ", ".join(self.BATCH_FIELDS)
+                + "."
+            )
+        return attrs
+
+    @property
+    def changes(self):
+        """Modifications à appliquer, sans la liste des identifiants."""
+        return {
+            field: self.validated_data[field]
+            for field in self.BATCH_FIELDS
+            if field in self.validated_data
+        }
 
 
 class IssueDetailSerializer(IssueListSerializer):
     """Sérialiseur pour la vue détaillée des problèmes.
 
     Étend IssueListSerializer avec des données associées supplémentaires,
-    notamment les commentaires.
+    notamment les commentaires. Seuls les derniers commentaires sont
+    intégrés; le paramètre ``?comments=N`` en change le nombre (0 pour
+    n'en intégrer aucun) et le reste est accessible via ``comments_more``.
 
     Attributs supplémentaires:
-        comments: Liste des commentaires sur le problème
+        comments: Derniers commentaires sur le problème, du plus ancien
+            au plus récent
+        comments_more: Lien paginé vers les commentaires non intégrés
     """
 
     author = UserSerializer(read_only=True)
     assignee = UserSerializer(read_only=True)
     comments = serializers.SerializerMethodField()
+    comments_more = serializers.SerializerMethodField()
 
     class Meta(IssueListSerializer.Meta):
         """Options Meta pour IssueDetailSerializer."""
 
-        fields = IssueListSerializer.Meta.fields + ("comments",)
+        fields = IssueListSerializer.Meta.fields + (
+            "comments",
+            "comments_more",
+        )
+        sparse_sources = {"comments": (), "comments_more": ("project",)}
+
+    def get_comments_limit(self):
+        """Obtient le nombre de commentaires à intégrer.
+
+        Returns:
+            Nombre entier borné par ``ISSUE_EMBEDDED_COMMENTS_MAX_LIMIT``,
+            0 si le client a désactivé l'intégration
+        """
+        default = getattr(settings, "ISSUE_EMBEDDED_COMMENTS_LIMIT", 10)
+        maximum = getattr(settings, "ISSUE_EMBEDDED_COMMENTS_MAX_LIMIT", 100)
+        request = self.context.get("request")
+        value = request.query_params.get("comments") if request else None
+        if value is None:
+            return default
+        if value.lower() in ("false", "none", "no"):
+            return 0
+        try:
+            return max(0, min(int(value), maximum))
+        except ValueError:
+            return default
+
+    def get_embedded_comments(self, obj):
+        """Charge les derniers commentaires d'un problème, une seule fois.
+
+        Une seule requête bornée est exécutée, quel que soit le nombre de
+        commentaires du problème.
+
+        Args:
+            obj: Instance du problème
+
+        Returns:
+            Tuple (commentaires intégrés, existence d'autres commentaires)
+        """
+        if not hasattr(obj, "_embedded_comments"):
+            limit = self.get_comments_limit()
+            latest = (
+                list(self.get_latest_comments(obj, limit)) if limit else []
+            )
+            self.embed_comments(obj, latest, limit)
+        return obj._embedded_comments
+
+    async def aload_embedded_comments(self, obj):
+        """Charge les commentaires intégrés avec l'ORM asynchrone.
+
+        Appelée avant la sérialisation, qui ne fait ensuite plus aucune
+        requête (voir ``projects.async_views``).
+        """
+        limit = self.get_comments_limit()
+        latest = []
+        if limit:
+            latest = [
+                comment
+                async for comment in self.get_latest_comments(obj, limit)
+            ]
+        self.embed_comments(obj, latest, limit)
+
+    def get_latest_comments(self, obj, limit):
+        """Requête des ``limit + 1`` derniers commentaires d'un problème."""
+        return obj.comments.select_related("author").order_by(
+            "-created_time", "-id"
+        )[: limit + 1]
+
+    def embed_comments(self, obj, latest, limit):
+        """Mémorise sur ``obj`` les commentaires intégrés et leur suite."""
+        if limit:
+            has_more = len(latest) > limit
+            embedded = latest[:limit][::-1]
+        else:
+            embedded, has_more = [], True
+        obj._embedded_comments = (embedded, has_more)
 
     def get_comments(self, obj):
-        """Obtient tous les commentaires d'un problème.
+        """Obtient les derniers commentaires d'un problème.
 
         Args:
             obj: Instance du problème
@@ -207,11 +417,42 @@ class IssueDetailSerializer(IssueListSerializer):
         Returns:
             Liste des données sérialisées des commentaires
         """
-        comments = obj.comments.all()
-        return CommentSerializer(comments, many=True).data
+        comments, _ = self.get_embedded_comments(obj)
+        return CommentSerializer(
+            comments, many=True, context=self.nested_context("comments")
+        ).data
+
+    def get_comments_more(self, obj):
+        """Obtient le lien vers les commentaires non intégrés.
 
+        Le lien pointe sur la liste paginée par curseur de CommentViewSet,
+        positionnée juste avant le plus ancien commentaire intégré.
 
-class CommentSerializer(serializers.ModelSerializer):
+        Args:
+            obj: Instance du problème
+
+        Returns:
+            URL de la page des commentaires plus anciens, ou None
+        """
+        comments, has_more = self.get_embedded_comments(obj)
+        if not has_more:
+            return None
+        url = reverse(
+            "issue-comments-list",
+            kwargs={"project_pk": obj.project_id, "issue_pk": obj.pk},
+        )
+        request = self.context.get("request")
+        if request is not None:
+            url = request.build_absolute_uri(url)
+        if not comments:
+            return replace_query_param(url, "pagination", "cursor")
+        cursor = KeysetPagination().encode_cursor(comments[0], reverse=True)
+        return replace_query_param(url, "cursor", cursor)
+
+
+class CommentSerializer(
+    SparseFieldsetMixin, TimedSerializerMixin, serializers.ModelSerializer
+):
     """Sérialiseur pour les commentaires sur les problèmes.
 
     Gère les informations des commentaires, y compris l'auteur et le problème
@@ -224,6 +465,7 @@ class CommentSerializer(serializers.ModelSerializer):
         issue: Problème associé
         uuid: Identifiant unique
         created_time: Horodatage de création
+        updated_time: Horodatage de la dernière modification
     """
 
     author = UserSerializer(read_only=True)
@@ -239,5 +481,30 @@ class CommentSerializer(serializers.ModelSerializer):
             "issue",
             "uuid",
             "created_time",
+            "updated_time",
         )
         read_only_fields = ("author", "uuid", "created_time", "issue")
+
+
+class SearchHitSerializer(
+    SparseFieldsetMixin, TimedSerializerMixin, serializers.Serializer
+):
+    """Sérialiseur pour un résultat de la recherche plein texte.
+
+    Attributes:
+        type: Nature du résultat ("issue" ou "comment")
+        id: Identifiant du problème ou du commentaire
+        issue: Problème concerné
+        project: Projet concerné
+        title: Titre du problème concerné
+        snippet: Extrait du texte, termes trouvés entre crochets
+        rank: Score de pertinence (None sans index plein texte)
+    """
+
+    type = serializers.ChoiceField(choices=("issue", "comment"))
+    id = serializers.IntegerField()
+    issue = serializers.IntegerField()
+    project = serializers.IntegerField()
+    title = serializers.CharField()
+    snippet = serializers.CharField()
+    rank = serializers.FloatField(allow_null=True)
@@ -0,0 +1,115 @@
+"""Signaux de l'application de projets.
+
+Ce module maintient les caches dérivés des modèles de projets:
+- Appartenance aux projets: invalidée à l'ajout ou au retrait d'un
+  contributeur
+- Compteurs dénormalisés: problèmes par projet et commentaires par
+  problème, mis à jour à la création, à la suppression et au changement
+  de statut
+- Version des projets: incrémentée à chaque écriture dans un projet, et
+  à la modification d'un utilisateur qu'ils affichent (un
+  ``QuerySet.update()`` sur les utilisateurs ne passant pas par les
+  signaux, il doit appeler ``touch_user_projects``)
+- Index de recherche: triggers réinstallés après chaque migration
+"""
+
+from django.conf import settings
+from django.db.models import QuerySet
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .counters import (
+    adjust_comment_count,
+    adjust_issue_counts,
+    move_issue_status,
+)
+from .membership import invalidate_membership
+from .models import Comment, Contributor, Issue, Project
+from .search import install_search_triggers
+from .versions import touch_issue_project, touch_project, touch_user_projects
+
+
+def deleted_with(origin, *models):
+    """Indique si une suppression en cascade part d'un des ``models``.
+
+    Les compteurs d'un parent supprimé en même temps que ses enfants n'ont
+    pas besoin d'être mis à jour.
+    """
+    if origin is None:
+        return False
+    model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    return issubclass(model, models)
+
+
+@receiver(post_save, sender=Contributor)
+@receiver(post_delete, sender=Contributor)
+def invalidate_contributor_membership(sender, instance, **kwargs):
+    """Invalide l'appartenance mémorisée et la version du projet."""
+    invalidate_membership(instance.project_id, instance.user_id)
+    if not deleted_with(kwargs.get("origin"), Project):
+        touch_project(instance.project_id)
+
+
+@receiver(post_save, sender=Issue)
+def count_saved_issue(sender, instance, created, raw=False, **kwargs):
+    """Met à jour les compteurs du projet d'un problème créé ou modifié."""
+    if raw:
+        return
+    if created:
+        adjust_issue_counts(instance.project_id, {instance.status: 1})
+    else:
+        loaded_status = getattr(instance, "_loaded_status", None)
+        if loaded_status is not None:
+            move_issue_status(
+                instance.project_id, loaded_status, instance.status
+            )
+    instance._loaded_status = instance.status
+    touch_project(instance.project_id)
+
+
+@receiver(post_delete, sender=Issue)
+def count_deleted_issue(sender, instance, origin=None, **kwargs):
+    """Retire un problème supprimé des compteurs de son projet."""
+    if deleted_with(origin, Project):
+        return
+    status = getattr(instance, "_loaded_status", None) or instance.status
+    adjust_issue_counts(instance.project_id, {status: -1})
+    touch_project(instance.project_id)
+
+
+@receiver(post_save, sender=Comment)
+def count_saved_comment(sender, instance, created, raw=False, **kwargs):
+    """Compte un nouveau commentaire sur son problème."""
+    if raw:
+        return
+    if created:
+        adjust_comment_count(instance.issue_id, 1)
+    touch_issue_project(instance.issue_id)
+
+
+@receiver(post_delete, sender=Comment)
+def count_deleted_comment(sender, instance, origin=None, **kwargs):
+    """Retire un commentaire supprimé du compteur de son problème."""
+    if not deleted_with(origin, Issue, Project):
+        adjust_comment_count(instance.issue_id, -1)
+        touch_issue_project(instance.issue_id)
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def touch_projects_of_updated_user(
+    sender, instance, created, update_fields=None, raw=False, **kwargs
+):
+    """Change la version des projets affichant un utilisateur modifié.
+
+    Les contributeurs sont imbriqués avec leurs données d'utilisateur dans
+    le détail d'un projet; seule la mise à jour de la date de dernière
+    connexion est ignorée.
+    """
+    if created or raw or update_fields == frozenset({"last_login"}):
+        return
+    touch_user_projects(instance.pk)
+
+
+def install_search_triggers_after_migrate(sender, using, **kwargs):
+    """Réinstalle les triggers de l'index de recherche après un migrate."""
+    install_search_triggers(using)
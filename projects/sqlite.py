@@ -0,0 +1,191 @@
+"""Réglages des connexions SQLite et maintenance de la base.
+
+Chaque nouvelle connexion SQLite reçoit les pragmas de ``SQLITE_PRAGMAS``
+(voir ``configure_connection``, connecté au signal ``connection_created``):
+- ``busy_timeout``: une écriture attend la fin d'une autre au lieu
+  d'échouer aussitôt avec « database is locked »
+- ``journal_mode=wal``: les lectures ne bloquent plus les écritures, et
+  inversement; persistant dans le fichier
+- ``synchronous=normal``: sûr en WAL, sans synchronisation disque à chaque
+  transaction
+- ``mmap_size`` et ``cache_size``: lectures par projection en mémoire et
+  cache de pages plus grand
+- ``auto_vacuum=incremental``: les pages libérées peuvent être rendues au
+  système par ``incremental_vacuum``; sur une base existante, ne prend
+  effet qu'après un ``VACUUM`` complet (``dbmaintain --vacuum``)
+
+Les connexions étant persistantes (``CONN_MAX_AGE``), ces pragmas ne sont
+exécutés qu'une fois par connexion et non à chaque requête.
+"""
+
+import os
+import re
+import time
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connections
+
+PRAGMA_NAMES = {
+    "auto_vacuum",
+    "busy_timeout",
+    "cache_size",
+    "foreign_keys",
+    "journal_mode",
+    "journal_size_limit",
+    "mmap_size",
+    "synchronous",
+    "temp_store",
+    "wal_autocheckpoint",
+}
+
+PRAGMA_VALUE = re.compile(r"^-?\w+$")
+
+# Valeurs de PRAGMA auto_vacuum
+AUTO_VACUUM_MODES = {0: "none", 1: "full", 2: "incremental"}
+
+
+def get_pragmas():
+    """Retourne les pragmas à appliquer, dans l'ordre d'application.
+
+    Raises:
+        ImproperlyConfigured: Si un pragma n'est pas reconnu, ou si sa
+            valeur n'est pas un entier ou un mot-clé
+    """
+    pragmas = getattr(settings, "SQLITE_PRAGMAS", {})
+    for name, value in pragmas.items():
+        if name not in PRAGMA_NAMES:
+            raise ImproperlyConfigured(f"Pragma SQLite non géré: {name}")
+        if not PRAGMA_VALUE.match(str(value)):
+            raise ImproperlyConfigured(
+                f"Valeur invalide pour le pragma SQLite {name}: {value!r}"
+            )
+    return pragmas
+
+
+def configure_connection(sender, connection, **kwargs):
+    """Applique les pragmas à une nouvelle connexion SQLite.
+
+    Récepteur du signal ``connection_created``; sans effet sur les autres
+    moteurs de base de données.
+    """
+    if connection.vendor != "sqlite":
+        return
+    with connection.cursor() as cursor:
+        for name, value in get_pragmas().items():
+            cursor.execute(f"PRAGMA {name} = {value}")
+
+
+def _pragma(cursor, name):
+    """Retourne la valeur courante d'un pragma."""
+    cursor.execute(f"PRAGMA {name}")
+    return cursor.fetchone()[0]
+
+
+def _file_size(path):
+    """Taille d'un fichier en octets, 0 s'il n'existe pas."""
+    try:
+        return os.path.getsize(path)
+    except (OSError, TypeError):
+        return 0
+
+
+def database_size(using="default"):
+    """Taille de la base et de son journal WAL, en octets."""
+    name = str(connections[using].settings_dict["NAME"])
+    return {
+        "database": _file_size(name),
+        "wal": _file_size(f"{name}-wal"),
+    }
+
+
+def maintain_database(using="default", vacuum=False, vacuum_pages=0):
+    """Exécute les opérations de maintenance d'une base SQLite.
+
+    Dans l'ordre: ``ANALYZE`` (statistiques de l'optimiseur), ``PRAGMA
+    optimize``, récupération des pages libres, puis point de contrôle du
+    journal WAL qui le ramène à une taille nulle.
+
+    Args:
+        using: Alias de la base de données
+        vacuum: Si True, exécute un ``VACUUM`` complet, qui passe la base
+            en ``auto_vacuum=incremental`` si elle ne l'est pas encore;
+            sinon, seul un ``incremental_vacuum`` est exécuté, et
+            seulement si la base est déjà dans ce mode
+        vacuum_pages: Nombre maximal de pages rendues par
+            ``incremental_vacuum`` (0 pour toutes)
+
+    Returns:
+        Liste des étapes exécutées, chacune sous la forme d'un dictionnaire
+        ``{"step", "seconds", "detail"}``
+
+    Raises:
+        ImproperlyConfigured: Si la base n'est pas une base SQLite
+    """
+    connection = connections[using]
+    if connection.vendor != "sqlite":
+        raise ImproperlyConfigured(
+            f"La base {using} n'est pas une base SQLite."
+        )
+
+    steps = []
+
+    def timed(step, operation):
+        started = time.perf_counter()
+        detail = operation()
+        steps.append(
+            {
+                "step": step,
+                "seconds": round(time.perf_counter() - started, 4),
+                "detail": detail,
+            }
+        )
+
+    with connection.cursor() as cursor:
+
+        def analyze():
+            cursor.execute("ANALYZE")
+            return ""
+
+        def optimize():
+            cursor.execute("PRAGMA optimize")
+            return ""
+
+        def reclaim():
+            free_pages = _pragma(cursor, "freelist_count")
+            if vacuum:
+                cursor.execute("PRAGMA auto_vacuum = incremental")
+                cursor.execute("VACUUM")
+                return f"VACUUM complet, {free_pages} pages libérées"
+            mode = AUTO_VACUUM_MODES.get(_pragma(cursor, "auto_vacuum"))
+            if mode != "incremental":
+                return (
+                    f"ignoré: auto_vacuum={mode} (dbmaintain --vacuum pour "
+                    "passer en mode incremental)"
+                )
+            # execute() n'avance le pragma que d'une étape, soit une page;
+            # executescript() l'exécute jusqu'au bout
+            cursor.executescript(
+                f"PRAGMA incremental_vacuum({int(vacuum_pages)})"
+            )
+            freed = free_pages - _pragma(cursor, "freelist_count")
+            return f"{freed} pages libérées sur {free_pages}"
+
+        def checkpoint():
+            if _pragma(cursor, "journal_mode") != "wal":
+                return "ignoré: la base n'est pas en mode WAL"
+            cursor.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            busy, log, checkpointed = cursor.fetchone()
+            if busy:
+                return (
+                    f"incomplet, base occupée: {checkpointed} pages "
+                    f"recopiées sur {log}"
+                )
+            return f"{checkpointed} pages recopiées dans la base"
+
+        timed("analyze", analyze)
+        timed("optimize", optimize)
+        timed("vacuum", reclaim)
+        timed("wal_checkpoint", checkpoint)
+
+    return steps
@@ -0,0 +1,87 @@
+"""Outils communs aux tests de l'API des projets."""
+
+import logging
+
+from django.core.cache import cache
+from rest_framework.test import APIClient, APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
+
+from projects.models import Contributor, Issue, Project
+from users.authentication import local_users
+from users.models import User
+
+
+class QuietLogsMixin:
+    """Coupe les journaux de chaque requête pendant les tests."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Désactive les journaux jusqu'à la fin de la classe de tests."""
+        super().setUpClass()
+        logging.disable(logging.INFO)
+        cls.addClassCleanup(logging.disable, logging.NOTSET)
+
+
+class ProjectAPITestCase(QuietLogsMixin, APITestCase):
+    """Base des tests de l'API: caches vidés et projet de départ.
+
+    Chaque test dispose d'un auteur de projet (``self.owner``), de son
+    projet (``self.project``) et d'un client authentifié en son nom
+    (``self.client``).
+    """
+
+    def setUp(self):
+        """Vide les caches et crée l'auteur et son projet."""
+        cache.clear()
+        local_users.clear()
+        self.owner = self.create_user("owner")
+        self.project = self.create_project(self.owner)
+        self.client = self.client_for(self.owner)
+
+    def create_user(self, username):
+        """Crée un utilisateur sans mot de passe (authentifié par jeton)."""
+        return User.objects.create_user(username=username, age=30)
+
+    def create_project(self, author, title="Projet"):
+        """Crée un projet dont ``author`` est l'auteur et le contributeur."""
+        project = Project.objects.create(
+            title=title,
+            description="Projet de test.",
+            type="BACKEND",
+            author=author,
+        )
+        Contributor.objects.create(user=author, project=project, role="AUTHOR")
+        return project
+
+    def add_contributor(self, user, project=None):
+        """Ajoute ``user`` aux contributeurs du projet."""
+        return Contributor.objects.create(
+            user=user, project=project or self.project
+        )
+
+    def create_issue(self, author=None, project=None, **fields):
+        """Crée un problème, par défaut dans le projet de départ."""
+        values = {
+            "title": "Problème",
+            "description": "Problème de test.",
+            "tag": "BUG",
+            "priority": "LOW",
+        }
+        values.update(fields)
+        return Issue.objects.create(
+            project=project or self.project,
+            author=author or self.owner,
+            **values,
+        )
+
+    def client_for(self, user):
+        """Client de test authentifié par un jeton d'accès de ``user``."""
+        client = APIClient()
+        client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user)}"
+        )
+        return client
+
+    def issues_url(self, project=None):
+        """Chemin de la liste des problèmes d'un projet."""
+        return f"/api/projects/{(project or self.project).pk}/issues/"
@@ -0,0 +1,130 @@
+"""Vues asynchrones en lecture seule (``projects.async_views``)."""
+
+from asgiref.sync import sync_to_async
+from django.utils import timezone
+from rest_framework_simplejwt.tokens import AccessToken
+
+from projects.models import Comment, Issue
+
+from .base import ProjectAPITestCase
+
+
+class AsyncViewTests(ProjectAPITestCase):
+    """Mêmes réponses que les ViewSets, servies par des coroutines."""
+
+    def setUp(self):
+        """Crée cinq problèmes, dont le premier est commenté."""
+        super().setUp()
+        self.issues = [
+            self.create_issue(title=f"P{index}") for index in range(5)
+        ]
+        self.comment = Comment.objects.create(
+            description="Commentaire",
+            issue=self.issues[0],
+            author=self.owner,
+        )
+        self.outsider = self.create_user("outsider")
+        self.prefix = f"/api/async/projects/{self.project.pk}"
+        self.urls = [
+            "/api/async/projects/",
+            f"{self.prefix}/",
+            f"{self.prefix}/issues/",
+            f"{self.prefix}/issues/{self.issues[0].pk}/",
+            f"{self.prefix}/issues/{self.issues[0].pk}/comments/",
+        ]
+
+    def aget(self, url, user=None, token=None):
+        """Lit ``url`` par le client asynchrone, au nom de ``user``.
+
+        Le jeton est passé à chaque requête: ``AsyncClient`` ne transmet
+        pas les en-têtes donnés à sa création.
+        """
+        if user is not None:
+            token = AccessToken.for_user(user)
+        headers = {"Authorization": f"Bearer {token}"} if token else {}
+        return self.async_client.get(url, headers=headers)
+
+    async def test_member(self):
+        """Un membre lit chaque route, comme par les routes synchrones."""
+        sync_client = self.client_for(self.owner)
+        for url in self.urls:
+            with self.subTest(url=url):
+                response = await self.aget(url, self.owner)
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response["Content-Type"], "application/json")
+                sync_url = url.replace("/api/async/", "/api/", 1)
+                expected = await sync_to_async(sync_client.get)(sync_url)
+                self.assertEqual(response.json(), expected.json())
+
+    async def test_non_member(self):
+        """Un non-membre est refusé, et ne voit pas le projet."""
+        response = await self.aget("/api/async/projects/", self.outsider)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["results"], [])
+        response = await self.aget(f"{self.prefix}/", self.outsider)
+        self.assertEqual(response.status_code, 404)
+        for url in self.urls[2:]:
+            with self.subTest(url=url):
+                response = await self.aget(url, self.outsider)
+                self.assertEqual(response.status_code, 403)
+
+    async def test_anonymous(self):
+        """Une requête sans jeton, ou avec un jeton invalide, donne un 401."""
+        for token in (None, "invalide"):
+            for url in self.urls:
+                with self.subTest(url=url, token=token):
+                    response = await self.aget(url, token=token)
+                    self.assertEqual(response.status_code, 401)
+
+    async def test_read_only(self):
+        """Les routes asynchrones refusent les écritures."""
+        token = AccessToken.for_user(self.owner)
+        response = await self.async_client.post(
+            f"{self.prefix}/issues/",
+            {},
+            headers={"Authorization": f"Bearer {token}"},
+        )
+        self.assertEqual(response.status_code, 405)
+
+    async def test_page_pagination(self):
+        """La pagination par numéro de page compte les problèmes."""
+        response = await self.aget(
+            f"{self.prefix}/issues/?page_size=2", self.owner
+        )
+        data = response.json()
+        self.assertEqual(data["count"], 5)
+        self.assertEqual(len(data["results"]), 2)
+        response = await self.aget(data["next"], self.owner)
+        self.assertEqual(
+            [issue["title"] for issue in response.json()["results"]],
+            ["P2", "P3"],
+        )
+
+    async def test_cursor_pagination(self):
+        """Le parcours par curseur couvre chaque problème une fois."""
+        await Issue.objects.filter(
+            pk__in=[issue.pk for issue in self.issues[1:4]]
+        ).aupdate(created_time=timezone.now())
+        expected = [
+            pk
+            async for pk in Issue.objects.order_by(
+                "created_time", "id"
+            ).values_list("id", flat=True)
+        ]
+        url = f"{self.prefix}/issues/?pagination=cursor&page_size=2"
+        seen = []
+        while url:
+            response = await self.aget(url, self.owner)
+            self.assertEqual(response.status_code, 200)
+            data = response.json()
+            self.assertNotIn("count", data)
+            seen += [issue["id"] for issue in data["results"]]
+            url = data["next"]
+        self.assertEqual(seen, expected)
+
+    async def test_invalid_cursor(self):
+        """Un curseur mal formé donne un 404."""
+        response = await self.aget(
+            f"{self.prefix}/issues/?cursor=invalide", self.owner
+        )
+        self.assertEqual(response.status_code, 404)
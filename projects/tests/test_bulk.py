@@ -0,0 +1,182 @@
+"""Écritures en masse sur les problèmes (``projects.bulk``)."""
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+
+from projects.counters import recompute_counters
+from projects.models import Issue, Project
+
+from .base import ProjectAPITestCase
+
+
+def issue_data(count, **fields):
+    """Corps de création de ``count`` problèmes."""
+    return [
+        {
+            "title": f"Problème {index}",
+            "description": "Créé en masse.",
+            "tag": "BUG",
+            "priority": "LOW",
+            **fields,
+        }
+        for index in range(count)
+    ]
+
+
+class BulkCreateTests(ProjectAPITestCase):
+    """Création de plusieurs problèmes par un POST de liste."""
+
+    def post(self, data):
+        """Envoie une liste de problèmes à créer."""
+        return self.client.post(self.issues_url(), data, format="json")
+
+    def assertCountersConsistent(self):
+        """Vérifie que les compteurs dénormalisés n'ont pas dérivé."""
+        self.assertEqual(
+            recompute_counters(dry_run=True), {"projects": 0, "issues": 0}
+        )
+
+    def test_all_created(self):
+        """Tous les éléments valides sont créés, compteurs à jour."""
+        version = self.project.version
+        response = self.post(issue_data(3))
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data["created"], 3)
+        self.assertEqual(response.data["failed"], 0)
+        self.project.refresh_from_db()
+        self.assertEqual(self.project.issues_count, 3)
+        self.assertEqual(self.project.issues_todo_count, 3)
+        self.assertGreater(self.project.version, version)
+        self.assertCountersConsistent()
+
+    def test_partial_failure(self):
+        """Les éléments invalides sont signalés à leur position."""
+        data = issue_data(3)
+        data[1]["priority"] = "URGENT"
+        response = self.post(data)
+        self.assertEqual(response.status_code, 207)
+        self.assertEqual(response.data["created"], 2)
+        self.assertEqual(response.data["failed"], 1)
+        results = response.data["results"]
+        self.assertEqual([result["index"] for result in results], [0, 1, 2])
+        self.assertEqual(results[1]["status"], 400)
+        self.assertIn("priority", results[1]["errors"])
+        self.assertEqual(Issue.objects.filter(pk=results[2]["id"]).count(), 1)
+        self.assertCountersConsistent()
+
+    def test_nothing_valid(self):
+        """Sans élément valide, rien n'est créé."""
+        response = self.post(issue_data(2, priority="URGENT"))
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Issue.objects.exists())
+
+    @override_settings(ISSUE_BULK_CREATE_MAX_ITEMS=2)
+    def test_too_many_items(self):
+        """Une liste plus longue que le maximum est refusée."""
+        response = self.post(issue_data(3))
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Issue.objects.exists())
+
+    def test_query_count_does_not_grow(self):
+        """Le nombre de requêtes ne dépend pas du nombre d'éléments.
+
+        Au-delà d'une centaine de problèmes, SQLite impose de découper
+        l'``INSERT`` (limite du nombre de paramètres d'une requête).
+        """
+        counts = []
+        for size in (1, 50):
+            cache.clear()
+            with CaptureQueriesContext(connection) as queries:
+                self.assertEqual(self.post(issue_data(size)).status_code, 201)
+            counts.append(len(queries))
+        self.assertEqual(counts[0], counts[1])
+        self.assertCountersConsistent()
+
+
+class BatchUpdateTests(ProjectAPITestCase):
+    """Modification groupée des problèmes (``PATCH .../issues/batch/``)."""
+
+    def setUp(self):
+        """Crée trois problèmes de l'auteur et un d'un autre contributeur."""
+        super().setUp()
+        self.other = self.create_user("other")
+        self.add_contributor(self.other)
+        self.own = [self.create_issue().pk for _ in range(3)]
+        self.foreign = self.create_issue(author=self.other).pk
+
+    def patch(self, data):
+        """Envoie une modification groupée."""
+        return self.client.patch(
+            f"{self.issues_url()}batch/", data, format="json"
+        )
+
+    def test_status_change_updates_counters(self):
+        """Les compteurs par statut suivent les problèmes modifiés."""
+        version = Project.objects.get(pk=self.project.pk).version
+        response = self.patch({"ids": self.own[:2], "status": "FINISHED"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["updated"], self.own[:2])
+        self.assertEqual(response.data["rejected"], [])
+        self.project.refresh_from_db()
+        self.assertEqual(self.project.issues_todo_count, 2)
+        self.assertEqual(self.project.issues_finished_count, 2)
+        self.assertGreater(self.project.version, version)
+        self.assertEqual(
+            recompute_counters(dry_run=True), {"projects": 0, "issues": 0}
+        )
+
+    def test_rejected_issues(self):
+        """Les problèmes d'un autre auteur ou inconnus sont refusés."""
+        response = self.patch(
+            {"ids": [self.own[0], self.foreign, 999999], "priority": "HIGH"}
+        )
+        self.assertEqual(response.data["updated"], [self.own[0]])
+        self.assertEqual(
+            response.data["rejected"],
+            [
+                {"id": self.foreign, "reason": "not_author"},
+                {"id": 999999, "reason": "not_found"},
+            ],
+        )
+        self.assertEqual(Issue.objects.get(pk=self.foreign).priority, "LOW")
+
+    def test_duplicate_ids(self):
+        """Un identifiant répété n'est modifié et compté qu'une fois."""
+        response = self.patch(
+            {"ids": [self.own[0], self.own[0]], "status": "IN_PROGRESS"}
+        )
+        self.assertEqual(response.data["updated"], [self.own[0]])
+        self.project.refresh_from_db()
+        self.assertEqual(self.project.issues_in_progress_count, 1)
+
+    def test_no_change(self):
+        """Une modification sans champ à modifier est refusée."""
+        response = self.patch({"ids": self.own})
+        self.assertEqual(response.status_code, 400)
+
+    def test_query_count_does_not_grow(self):
+        """Le nombre de requêtes ne dépend pas du nombre de problèmes."""
+        ids = [
+            issue.pk
+            for issue in Issue.objects.bulk_create(
+                Issue(
+                    title=f"Problème {index}",
+                    description="Créé en masse.",
+                    tag="BUG",
+                    priority="LOW",
+                    project=self.project,
+                    author=self.owner,
+                )
+                for index in range(50)
+            )
+        ]
+        counts = []
+        for batch in (ids[:1], ids):
+            cache.clear()
+            with CaptureQueriesContext(connection) as queries:
+                response = self.patch({"ids": batch, "priority": "HIGH"})
+            self.assertEqual(response.data["updated"], batch)
+            counts.append(len(queries))
+        self.assertEqual(counts[0], counts[1])
@@ -0,0 +1,48 @@
+"""Cache des réponses de l'API (``projects.caching``)."""
+
+from django.core.cache import cache
+
+from projects.models import Issue
+
+from .base import ProjectAPITestCase
+
+
+class ResponseCacheTests(ProjectAPITestCase):
+    """Réponses mises en cache par ETag, donc par utilisateur et version."""
+
+    def setUp(self):
+        """Ajoute un problème au projet de départ."""
+        super().setUp()
+        self.issue = self.create_issue(title="Avant")
+
+    def rename_behind_cache(self, title):
+        """Modifie le problème sans changer la version du projet."""
+        Issue.objects.filter(pk=self.issue.pk).update(title=title)
+
+    def test_response_is_cached_by_etag(self):
+        """La réponse est stockée sous son ETag et resservie telle quelle."""
+        response = self.client.get(self.issues_url())
+        key = "api:response:" + response["ETag"].strip('"')
+        self.assertEqual(cache.get(key), response.data)
+
+        self.rename_behind_cache("Après")
+        response = self.client.get(self.issues_url())
+        self.assertEqual(response.data["results"][0]["title"], "Avant")
+
+    def test_write_bypasses_cache(self):
+        """Après une écriture dans le projet, la réponse est recalculée."""
+        self.client.get(self.issues_url())
+        self.rename_behind_cache("Après")
+        self.create_issue(title="Nouveau")
+        response = self.client.get(self.issues_url())
+        titles = {issue["title"] for issue in response.data["results"]}
+        self.assertEqual(titles, {"Après", "Nouveau"})
+
+    def test_cache_is_per_user(self):
+        """La réponse d'un utilisateur n'est pas servie à un autre."""
+        other = self.create_user("other")
+        self.add_contributor(other)
+        self.client.get(self.issues_url())
+        self.rename_behind_cache("Après")
+        response = self.client_for(other).get(self.issues_url())
+        self.assertEqual(response.data["results"][0]["title"], "Après")
@@ -0,0 +1,119 @@
+"""Compression négociée des réponses (``projects.compression``)."""
+
+import gzip
+import json
+from unittest import mock
+
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from projects import compression
+from projects.compression import CompressionMiddleware, negotiate
+
+from .base import ProjectAPITestCase
+
+
+class CompressionTests(ProjectAPITestCase):
+    """Réponses de l'API compressées selon Accept-Encoding."""
+
+    def setUp(self):
+        """Crée assez de problèmes pour dépasser la taille minimale."""
+        super().setUp()
+        for index in range(10):
+            self.create_issue(title=f"Problème {index}")
+
+    def get(self, **headers):
+        """Lit la liste des problèmes avec les en-têtes donnés."""
+        return self.client.get(self.issues_url(), **headers)
+
+    def test_gzip(self):
+        """Le corps gzip est celui de la réponse non compressée."""
+        plain = self.get()
+        response = self.get(HTTP_ACCEPT_ENCODING="gzip, deflate")
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertIn("Accept-Encoding", response["Vary"])
+        self.assertEqual(
+            json.loads(gzip.decompress(response.content)),
+            json.loads(plain.content),
+        )
+        self.assertEqual(response["ETag"], plain["ETag"][:-1] + '-gzip"')
+        self.assertEqual(
+            response["Content-Length"], str(len(response.content))
+        )
+
+    def test_not_accepted(self):
+        """Sans codage accepté, la réponse est envoyée telle quelle."""
+        for header in ("", "identity", "gzip;q=0", "compress"):
+            with self.subTest(header=header):
+                response = self.get(HTTP_ACCEPT_ENCODING=header)
+                self.assertFalse(response.has_header("Content-Encoding"))
+
+    @override_settings(COMPRESSION_MIN_SIZE=1 << 20)
+    def test_small_response(self):
+        """Une réponse plus petite que le minimum n'est pas compressée."""
+        response = self.get(HTTP_ACCEPT_ENCODING="gzip")
+        self.assertFalse(response.has_header("Content-Encoding"))
+
+    def test_suffixed_etag_returns_304(self):
+        """L'ETag d'une réponse gzip valide cette même représentation."""
+        etag = self.get(HTTP_ACCEPT_ENCODING="gzip")["ETag"]
+        response = self.get(
+            HTTP_ACCEPT_ENCODING="gzip", HTTP_IF_NONE_MATCH=etag
+        )
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+
+    def test_compressed_body_is_cached(self):
+        """Le corps compressé d'un même ETag n'est calculé qu'une fois."""
+        with mock.patch.object(
+            compression, "compress", wraps=compression.compress
+        ) as compress:
+            first = self.get(HTTP_ACCEPT_ENCODING="gzip")
+            second = self.get(HTTP_ACCEPT_ENCODING="gzip")
+        self.assertEqual(compress.call_count, 1)
+        self.assertEqual(first.content, second.content)
+
+
+class CompressionMiddlewareTests(SimpleTestCase):
+    """Comportement du middleware hors des vues de l'API."""
+
+    def setUp(self):
+        """Prépare une requête de l'API qui accepte gzip."""
+        self.request = RequestFactory().get(
+            "/api/projects/", HTTP_ACCEPT_ENCODING="gzip"
+        )
+
+    def process(self, response):
+        """Passe ``response`` dans le middleware."""
+        return CompressionMiddleware(lambda request: response)(self.request)
+
+    def test_streaming(self):
+        """Une réponse en flux est compressée bloc par bloc."""
+        chunks = [b'{"line": %d}\n' % index for index in range(100)]
+        response = self.process(StreamingHttpResponse(iter(chunks)))
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(
+            gzip.decompress(b"".join(response.streaming_content)),
+            b"".join(chunks),
+        )
+
+    def test_already_encoded(self):
+        """Une réponse déjà codée n'est pas modifiée."""
+        body = gzip.compress(b"x" * 4096)
+        response = HttpResponse(body)
+        response["Content-Encoding"] = "gzip"
+        self.assertEqual(self.process(response).content, body)
+
+    def test_other_paths(self):
+        """Seules les routes de l'API sont compressées."""
+        self.request.path = "/admin/"
+        response = self.process(HttpResponse(b"x" * 4096))
+        self.assertFalse(response.has_header("Content-Encoding"))
+
+    def test_negotiate(self):
+        """Le codage de plus haute qualité acceptée l'emporte."""
+        encodings = ["br", "gzip"]
+        self.assertEqual(negotiate("gzip, br", encodings), "br")
+        self.assertEqual(negotiate("gzip;q=1, br;q=0.5", encodings), "gzip")
+        self.assertEqual(negotiate("*", encodings), "br")
+        self.assertIsNone(negotiate("br;q=0, gzip;q=0", encodings))
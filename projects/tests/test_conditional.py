@@ -0,0 +1,138 @@
+"""Requêtes GET conditionnelles (``projects.conditional``)."""
+
+from datetime import timedelta
+
+from django.utils.http import http_date
+
+from projects.models import Contributor, Project
+
+from .base import ProjectAPITestCase
+
+
+class ConditionalGetTests(ProjectAPITestCase):
+    """ETag, Last-Modified et réponses 304."""
+
+    def setUp(self):
+        """Ajoute un problème au projet de départ."""
+        super().setUp()
+        self.issue = self.create_issue()
+
+    def settle(self):
+        """Recule la dernière modification du projet de deux secondes."""
+        project = Project.objects.get(pk=self.project.pk)
+        project.updated_time -= timedelta(seconds=2)
+        Project.objects.filter(pk=project.pk).update(
+            updated_time=project.updated_time
+        )
+        return project.updated_time
+
+    def test_list_sends_validators(self):
+        """Une liste imbriquée porte un ETag et un Last-Modified."""
+        self.settle()
+        response = self.client.get(self.issues_url())
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.has_header("ETag"))
+        self.assertTrue(response.has_header("Last-Modified"))
+        self.assertIn("private", response["Cache-Control"])
+
+    def test_matching_etag_returns_304(self):
+        """Un ETag à jour donne un 304 sans corps."""
+        etag = self.client.get(self.issues_url())["ETag"]
+        response = self.client.get(self.issues_url(), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b"")
+        self.assertEqual(response["ETag"], etag)
+
+    def test_if_modified_since_returns_304(self):
+        """Une date de modification à jour donne un 304."""
+        self.settle()
+        url = f"{self.issues_url()}{self.issue.pk}/"
+        last_modified = self.client.get(url)["Last-Modified"]
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, 304)
+
+    def test_no_last_modified_within_the_second(self):
+        """La date n'est pas donnée tant que sa seconde n'est pas écoulée."""
+        response = self.client.get(self.issues_url())
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.has_header("ETag"))
+        self.assertFalse(response.has_header("Last-Modified"))
+
+    def test_same_second_write_ignores_if_modified_since(self):
+        """Une écriture dans la seconde d'une lecture n'est pas masquée.
+
+        La date connue du client est celle, à la seconde près, de l'état
+        lu; l'écriture qui suit dans la même seconde ne la change pas.
+        """
+        read_time = Project.objects.get(pk=self.project.pk).updated_time
+        self.client.get(self.issues_url())
+        self.create_issue(title="Même seconde")
+        response = self.client.get(
+            self.issues_url(),
+            HTTP_IF_MODIFIED_SINCE=http_date(int(read_time.timestamp())),
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["count"], 2)
+
+    def test_write_after_settled_read_ignores_if_modified_since(self):
+        """Une écriture après une date envoyée la rend périmée."""
+        self.settle()
+        last_modified = self.client.get(self.issues_url())["Last-Modified"]
+        self.create_issue(title="Nouveau")
+        response = self.client.get(
+            self.issues_url(), HTTP_IF_MODIFIED_SINCE=last_modified
+        )
+        self.assertEqual(response.status_code, 200)
+
+    def test_write_changes_etag(self):
+        """Une écriture dans le projet rend l'ancien ETag périmé."""
+        etag = self.client.get(self.issues_url())["ETag"]
+        self.create_issue(title="Nouveau")
+        response = self.client.get(self.issues_url(), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(response.data["count"], 2)
+
+    def test_etag_depends_on_user(self):
+        """Deux utilisateurs ne partagent pas un ETag."""
+        other = self.create_user("other")
+        self.add_contributor(other)
+        etag = self.client.get(self.issues_url())["ETag"]
+        response = self.client_for(other).get(
+            self.issues_url(), HTTP_IF_NONE_MATCH=etag
+        )
+        self.assertEqual(response.status_code, 200)
+
+    def test_embedded_user_change_changes_etag(self):
+        """Renommer un utilisateur affiché par le projet change son ETag."""
+        url = f"/api/projects/{self.project.pk}/"
+        etag = self.client.get(url)["ETag"]
+        self.owner.username = "renamed"
+        self.owner.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("renamed", response.content.decode())
+
+
+class ProjectListConditionalTests(ProjectAPITestCase):
+    """La liste des projets n'a qu'un ETag."""
+
+    def test_no_last_modified(self):
+        """La liste des projets n'envoie pas de Last-Modified."""
+        response = self.client.get("/api/projects/")
+        self.assertTrue(response.has_header("ETag"))
+        self.assertFalse(response.has_header("Last-Modified"))
+
+    def test_leaving_a_project_changes_etag(self):
+        """Quitter le projet le plus récent ne valide pas l'ancienne liste."""
+        member = self.create_user("member")
+        self.add_contributor(member)
+        newest = self.create_project(self.owner, title="Récent")
+        Contributor.objects.create(user=member, project=newest)
+        client = self.client_for(member)
+        etag = client.get("/api/projects/")["ETag"]
+
+        Contributor.objects.filter(user=member, project=newest).delete()
+        response = client.get("/api/projects/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["count"], 1)
@@ -0,0 +1,86 @@
+"""Compteurs dénormalisés (``projects.counters``)."""
+
+from io import StringIO
+
+from django.core.management import call_command
+
+from projects.models import Comment, Issue, Project
+
+from .base import ProjectAPITestCase
+
+
+class CounterTests(ProjectAPITestCase):
+    """Compteurs tenus par les signaux, et recalcul d'une dérive."""
+
+    def setUp(self):
+        """Crée trois problèmes, dont un terminé et un commenté."""
+        super().setUp()
+        self.issue = self.create_issue()
+        self.create_issue(status="IN_PROGRESS")
+        self.create_issue(status="FINISHED")
+        for index in range(2):
+            Comment.objects.create(
+                description=f"C{index}", issue=self.issue, author=self.owner
+            )
+
+    def counters(self):
+        """Compteurs du projet et du problème commenté."""
+        project = Project.objects.get(pk=self.project.pk)
+        return (
+            project.issues_count,
+            project.issues_todo_count,
+            project.issues_in_progress_count,
+            project.issues_finished_count,
+            Issue.objects.get(pk=self.issue.pk).comments_count,
+        )
+
+    def run_command(self, *args):
+        """Exécute ``recompute_counters`` et retourne sa sortie."""
+        out = StringIO()
+        call_command("recompute_counters", *args, stdout=out)
+        return out.getvalue()
+
+    def test_signals_keep_counters(self):
+        """Les écritures tiennent les compteurs à jour."""
+        self.assertEqual(self.counters(), (3, 1, 1, 1, 2))
+        issue = Issue.objects.get(pk=self.issue.pk)
+        issue.status = "FINISHED"
+        issue.save()
+        Comment.objects.filter(issue=self.issue).first().delete()
+        self.assertEqual(self.counters(), (3, 0, 1, 2, 1))
+
+    def test_no_drift(self):
+        """Sans dérive, la commande ne corrige rien."""
+        output = self.run_command()
+        self.assertIn("Projets corrigés: 0, problèmes corrigés: 0", output)
+        self.assertIn("Aucune dérive détectée.", output)
+        self.assertEqual(self.counters(), (3, 1, 1, 1, 2))
+
+    def test_drift_is_repaired(self):
+        """Des compteurs faussés par ``update()`` sont recalculés."""
+        Project.objects.filter(pk=self.project.pk).update(
+            issues_count=40, issues_finished_count=0
+        )
+        Issue.objects.filter(pk=self.issue.pk).update(comments_count=7)
+        self.assertEqual(self.counters(), (40, 1, 1, 0, 7))
+
+        output = self.run_command()
+        self.assertIn("Projets corrigés: 1, problèmes corrigés: 1", output)
+        self.assertEqual(self.counters(), (3, 1, 1, 1, 2))
+        self.assertIn("problèmes corrigés: 0", self.run_command())
+
+    def test_dry_run(self):
+        """``--dry-run`` signale la dérive sans la corriger."""
+        Issue.objects.filter(pk=self.issue.pk).update(comments_count=9)
+        output = self.run_command("--dry-run")
+        self.assertIn("problèmes à corriger: 1", output)
+        self.assertEqual(self.counters()[-1], 9)
+
+    def test_empty_parents(self):
+        """Un projet sans problème et un problème sans commentaire valent 0."""
+        empty = self.create_project(self.owner, title="Vide")
+        Project.objects.filter(pk=empty.pk).update(issues_todo_count=5)
+        self.run_command()
+        empty.refresh_from_db()
+        self.assertEqual(empty.issues_todo_count, 0)
+        self.assertEqual(empty.issues_count, 0)
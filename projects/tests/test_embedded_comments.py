@@ -0,0 +1,109 @@
+"""Commentaires intégrés au détail d'un problème (``comments_more``)."""
+
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+
+from projects.models import Comment
+
+from .base import ProjectAPITestCase
+
+
+class EmbeddedCommentsTests(ProjectAPITestCase):
+    """Derniers commentaires intégrés, et lien ``comments_more``."""
+
+    def setUp(self):
+        """Crée un problème et ses douze commentaires, C0 à C11."""
+        super().setUp()
+        self.issue = self.create_issue()
+        self.url = f"{self.issues_url()}{self.issue.pk}/"
+        self.add_comments(12)
+
+    def add_comments(self, count):
+        """Ajoute ``count`` commentaires au problème."""
+        start = Comment.objects.filter(issue=self.issue).count()
+        for index in range(start, start + count):
+            Comment.objects.create(
+                description=f"C{index}", issue=self.issue, author=self.owner
+            )
+
+    def detail(self, query=""):
+        """Détail du problème: commentaires intégrés et lien de suite."""
+        response = self.client.get(f"{self.url}{query}")
+        self.assertEqual(response.status_code, 200)
+        descriptions = [
+            comment["description"] for comment in response.data["comments"]
+        ]
+        return descriptions, response.data["comments_more"]
+
+    def walk(self, url, link):
+        """Commentaires lus en suivant les liens ``link`` depuis ``url``.
+
+        Returns:
+            Descriptions des commentaires, du plus ancien au plus récent
+        """
+        descriptions = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            page = [
+                comment["description"] for comment in response.data["results"]
+            ]
+            if link == "previous":
+                descriptions = page + descriptions
+            else:
+                descriptions += page
+            url = response.data[link]
+        return descriptions
+
+    def test_default_limit(self):
+        """Les dix derniers commentaires sont intégrés, du plus ancien."""
+        comments, more = self.detail()
+        self.assertEqual(comments, [f"C{index}" for index in range(2, 12)])
+        self.assertIsNotNone(more)
+
+    def test_comments_more_continues(self):
+        """``comments_more`` reprend juste avant le plus ancien intégré."""
+        comments, more = self.detail("?comments=3")
+        self.assertEqual(comments, ["C9", "C10", "C11"])
+        self.assertEqual(
+            self.walk(f"{more}&page_size=4", "previous"),
+            [f"C{index}" for index in range(9)],
+        )
+
+    def test_no_more_comments(self):
+        """Sans autre commentaire, ``comments_more`` est nul."""
+        comments, more = self.detail("?comments=12")
+        self.assertEqual(len(comments), 12)
+        self.assertIsNone(more)
+
+    def test_disabled(self):
+        """``comments=0`` n'intègre rien et renvoie à la liste entière."""
+        comments, more = self.detail("?comments=0")
+        self.assertEqual(comments, [])
+        self.assertIn("pagination=cursor", more)
+        self.assertEqual(
+            self.walk(f"{more}&page_size=5", "next"),
+            [f"C{index}" for index in range(12)],
+        )
+
+    @override_settings(ISSUE_EMBEDDED_COMMENTS_MAX_LIMIT=5)
+    def test_limit_is_capped(self):
+        """La limite demandée est bornée, et une limite invalide ignorée."""
+        comments, _ = self.detail("?comments=50")
+        self.assertEqual(len(comments), 5)
+        comments, _ = self.detail("?comments=beaucoup")
+        self.assertEqual(len(comments), 10)
+
+    def test_bounded_queries(self):
+        """Le nombre de requêtes ne dépend pas du nombre de commentaires."""
+        self.client.get(self.url)
+
+        def count():
+            with CaptureQueriesContext(connection) as queries:
+                self.client.get(f"{self.url}?fields=id,comments")
+            return len(queries)
+
+        before = count()
+        self.add_comments(40)
+        self.assertEqual(count(), before)
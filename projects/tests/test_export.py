@@ -0,0 +1,81 @@
+"""Export NDJSON d'un projet (``projects.export``)."""
+
+import gzip
+import json
+from datetime import timedelta
+
+from django.utils import timezone
+
+from projects.models import Comment, Issue
+
+from .base import ProjectAPITestCase
+
+
+class ExportTests(ProjectAPITestCase):
+    """Flux NDJSON du projet, de ses problèmes et de ses commentaires."""
+
+    def setUp(self):
+        """Crée deux problèmes, le premier avec deux commentaires."""
+        super().setUp()
+        self.first = self.create_issue(title="Premier")
+        self.second = self.create_issue(title="Second")
+        for index in range(2):
+            Comment.objects.create(
+                description=f"Commentaire {index}",
+                issue=self.first,
+                author=self.owner,
+            )
+        self.url = f"/api/projects/{self.project.pk}/export/"
+
+    def read(self, response):
+        """Lit les lignes JSON d'une réponse d'export."""
+        content = b"".join(response.streaming_content)
+        if response.get("Content-Encoding") == "gzip":
+            content = gzip.decompress(content)
+        return [json.loads(line) for line in content.splitlines()]
+
+    def test_export(self):
+        """Le projet, puis chaque problème suivi de ses commentaires."""
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        rows = self.read(response)
+        self.assertEqual(
+            [row["type"] for row in rows],
+            ["project", "issue", "comment", "comment", "issue"],
+        )
+        self.assertEqual(rows[0]["id"], self.project.pk)
+        self.assertEqual(rows[1]["author"], "owner")
+        self.assertEqual(rows[2]["issue"], self.first.pk)
+
+    def test_gzip(self):
+        """L'export est compressé une seule fois si le client l'accepte."""
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING="gzip")
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertIn("Accept-Encoding", response["Vary"])
+        self.assertEqual(len(self.read(response)), 5)
+
+    def test_gzip_refused(self):
+        """Un codage refusé par sa qualité n'est pas utilisé."""
+        for header in ("gzip;q=0", "identity", "gzip;q=0, br;q=0"):
+            with self.subTest(header=header):
+                response = self.client.get(
+                    self.url, HTTP_ACCEPT_ENCODING=header
+                )
+                self.assertFalse(response.has_header("Content-Encoding"))
+                self.assertEqual(len(self.read(response)), 5)
+
+    def test_since(self):
+        """``since`` limite l'export aux données modifiées depuis."""
+        past = timezone.now() - timedelta(days=30)
+        Issue.objects.filter(pk=self.first.pk).update(updated_time=past)
+        Comment.objects.update(updated_time=past)
+        since = (timezone.now() - timedelta(days=1)).date().isoformat()
+        rows = self.read(self.client.get(f"{self.url}?since={since}"))
+        self.assertEqual([row["type"] for row in rows], ["project", "issue"])
+        self.assertEqual(rows[1]["id"], self.second.pk)
+
+    def test_invalid_since(self):
+        """Une date invalide est refusée."""
+        response = self.client.get(f"{self.url}?since=hier")
+        self.assertEqual(response.status_code, 400)
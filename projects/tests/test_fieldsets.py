@@ -0,0 +1,137 @@
+"""Réponses partielles: ``?fields=`` et ``?omit=`` (``projects.fieldsets``)."""
+
+import re
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from projects.fieldsets import parse_paths, select_names
+
+from .base import ProjectAPITestCase
+
+COLUMN_PATTERN = re.compile(r'"(\w+)"\."(\w+)"')
+
+
+class SparseFieldsetTests(ProjectAPITestCase):
+    """Champs retirés de la représentation et colonnes différées."""
+
+    def setUp(self):
+        """Ajoute un problème et met l'utilisateur authentifié en cache.
+
+        Les requêtes relevées ne lisent ainsi que ce que la réponse montre.
+        """
+        super().setUp()
+        self.issue = self.create_issue()
+        self.project_url = f"/api/projects/{self.project.pk}/"
+        self.client.get("/api/auth/account/")
+
+    def get(self, url):
+        """Lit ``url`` et relève ses requêtes SQL.
+
+        Returns:
+            Tuple (données de la réponse, liste des requêtes SQL)
+        """
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return response.json(), [query["sql"] for query in queries]
+
+    def selected(self, queries, table):
+        """Colonnes de ``table`` lues par les SELECT de ``queries``."""
+        columns = set()
+        for sql in queries:
+            select = sql.split(" FROM ", 1)[0]
+            if not select.startswith("SELECT "):
+                continue
+            columns.update(
+                column
+                for name, column in COLUMN_PATTERN.findall(select)
+                if name == table
+            )
+        return columns
+
+    def test_fields_prune_list(self):
+        """``fields`` ne garde que les champs listés."""
+        data, queries = self.get(f"{self.issues_url()}?fields=id,title")
+        self.assertEqual(
+            data["results"], [{"id": self.issue.pk, "title": "Problème"}]
+        )
+        self.assertEqual(
+            self.selected(queries, "projects_issue"),
+            {"id", "title", "project_id", "created_time"},
+        )
+
+    def test_omit_prunes_list(self):
+        """``omit`` retire les champs listés, et leurs colonnes."""
+        data, queries = self.get(f"{self.issues_url()}?omit=description")
+        issue = data["results"][0]
+        self.assertNotIn("description", issue)
+        self.assertIn("title", issue)
+        columns = self.selected(queries, "projects_issue")
+        self.assertNotIn("description", columns)
+        self.assertIn("title", columns)
+
+    def test_full_list_loads_every_column(self):
+        """Sans paramètre, la représentation et le queryset sont complets."""
+        data, queries = self.get(self.issues_url())
+        self.assertIn("description", data["results"][0])
+        self.assertIn("description", self.selected(queries, "projects_issue"))
+
+    def test_nested_path(self):
+        """Un chemin pointé restreint un objet imbriqué et sa jointure."""
+        data, queries = self.get(
+            f"{self.issues_url()}{self.issue.pk}/?fields=id,author.username"
+        )
+        self.assertEqual(
+            data, {"id": self.issue.pk, "author": {"username": "owner"}}
+        )
+        self.assertEqual(
+            self.selected(queries, "users_user"), {"id", "username"}
+        )
+        self.assertNotIn(
+            "description", self.selected(queries, "projects_issue")
+        )
+
+    def test_omit_relation_skips_its_query(self):
+        """Une relation écartée n'est ni affichée ni chargée."""
+        data, queries = self.get(f"{self.project_url}?omit=contributors")
+        self.assertNotIn("contributors", data)
+        self.assertIn("author", data)
+        self.assertFalse(self.selected(queries, "projects_contributor"))
+
+    def test_nested_list(self):
+        """Un chemin pointé s'applique à chaque élément d'une liste."""
+        data, _ = self.get(
+            f"{self.project_url}?fields=id,contributors.user.username"
+        )
+        self.assertEqual(
+            data,
+            {
+                "id": self.project.pk,
+                "contributors": [{"user": {"username": "owner"}}],
+            },
+        )
+
+    def test_unknown_fields_are_ignored(self):
+        """Un champ inconnu n'est pas une erreur."""
+        data, _ = self.get(f"{self.issues_url()}?fields=id,inconnu")
+        self.assertEqual(data["results"], [{"id": self.issue.pk}])
+
+    def test_writes_keep_every_field(self):
+        """Une écriture répond avec tous ses champs."""
+        response = self.client.patch(
+            f"{self.issues_url()}{self.issue.pk}/?fields=id",
+            {"title": "Renommé"},
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("description", response.data)
+
+    def test_select_names(self):
+        """Noms gardés à chaque niveau de la représentation."""
+        only = parse_paths(["id, author.username", "contributors"])
+        self.assertEqual(
+            select_names(only, ()), {"id", "author", "contributors"}
+        )
+        self.assertEqual(select_names(only, ("author",)), {"username"})
+        self.assertIsNone(select_names(only, ("contributors",)))
+        self.assertIsNone(select_names(set(), ()))
@@ -0,0 +1,67 @@
+"""Filtres et tri de la liste des problèmes (``projects.filters``)."""
+
+from .base import ProjectAPITestCase
+
+
+class IssueOrderingTests(ProjectAPITestCase):
+    """Tri des problèmes, selon l'ordre des choix pour les champs à choix."""
+
+    def setUp(self):
+        """Crée un problème par priorité et par statut, dans le désordre."""
+        super().setUp()
+        for priority, status in (
+            ("MEDIUM", "FINISHED"),
+            ("HIGH", "TODO"),
+            ("LOW", "IN_PROGRESS"),
+        ):
+            self.create_issue(priority=priority, status=status)
+
+    def values(self, ordering, field):
+        """Valeurs de ``field`` dans l'ordre de la liste triée."""
+        response = self.client.get(f"{self.issues_url()}?ordering={ordering}")
+        self.assertEqual(response.status_code, 200)
+        return [issue[field] for issue in response.data["results"]]
+
+    def test_priority(self):
+        """Les priorités sont triées de LOW à HIGH, et inversement."""
+        self.assertEqual(
+            self.values("priority", "priority"), ["LOW", "MEDIUM", "HIGH"]
+        )
+        self.assertEqual(
+            self.values("-priority", "priority"), ["HIGH", "MEDIUM", "LOW"]
+        )
+
+    def test_status(self):
+        """Les statuts sont triés de TODO à FINISHED, et inversement."""
+        self.assertEqual(
+            self.values("status", "status"),
+            ["TODO", "IN_PROGRESS", "FINISHED"],
+        )
+        self.assertEqual(
+            self.values("-status", "status"),
+            ["FINISHED", "IN_PROGRESS", "TODO"],
+        )
+
+    def test_rank_follows_updates(self):
+        """Le rang stocké suit la modification d'un problème."""
+        response = self.client.get(f"{self.issues_url()}?priority=HIGH")
+        issue_id = response.data["results"][0]["id"]
+        response = self.client.patch(
+            f"{self.issues_url()}{issue_id}/", {"priority": "LOW"}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            self.values("-priority", "priority"), ["MEDIUM", "LOW", "LOW"]
+        )
+
+    def test_filters(self):
+        """Les filtres acceptent plusieurs valeurs et refusent l'inconnu."""
+        response = self.client.get(
+            f"{self.issues_url()}?status=TODO,IN_PROGRESS&ordering=priority"
+        )
+        self.assertEqual(
+            [issue["priority"] for issue in response.data["results"]],
+            ["LOW", "HIGH"],
+        )
+        response = self.client.get(f"{self.issues_url()}?status=INCONNU")
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,103 @@
+"""Import d'issues et de commentaires (``projects.importer``)."""
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+
+from projects.models import Comment, Issue
+
+from .base import ProjectAPITestCase
+
+CSV_HEADER = "title,description,tag,priority,author,assignee\n"
+
+
+class ImportTests(ProjectAPITestCase):
+    """Import d'un fichier CSV ou NDJSON dans un projet via l'API."""
+
+    def setUp(self):
+        """Ajoute un contributeur et un utilisateur extérieur au projet."""
+        super().setUp()
+        self.member = self.create_user("member")
+        self.add_contributor(self.member)
+        self.outsider = self.create_user("outsider")
+
+    def upload(self, content, name="issues.csv", project=None):
+        """Envoie un fichier à importer."""
+        if isinstance(content, str):
+            content = content.encode()
+        return self.client.post(
+            f"/api/projects/{(project or self.project).pk}/import/",
+            {"file": SimpleUploadedFile(name, content)},
+            format="multipart",
+        )
+
+    def test_csv_import(self):
+        """Les lignes valides sont importées, l'envoyeur en est l'auteur."""
+        response = self.upload(
+            CSV_HEADER
+            + "Un,Premier,BUG,LOW,member,member\n"
+            + "Deux,Second,TASK,HIGH,,\n"
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data["issues"], 2)
+        issue = Issue.objects.get(title="Un")
+        self.assertEqual(issue.author, self.owner)
+        self.assertEqual(issue.assignee, self.member)
+        self.project.refresh_from_db()
+        self.assertEqual(self.project.issues_count, 2)
+
+    def test_assignee_must_contribute(self):
+        """Une ligne qui assigne un non-contributeur est refusée."""
+        response = self.upload(
+            CSV_HEADER
+            + "Un,Premier,BUG,LOW,,outsider\n"
+            + "Deux,Second,BUG,LOW,,member\n"
+        )
+        self.assertEqual(response.status_code, 207)
+        self.assertEqual(response.data["issues"], 1)
+        self.assertEqual(response.data["errors"][0]["line"], 2)
+        self.assertIn("assignee", response.data["errors"][0]["errors"])
+        self.assertFalse(Issue.objects.filter(assignee=self.outsider))
+
+    def test_invalid_rows(self):
+        """Sans ligne valide, le statut est 400."""
+        response = self.upload(CSV_HEADER + "Un,Premier,BUG,URGENT,,\n")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data["error_count"], 1)
+        self.assertIn("priority", response.data["errors"][0]["errors"])
+
+    def test_not_utf8(self):
+        """Un fichier qui n'est pas en UTF-8 est refusé sur ``file``."""
+        response = self.upload(
+            (CSV_HEADER + "Café,Décrit,BUG,LOW,,\n").encode("latin-1")
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("file", response.data)
+        self.assertFalse(Issue.objects.exists())
+
+    def test_missing_file(self):
+        """Une requête sans fichier est refusée."""
+        response = self.client.post(
+            f"/api/projects/{self.project.pk}/import/", {}, format="multipart"
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("file", response.data)
+
+    def test_export_round_trip(self):
+        """L'export d'un projet se réimporte dans un autre."""
+        issue = self.create_issue(title="Exporté", assignee=self.member)
+        Comment.objects.create(
+            description="Commentaire exporté", issue=issue, author=self.owner
+        )
+        export = self.client.get(f"/api/projects/{self.project.pk}/export/")
+        content = b"".join(export.streaming_content)
+
+        target = self.create_project(self.owner, title="Copie")
+        self.add_contributor(self.member, project=target)
+        response = self.upload(content, name="projet.ndjson", project=target)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data["issues"], 1)
+        self.assertEqual(response.data["comments"], 1)
+        copy = Issue.objects.get(project=target)
+        self.assertEqual(copy.assignee, self.member)
+        self.assertEqual(
+            copy.comments.get().description, "Commentaire exporté"
+        )
@@ -0,0 +1,70 @@
+"""Appartenance aux projets mémorisée en cache (``projects.membership``)."""
+
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from projects.membership import membership_cache_key
+from projects.models import Contributor
+
+from .base import ProjectAPITestCase
+
+
+class MembershipCacheTests(ProjectAPITestCase):
+    """Rôles mémorisés, et invalidés avec les contributeurs."""
+
+    def setUp(self):
+        """Crée un utilisateur, sans l'ajouter au projet."""
+        super().setUp()
+        self.member = self.create_user("member")
+        self.member_client = self.client_for(self.member)
+
+    def membership_queries(self):
+        """Appelle la liste des problèmes et compte les lectures du rôle."""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.member_client.get(self.issues_url())
+        reads = [
+            query
+            for query in queries
+            if 'SELECT "projects_contributor"."role"' in query["sql"]
+        ]
+        return response, len(reads)
+
+    def test_role_is_cached(self):
+        """Le rôle n'est lu en base qu'à la première requête."""
+        self.add_contributor(self.member)
+        response, reads = self.membership_queries()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(reads, 1)
+        key = membership_cache_key(self.project.pk, self.member.pk)
+        self.assertEqual(cache.get(key), "CONTRIBUTOR")
+
+        response, reads = self.membership_queries()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(reads, 0)
+
+    def test_refusal_is_cached(self):
+        """Un refus est aussi mémorisé."""
+        response, reads = self.membership_queries()
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(reads, 1)
+        response, reads = self.membership_queries()
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(reads, 0)
+
+    def test_new_contributor_gets_access(self):
+        """Un refus mémorisé est oublié quand l'utilisateur est ajouté."""
+        response, _ = self.membership_queries()
+        self.assertEqual(response.status_code, 403)
+        self.add_contributor(self.member)
+        response, _ = self.membership_queries()
+        self.assertEqual(response.status_code, 200)
+
+    def test_removed_contributor_loses_access(self):
+        """Un rôle mémorisé est oublié quand le contributeur est retiré."""
+        self.add_contributor(self.member)
+        response, _ = self.membership_queries()
+        self.assertEqual(response.status_code, 200)
+        Contributor.objects.filter(user=self.member).delete()
+        response, _ = self.membership_queries()
+        self.assertEqual(response.status_code, 403)
@@ -0,0 +1,211 @@
+"""Métriques Prometheus (``projects.metrics``)."""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from unittest import mock, skipIf
+
+from django.test import Client, SimpleTestCase, override_settings
+
+from projects import metrics
+from projects.metrics import (
+    DEAD_FILE_NAME,
+    MetricsRegistry,
+    collect,
+    render,
+)
+
+from .base import ProjectAPITestCase
+
+REQUESTS = "softdesk_http_requests_total"
+DURATION = "softdesk_http_request_duration_seconds"
+IN_FLIGHT = "softdesk_http_requests_in_flight"
+
+
+def dead_pid():
+    """Identifiant d'un processus terminé."""
+    process = subprocess.Popen([sys.executable, "-c", ""])
+    process.wait()
+    return process.pid
+
+
+class RegistryTests(SimpleTestCase):
+    """Valeurs d'un processus et texte d'exposition."""
+
+    def setUp(self):
+        """Remplace le registre du processus par un registre vide."""
+        self.registry = MetricsRegistry()
+        patcher = mock.patch.object(metrics, "registry", self.registry)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_counter(self):
+        """Un compteur est tenu par étiquettes, dans n'importe quel ordre."""
+        self.registry.inc(REQUESTS, {"route": "a", "status": "200"})
+        self.registry.inc(REQUESTS, {"status": "200", "route": "a"}, 2)
+        self.registry.inc(REQUESTS, {"route": "b", "status": "200"})
+        self.assertEqual(
+            collect(),
+            {
+                (REQUESTS, (("route", "a"), ("status", "200"))): 3,
+                (REQUESTS, (("route", "b"), ("status", "200"))): 1,
+            },
+        )
+
+    def test_histogram(self):
+        """Une observation compte dans le premier seuil qui la contient."""
+        for value in (0.001, 0.2, 0.25, 60):
+            self.registry.observe(DURATION, {"route": "a"}, value)
+        counts = collect()[(DURATION, (("route", "a"),))]
+        self.assertEqual(counts[0], 1)
+        self.assertEqual(counts[5], 2)
+        self.assertEqual(counts[-2], 1)
+        self.assertEqual(sum(counts[:-1]), 4)
+        self.assertAlmostEqual(counts[-1], 60.451)
+
+    def test_render(self):
+        """Le texte d'exposition cumule les seuils des histogrammes."""
+        self.registry.inc(REQUESTS, {"route": "a", "status": "200"})
+        self.registry.observe(DURATION, {"route": "a"}, 0.2)
+        self.registry.observe(DURATION, {"route": "a"}, 3)
+        lines = render(collect()).splitlines()
+        self.assertIn(f"# TYPE {REQUESTS} counter", lines)
+        self.assertIn(f'{REQUESTS}{{route="a",status="200"}} 1', lines)
+        self.assertIn(f'{DURATION}_bucket{{route="a",le="0.1"}} 0', lines)
+        self.assertIn(f'{DURATION}_bucket{{route="a",le="0.25"}} 1', lines)
+        self.assertIn(f'{DURATION}_bucket{{route="a",le="+Inf"}} 2', lines)
+        self.assertIn(f'{DURATION}_sum{{route="a"}} 3.2', lines)
+        self.assertIn(f'{DURATION}_count{{route="a"}} 2', lines)
+
+    def test_label_escaping(self):
+        """Les valeurs d'étiquettes sont échappées."""
+        self.registry.inc(REQUESTS, {"route": 'a"b\\c\n'})
+        self.assertIn(
+            f'{REQUESTS}{{route="a\\"b\\\\c\\n"}} 1', render(collect())
+        )
+
+
+class MultiprocessTests(SimpleTestCase):
+    """Fichiers de ``METRICS_DIR`` et compaction des processus terminés."""
+
+    def setUp(self):
+        """Crée le dossier partagé et un registre vide."""
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        override = override_settings(METRICS_DIR=self.directory)
+        override.enable()
+        self.addCleanup(override.disable)
+        self.registry = MetricsRegistry()
+        patcher = mock.patch.object(metrics, "registry", self.registry)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def write(self, pid, entries, suffix="abcd1234"):
+        """Écrit le fichier de métriques d'un processus."""
+        name = f"metrics-{pid}-{suffix}.json"
+        with open(os.path.join(self.directory, name), "w") as output:
+            json.dump(entries, output)
+        return name
+
+    def entries(self, requests, in_flight=1):
+        """Entrées d'un fichier: des requêtes et des requêtes en cours."""
+        return [
+            [REQUESTS, [["route", "a"]], requests],
+            [DURATION, [["route", "a"]], [1] + [0] * 11 + [0.004]],
+            [IN_FLIGHT, [], in_flight],
+        ]
+
+    def totals(self):
+        """Requêtes, observations et requêtes en cours additionnées."""
+        values = collect()
+        return (
+            values.get((REQUESTS, (("route", "a"),))),
+            values.get((DURATION, (("route", "a"),)), [0])[0],
+            values.get((IN_FLIGHT, ())),
+        )
+
+    def names(self):
+        """Fichiers de métriques présents dans le dossier."""
+        return sorted(
+            name
+            for name in os.listdir(self.directory)
+            if name.startswith("metrics-")
+        )
+
+    def test_processes_are_added(self):
+        """Les valeurs de tous les processus s'additionnent."""
+        self.write(os.getpid(), self.entries(2), suffix="first")
+        self.write(os.getpid(), self.entries(3), suffix="second")
+        self.assertEqual(self.totals(), (5, 2, 2))
+
+    def test_own_values_are_flushed(self):
+        """Les valeurs du processus qui répond sont écrites puis lues."""
+        self.registry.inc(REQUESTS, {"route": "a"}, 4)
+        self.assertEqual(self.totals()[0], 4)
+        self.assertEqual(len(self.names()), 1)
+
+    @skipIf(metrics.fcntl is None, "compaction indisponible sans fcntl")
+    def test_dead_processes_are_compacted(self):
+        """Les fichiers des processus terminés sont fusionnés puis supprimés.
+
+        Leurs compteurs restent comptés, leurs requêtes en cours non.
+        """
+        live = self.write(os.getpid(), self.entries(1))
+        for _ in range(3):
+            self.write(dead_pid(), self.entries(10, in_flight=5))
+        self.assertEqual(self.totals(), (31, 4, 1))
+        self.assertCountEqual(self.names(), [DEAD_FILE_NAME, live])
+
+        self.write(dead_pid(), self.entries(100))
+        self.assertEqual(self.totals(), (131, 5, 1))
+        self.assertEqual(self.totals(), (131, 5, 1))
+        self.assertCountEqual(self.names(), [DEAD_FILE_NAME, live])
+
+    @skipIf(metrics.fcntl is None, "compaction indisponible sans fcntl")
+    def test_interrupted_compaction_is_not_counted_twice(self):
+        """Un fichier déjà fusionné mais pas supprimé n'est plus compté."""
+        name = self.write(dead_pid(), self.entries(10))
+        self.assertEqual(self.totals()[0], 10)
+        self.write(int(name.split("-")[1]), self.entries(10))
+        self.assertEqual(self.totals()[0], 10)
+        self.assertEqual(self.names(), [DEAD_FILE_NAME])
+
+
+class MetricsViewTests(ProjectAPITestCase):
+    """Route ``/metrics``."""
+
+    def setUp(self):
+        """Remplace le registre du processus par un registre vide."""
+        super().setUp()
+        patcher = mock.patch.object(metrics, "registry", MetricsRegistry())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_requests_are_published(self):
+        """Les requêtes servies apparaissent par route, méthode et statut."""
+        self.client.get("/api/projects/")
+        response = self.client.get("/metrics")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], metrics.CONTENT_TYPE)
+        text = response.content.decode()
+        self.assertIn(
+            f'{REQUESTS}{{method="GET",route="project-list",status="200"}} 1',
+            text,
+        )
+        self.assertIn(
+            f'{DURATION}_count{{method="GET",route="project-list"}} 1', text
+        )
+        self.assertIn("softdesk_db_queries_per_request_bucket{", text)
+
+    @override_settings(METRICS_TOKEN="secret")
+    def test_token(self):
+        """Avec ``METRICS_TOKEN``, le jeton est exigé."""
+        client = Client()
+        self.assertEqual(client.get("/metrics").status_code, 401)
+        response = client.get("/metrics", HTTP_AUTHORIZATION="Bearer autre")
+        self.assertEqual(response.status_code, 401)
+        response = client.get("/metrics", HTTP_AUTHORIZATION="Bearer secret")
+        self.assertEqual(response.status_code, 200)
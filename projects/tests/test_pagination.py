@@ -0,0 +1,78 @@
+"""Pagination par curseur (``projects.pagination``)."""
+
+from django.test import override_settings
+from django.utils import timezone
+
+from projects.models import Issue
+
+from .base import ProjectAPITestCase
+
+
+class KeysetPaginationTests(ProjectAPITestCase):
+    """Parcours des problèmes par curseur sur (created_time, id)."""
+
+    def setUp(self):
+        """Crée 7 problèmes, dont 4 à la même date de création."""
+        super().setUp()
+        issues = [self.create_issue(title=f"P{index}") for index in range(7)]
+        self.ids = [issue.pk for issue in issues]
+        Issue.objects.filter(pk__in=self.ids[2:6]).update(
+            created_time=timezone.now()
+        )
+        self.ordered = list(
+            Issue.objects.order_by("created_time", "id").values_list(
+                "id", flat=True
+            )
+        )
+
+    def walk(self, url):
+        """Suit les liens ``next`` et retourne les pages lues."""
+        pages = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            pages.append(response.data)
+            url = response.data["next"]
+        return pages
+
+    def test_walk_returns_each_issue_once(self):
+        """Toutes les pages couvrent chaque problème une fois, dans l'ordre."""
+        pages = self.walk(f"{self.issues_url()}?pagination=cursor&page_size=2")
+        seen = [issue["id"] for page in pages for issue in page["results"]]
+        self.assertEqual(seen, self.ordered)
+        self.assertEqual(len(pages), 4)
+        self.assertNotIn("count", pages[0])
+        self.assertIsNone(pages[0]["previous"])
+
+    def test_previous_link(self):
+        """Le lien ``previous`` ramène à la page précédente."""
+        first, second = self.walk(
+            f"{self.issues_url()}?pagination=cursor&page_size=3"
+        )[:2]
+        response = self.client.get(second["previous"])
+        self.assertEqual(response.data["results"], first["results"])
+        self.assertIsNone(response.data["previous"])
+
+    def test_new_issue_does_not_shift_pages(self):
+        """Un ajout pendant le parcours ne répète aucun problème."""
+        response = self.client.get(
+            f"{self.issues_url()}?pagination=cursor&page_size=3"
+        )
+        self.create_issue(title="Ajouté")
+        pages = self.walk(response.data["next"])
+        seen = [issue["id"] for page in pages for issue in page["results"]]
+        self.assertEqual(seen[: len(self.ordered) - 3], self.ordered[3:])
+        self.assertEqual(len(seen), len(set(seen)))
+
+    def test_invalid_cursor(self):
+        """Un curseur mal formé donne un 404."""
+        response = self.client.get(f"{self.issues_url()}?cursor=invalide")
+        self.assertEqual(response.status_code, 404)
+
+    @override_settings(CURSOR_PAGINATION_MAX_PAGE_SIZE=5)
+    def test_page_size_is_capped(self):
+        """La taille de page demandée est bornée."""
+        response = self.client.get(
+            f"{self.issues_url()}?pagination=cursor&page_size=100"
+        )
+        self.assertEqual(len(response.data["results"]), 5)
@@ -0,0 +1,50 @@
+"""Budgets de requêtes SQL des routes de lecture (``projects.querybudget``)."""
+
+from django.test import TestCase
+
+from projects.querybudget import (
+    ENDPOINTS,
+    QUERY_BUDGETS,
+    SIZES,
+    QueryBudgetExceeded,
+    check_budgets,
+    read_actions,
+)
+from .base import QuietLogsMixin
+
+
+class QueryBudgetTests(QuietLogsMixin, TestCase):
+    """Chaque route de lecture tient son budget, quel que soit le volume."""
+
+    def test_every_read_action_has_a_budget(self):
+        """Une nouvelle route de lecture doit recevoir un budget."""
+        self.assertEqual(read_actions() - set(QUERY_BUDGETS), set())
+        self.assertEqual(set(QUERY_BUDGETS) - set(ENDPOINTS), set())
+
+    def test_budgets(self):
+        """Vérifie chaque action pour 1, 10 et 1000 objets liés.
+
+        Un dépassement échoue avec le SQL, les requêtes répétées et la
+        pile d'appels enregistrés par ``QueryRecorder``.
+        """
+        counts, errors = check_budgets()
+        self.assertEqual(set(counts), set(QUERY_BUDGETS))
+        for action, by_size in counts.items():
+            self.assertEqual(set(by_size), set(SIZES), action)
+        if errors:
+            self.fail("\n\n".join(str(error) for error in errors))
+
+    def test_exceeded_budget_is_reported(self):
+        """Un budget trop bas est signalé avec le détail des requêtes."""
+        action = "IssueViewSet.retrieve"
+        counts, errors = check_budgets(
+            sizes=(1,), actions=[action], budgets={**QUERY_BUDGETS, action: 0}
+        )
+        self.assertEqual(len(errors), 1)
+        error = errors[0]
+        self.assertIsInstance(error, QueryBudgetExceeded)
+        self.assertEqual(
+            (error.action, error.size, error.budget), (action, 1, 0)
+        )
+        self.assertEqual(len(error.queries), counts[action][1])
+        self.assertIn("budget 0", str(error))
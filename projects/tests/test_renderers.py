@@ -0,0 +1,144 @@
+"""Rendu et analyse du JSON et de MessagePack (``projects.renderers``)."""
+
+import io
+import uuid
+from datetime import date, datetime, time, timedelta, timezone
+from decimal import Decimal
+from unittest import skipUnless
+from zoneinfo import ZoneInfo
+
+from rest_framework.renderers import JSONRenderer
+
+from projects.renderers import (
+    FastJSONParser,
+    FastJSONRenderer,
+    MessagePackParser,
+    MessagePackRenderer,
+    dumps,
+    msgpack,
+)
+
+from .base import ProjectAPITestCase
+
+SAMPLE = {
+    "utc": datetime(2024, 1, 2, 3, 4, 5, 123456, tzinfo=timezone.utc),
+    "paris": datetime(2024, 7, 1, 12, 0, tzinfo=ZoneInfo("Europe/Paris")),
+    "naive": datetime(2024, 1, 2, 3, 4, 5),
+    "date": date(2024, 1, 2),
+    "time": time(1, 2, 3, 456789),
+    "duration": timedelta(minutes=90),
+    "price": Decimal("12.50"),
+    "ratio": Decimal("0.1"),
+    "uuid": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+    "text": "Été à Paris",
+    "nested": [{"n": 1, "ok": True, "none": None}, (2, 3)],
+    1: "clé entière",
+}
+
+
+class FastJSONTests(ProjectAPITestCase):
+    """Parité avec le JSON de DRF, et négociation du format."""
+
+    def test_parity_with_drf(self):
+        """La sortie compacte est celle de ``JSONRenderer``, à l'octet près."""
+        expected = JSONRenderer().render(SAMPLE)
+        self.assertEqual(dumps(SAMPLE), expected)
+        self.assertEqual(FastJSONRenderer().render(SAMPLE), expected)
+
+    def test_parity_per_type(self):
+        """Chaque type est encodé comme par DRF."""
+        for key, value in SAMPLE.items():
+            with self.subTest(key=key):
+                self.assertEqual(
+                    dumps([value]), JSONRenderer().render([value])
+                )
+
+    def test_big_integer(self):
+        """Un entier hors de 64 bits passe par la bibliothèque standard."""
+        self.assertEqual(dumps({"n": 2**70}), b'{"n":1180591620717411303424}')
+
+    def test_api_response_parity(self):
+        """Une réponse de l'API est celle que rendrait DRF."""
+        self.create_issue()
+        response = self.client.get(self.issues_url())
+        self.assertEqual(response["Content-Type"], "application/json")
+        self.assertEqual(
+            response.content, JSONRenderer().render(response.data)
+        )
+
+    def test_accept_negotiation(self):
+        """Le format suit l'en-tête ``Accept``."""
+        response = self.client.get(
+            "/api/projects/", HTTP_ACCEPT="application/json; indent=4"
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.content.startswith(b'{\n  "count"'))
+
+        response = self.client.get("/api/projects/", HTTP_ACCEPT="text/html")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["Content-Type"].startswith("text/html"))
+
+        response = self.client.get(
+            "/api/projects/", HTTP_ACCEPT="application/xml"
+        )
+        self.assertEqual(response.status_code, 406)
+
+    @skipUnless(msgpack is None, "msgpack est installé")
+    def test_msgpack_not_offered(self):
+        """Sans la bibliothèque msgpack, le format n'est pas proposé."""
+        response = self.client.get(
+            "/api/projects/", HTTP_ACCEPT="application/msgpack"
+        )
+        self.assertEqual(response.status_code, 406)
+
+    def test_parser(self):
+        """Le corps JSON est décodé, et un JSON invalide refusé."""
+        response = self.client.post(
+            "/api/projects/",
+            {"title": "Nouveau", "description": "Été", "type": "BACKEND"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data["description"], "Été")
+
+        response = self.client.post(
+            "/api/projects/", b"{", content_type="application/json"
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_parser_round_trip(self):
+        """L'analyseur relit ce que produit le rendu."""
+        data = {"title": "Été", "tags": [1, 2.5, None]}
+        stream = io.BytesIO(FastJSONRenderer().render(data))
+        self.assertEqual(FastJSONParser().parse(stream), data)
+
+
+@skipUnless(msgpack is not None, "msgpack n'est pas installé")
+class MessagePackTests(ProjectAPITestCase):
+    """Format ``application/msgpack``, si la bibliothèque est installée."""
+
+    def test_round_trip(self):
+        """Les types non natifs sont encodés en chaînes, comme en JSON."""
+        data = {"uuid": SAMPLE["uuid"], "price": SAMPLE["price"], "n": [1]}
+        stream = io.BytesIO(MessagePackRenderer().render(data))
+        self.assertEqual(
+            MessagePackParser().parse(stream),
+            {"uuid": str(SAMPLE["uuid"]), "price": 12.5, "n": [1]},
+        )
+
+    def test_api(self):
+        """L'API lit et répond en MessagePack."""
+        body = msgpack.packb(
+            {"title": "Nouveau", "description": "Été", "type": "BACKEND"}
+        )
+        response = self.client.post(
+            "/api/projects/",
+            body,
+            content_type="application/msgpack",
+            HTTP_ACCEPT="application/msgpack",
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response["Content-Type"], "application/msgpack")
+        self.assertEqual(
+            msgpack.unpackb(response.content)["description"], "Été"
+        )
@@ -0,0 +1,134 @@
+"""Répartition des lectures entre principale et répliques."""
+
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from projects.models import Issue
+from projects.replicas import (
+    ReplicaRouter,
+    ReplicaRoutingMiddleware,
+    pin_cache_key,
+    read_alias,
+)
+from users.models import User
+
+REPLICA = "replica1"
+
+
+@override_settings(REPLICA_DATABASES=[REPLICA], REPLICA_PIN_SECONDS=5)
+class ReplicaRoutingTests(TestCase):
+    """Choix de la base par le middleware, appliqué par le routeur.
+
+    La vue est remplacée par une fonction qui relève les bases choisies
+    par le routeur: aucune connexion à la réplique n'est ouverte.
+    """
+
+    def setUp(self):
+        """Vide le cache et prépare un utilisateur authentifié."""
+        cache.clear()
+        self.router = ReplicaRouter()
+        self.factory = RequestFactory()
+        self.user = User.objects.create_user(username="alice", age=30)
+        self.token = f"Bearer {AccessToken.for_user(self.user)}"
+        self.routes = []
+
+    def view(self, request):
+        """Relève les bases de lecture et d'écriture pendant la requête."""
+        self.routes.append(
+            (
+                read_alias.get(),
+                self.router.db_for_read(Issue),
+                self.router.db_for_write(Issue),
+            )
+        )
+        return HttpResponse()
+
+    def call(self, method, token=True):
+        """Fait passer une requête dans le middleware."""
+        headers = {"HTTP_AUTHORIZATION": self.token} if token else {}
+        request = getattr(self.factory, method)("/api/projects/", **headers)
+        ReplicaRoutingMiddleware(self.view)(request)
+        return self.routes[-1]
+
+    def test_safe_methods_read_from_replica(self):
+        """Les lectures d'une requête GET vont à la réplique."""
+        for method in ("get", "head", "options"):
+            with self.subTest(method=method):
+                alias, read, write = self.call(method)
+                self.assertEqual(alias, REPLICA)
+                self.assertEqual(read, REPLICA)
+                self.assertEqual(write, DEFAULT_DB_ALIAS)
+
+    def test_anonymous_reads_from_replica(self):
+        """Une requête sans jeton lit aussi sur la réplique."""
+        self.assertEqual(self.call("get", token=False)[1], REPLICA)
+
+    def test_write_request_reads_from_primary(self):
+        """Une requête d'écriture lit et écrit sur la principale."""
+        self.assertEqual(
+            self.call("post"), (None, DEFAULT_DB_ALIAS, DEFAULT_DB_ALIAS)
+        )
+
+    def test_write_pins_user_to_primary(self):
+        """Après une écriture, les lectures de l'utilisateur sont épinglées."""
+        self.call("patch")
+        self.assertTrue(cache.get(pin_cache_key(self.user.pk)))
+        self.assertEqual(self.call("get")[1], DEFAULT_DB_ALIAS)
+        self.assertEqual(self.call("get", token=False)[1], REPLICA)
+
+    def test_pin_expires(self):
+        """Sans épinglage, l'utilisateur relit sur la réplique."""
+        self.call("delete")
+        cache.delete(pin_cache_key(self.user.pk))
+        self.assertEqual(self.call("get")[1], REPLICA)
+
+    def test_alias_is_reset_after_request(self):
+        """Hors requête, les lectures vont à la principale."""
+        self.call("get")
+        self.assertIsNone(read_alias.get())
+        self.assertEqual(self.router.db_for_read(Issue), DEFAULT_DB_ALIAS)
+
+    def test_async_request(self):
+        """Le middleware asynchrone route et épingle de la même façon."""
+
+        async def view(request):
+            return self.view(request)
+
+        middleware = ReplicaRoutingMiddleware(view)
+        headers = {"HTTP_AUTHORIZATION": self.token}
+        async_to_sync(middleware)(self.factory.get("/api/", **headers))
+        self.assertEqual(self.routes[-1][1], REPLICA)
+        async_to_sync(middleware)(self.factory.post("/api/", **headers))
+        async_to_sync(middleware)(self.factory.get("/api/", **headers))
+        self.assertEqual(self.routes[-1][1], DEFAULT_DB_ALIAS)
+
+    def test_db_for_write_is_always_primary(self):
+        """Les écritures vont à la principale, même pendant une lecture."""
+        token = read_alias.set(REPLICA)
+        try:
+            self.assertEqual(self.router.db_for_write(Issue), DEFAULT_DB_ALIAS)
+            self.assertEqual(self.router.db_for_write(User), DEFAULT_DB_ALIAS)
+        finally:
+            read_alias.reset(token)
+
+    def test_allow_migrate(self):
+        """Les migrations ne s'appliquent pas aux répliques."""
+        self.assertIs(self.router.allow_migrate(REPLICA, "projects"), False)
+        self.assertIsNone(self.router.allow_migrate(DEFAULT_DB_ALIAS, "users"))
+
+    def test_allow_relation(self):
+        """Un objet lu sur une réplique peut être lié à la principale."""
+        issue = Issue(pk=1)
+        user = User(pk=1)
+        issue._state.db = REPLICA
+        user._state.db = DEFAULT_DB_ALIAS
+        self.assertIs(self.router.allow_relation(issue, user), True)
+
+    @override_settings(REPLICA_DATABASES=[])
+    def test_without_replicas(self):
+        """Sans réplique, tout va à la principale."""
+        self.assertEqual(self.call("get")[1], DEFAULT_DB_ALIAS)
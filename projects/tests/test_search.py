@@ -0,0 +1,169 @@
+"""Recherche plein texte (``projects.search``)."""
+
+from unittest import mock
+
+from projects.models import Comment, Issue
+from projects.search import rebuild_search_index, search, search_index_exists
+
+from .base import ProjectAPITestCase
+
+
+class SearchTests(ProjectAPITestCase):
+    """Index FTS5 tenu à jour par les triggers, et recherche de repli."""
+
+    def setUp(self):
+        """Crée un problème commenté dans le projet de départ."""
+        super().setUp()
+        self.issue = self.create_issue(
+            title="Crash au démarrage",
+            description="L'application plante sur Android.",
+        )
+        self.comment = Comment.objects.create(
+            description="Reproduit sur une tablette.",
+            issue=self.issue,
+            author=self.owner,
+        )
+
+    def hits(self, query, project_ids=None):
+        """Couples (type, id) trouvés pour ``query``."""
+        if project_ids is None:
+            project_ids = [self.project.pk]
+        return [(hit["type"], hit["id"]) for hit in search(query, project_ids)]
+
+    def test_index_exists(self):
+        """La base de test dispose de l'index FTS5."""
+        self.assertTrue(search_index_exists())
+
+    def test_insert(self):
+        """Problèmes et commentaires créés sont indexés."""
+        self.assertEqual(self.hits("crash"), [("issue", self.issue.pk)])
+        self.assertEqual(self.hits("tablette"), [("comment", self.comment.pk)])
+
+    def test_prefix(self):
+        """Le dernier terme est cherché comme préfixe."""
+        self.assertEqual(self.hits("andro"), [("issue", self.issue.pk)])
+
+    def test_update(self):
+        """Une modification, même par ``update``, remplace l'entrée."""
+        Issue.objects.filter(pk=self.issue.pk).update(title="Lenteur")
+        Comment.objects.filter(pk=self.comment.pk).update(
+            description="Reproduit sur un téléphone."
+        )
+        self.assertEqual(self.hits("crash"), [])
+        self.assertEqual(self.hits("lenteur"), [("issue", self.issue.pk)])
+        self.assertEqual(self.hits("tablette"), [])
+        self.assertEqual(
+            self.hits("téléphone"), [("comment", self.comment.pk)]
+        )
+
+    def test_delete(self):
+        """Une suppression retire l'entrée, y compris en cascade."""
+        self.comment.delete()
+        self.assertEqual(self.hits("tablette"), [])
+        Comment.objects.create(
+            description="Toujours sur tablette.",
+            issue=self.issue,
+            author=self.owner,
+        )
+        self.issue.delete()
+        self.assertEqual(self.hits("crash"), [])
+        self.assertEqual(self.hits("tablette"), [])
+
+    def test_title_ranks_first(self):
+        """Un terme du titre compte davantage qu'un terme du corps."""
+        body = self.create_issue(
+            title="Autre", description="Un crash en passant."
+        )
+        hits = search("crash", [self.project.pk])
+        self.assertEqual([hit["id"] for hit in hits], [self.issue.pk, body.pk])
+        self.assertIn("[Crash]", hits[0]["snippet"])
+
+    def test_restricted_to_projects(self):
+        """Seuls les projets donnés sont cherchés."""
+        other = self.create_project(self.owner, title="Autre")
+        self.create_issue(project=other, title="Crash ailleurs")
+        self.assertEqual(self.hits("crash"), [("issue", self.issue.pk)])
+        self.assertEqual(self.hits("crash", []), [])
+
+    def test_rebuild(self):
+        """La reconstruction réindexe les tables sources."""
+        self.assertTrue(rebuild_search_index())
+        self.assertEqual(self.hits("tablette"), [("comment", self.comment.pk)])
+
+    def test_like_fallback(self):
+        """Sans FTS5, la recherche se replie sur ``LIKE``."""
+        with mock.patch(
+            "projects.search.search_index_exists", return_value=False
+        ):
+            self.assertEqual(self.hits("CRASH"), [("issue", self.issue.pk)])
+            self.assertEqual(
+                self.hits("plante android"), [("issue", self.issue.pk)]
+            )
+            self.assertEqual(
+                self.hits("tablette"), [("comment", self.comment.pk)]
+            )
+            self.assertEqual(self.hits("crash", []), [])
+            hits = search("crash", [self.project.pk])
+        self.assertIsNone(hits[0]["rank"])
+
+
+class SearchEndpointTests(ProjectAPITestCase):
+    """Routes ``/projects/search/`` et ``/projects/{id}/search/``."""
+
+    def setUp(self):
+        """Crée un problème dans deux projets, dont un sans ``member``."""
+        super().setUp()
+        self.issue = self.create_issue(title="Crash au démarrage")
+        self.private = self.create_project(self.owner, title="Privé")
+        self.hidden = self.create_issue(
+            project=self.private, title="Crash privé"
+        )
+        self.member = self.create_user("member")
+        self.add_contributor(self.member)
+        self.url = f"/api/projects/{self.project.pk}/search/"
+
+    def ids(self, response):
+        """Identifiants des résultats d'une réponse de recherche."""
+        self.assertEqual(response.status_code, 200)
+        return [hit["id"] for hit in response.data["results"]]
+
+    def test_search(self):
+        """La recherche d'un projet ne couvre que ce projet."""
+        response = self.client.get(self.url, {"q": "crash"})
+        self.assertEqual(self.ids(response), [self.issue.pk])
+
+    def test_search_all(self):
+        """La recherche globale couvre les projets de l'utilisateur."""
+        response = self.client.get("/api/projects/search/", {"q": "crash"})
+        self.assertCountEqual(
+            self.ids(response), [self.issue.pk, self.hidden.pk]
+        )
+        response = self.client_for(self.member).get(
+            "/api/projects/search/", {"q": "crash"}
+        )
+        self.assertEqual(self.ids(response), [self.issue.pk])
+
+    def test_non_member(self):
+        """Un non-membre ne voit aucun résultat du projet."""
+        outsider = self.client_for(self.create_user("outsider"))
+        response = outsider.get("/api/projects/search/", {"q": "crash"})
+        self.assertEqual(self.ids(response), [])
+        response = outsider.get(self.url, {"q": "crash"})
+        self.assertEqual(response.status_code, 404)
+
+    def test_pagination(self):
+        """Un résultat de plus que la page annonce la page suivante."""
+        for index in range(2):
+            self.create_issue(title=f"Crash {index}")
+        response = self.client.get(self.url, {"q": "crash", "page_size": 2})
+        self.assertEqual(len(self.ids(response)), 2)
+        self.assertIn("page=2", response.data["next"])
+        response = self.client.get(response.data["next"])
+        self.assertEqual(len(self.ids(response)), 1)
+        self.assertIsNone(response.data["next"])
+        self.assertIsNotNone(response.data["previous"])
+
+    def test_empty_query(self):
+        """Une requête sans terme est refusée."""
+        response = self.client.get(self.url, {"q": " !? "})
+        self.assertEqual(response.status_code, 400)
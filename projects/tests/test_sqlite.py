@@ -0,0 +1,145 @@
+"""Pragmas des connexions SQLite et maintenance (``projects.sqlite``)."""
+
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.db import connections
+from django.db.backends.sqlite3.base import DatabaseWrapper
+from django.test import SimpleTestCase, override_settings
+
+from projects.sqlite import database_size, get_pragmas
+
+ALIAS = "sqlite_file"
+
+
+class SQLiteFileTestCase(SimpleTestCase):
+    """Base de test: une base SQLite dans un fichier temporaire.
+
+    La base de test de Django est en mémoire, où ``journal_mode=wal`` et
+    la taille des fichiers n'ont pas de sens. La connexion est ouverte par
+    le moteur de Django, et reçoit donc les pragmas de ``SQLITE_PRAGMAS``.
+    """
+
+    def setUp(self):
+        """Déclare l'alias ``ALIAS`` vers un fichier temporaire."""
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "test.sqlite3")
+        self.addCleanup(delattr, connections._connections, ALIAS)
+        self.connection = self.open()
+
+    def open(self):
+        """Ouvre une nouvelle connexion à la base, sous l'alias ``ALIAS``."""
+        settings_dict = {
+            **connections["default"].settings_dict,
+            "NAME": self.path,
+        }
+        connection = DatabaseWrapper(settings_dict, alias=ALIAS)
+        connections[ALIAS] = connection
+        self.addCleanup(connection.close)
+        return connection
+
+    def pragma(self, name):
+        """Valeur courante d'un pragma de la connexion."""
+        with self.connection.cursor() as cursor:
+            cursor.execute(f"PRAGMA {name}")
+            return cursor.fetchone()[0]
+
+
+class PragmaTests(SQLiteFileTestCase):
+    """Pragmas appliqués à chaque nouvelle connexion."""
+
+    def test_pragmas_applied(self):
+        """Les pragmas par défaut sont actifs dès la connexion."""
+        self.assertEqual(self.pragma("journal_mode"), "wal")
+        # 1 = NORMAL
+        self.assertEqual(self.pragma("synchronous"), 1)
+        self.assertEqual(self.pragma("foreign_keys"), 1)
+        self.assertEqual(self.pragma("busy_timeout"), 5000)
+        # 2 = INCREMENTAL, effectif sur une base encore vide
+        self.assertEqual(self.pragma("auto_vacuum"), 2)
+
+    @override_settings(SQLITE_PRAGMAS={"synchronous": "full"})
+    def test_pragmas_from_settings(self):
+        """Les pragmas suivent ``SQLITE_PRAGMAS``."""
+        self.assertEqual(self.pragma("synchronous"), 2)
+        self.assertEqual(self.pragma("journal_mode"), "delete")
+
+    def test_invalid_pragmas(self):
+        """Un pragma inconnu ou une valeur non littérale est refusé."""
+        for pragmas in (
+            {"writable_schema": 1},
+            {"journal_mode": "wal; DROP TABLE x"},
+        ):
+            with self.subTest(pragmas=pragmas):
+                with override_settings(SQLITE_PRAGMAS=pragmas):
+                    with self.assertRaises(ImproperlyConfigured):
+                        get_pragmas()
+
+
+class MaintenanceCommandTests(SQLiteFileTestCase):
+    """Commande ``dbmaintain``."""
+
+    def setUp(self):
+        """Remplit puis vide une table, laissant des pages libres."""
+        super().setUp()
+        with self.connection.cursor() as cursor:
+            cursor.execute("CREATE TABLE item (id INTEGER, body TEXT)")
+            for index in range(200):
+                cursor.execute(
+                    "INSERT INTO item VALUES (%s, %s)", [index, "x" * 1000]
+                )
+            cursor.execute("DELETE FROM item")
+        self.assertGreater(self.pragma("freelist_count"), 0)
+        self.assertGreater(database_size(ALIAS)["wal"], 0)
+
+    def run_command(self, *args):
+        """Exécute ``dbmaintain`` sur la base et retourne sa sortie."""
+        out = StringIO()
+        call_command("dbmaintain", "--database", ALIAS, *args, stdout=out)
+        return out.getvalue()
+
+    def test_maintenance(self):
+        """Les pages libres sont rendues et le journal WAL vidé."""
+        report = json.loads(self.run_command("--json"))
+        self.assertEqual(
+            [step["step"] for step in report["steps"]],
+            ["analyze", "optimize", "vacuum", "wal_checkpoint"],
+        )
+        self.assertEqual(report["after"]["wal"], 0)
+        self.assertLess(report["after"]["database"], self.size_before(report))
+        self.assertEqual(self.pragma("freelist_count"), 0)
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'"
+            )
+            self.assertIsNotNone(cursor.fetchone())
+
+    def size_before(self, report):
+        """Taille de la base et du journal avant la maintenance."""
+        return report["before"]["database"] + report["before"]["wal"]
+
+    def test_limited_vacuum(self):
+        """``--pages`` borne le nombre de pages rendues."""
+        report = json.loads(self.run_command("--pages", "5", "--json"))
+        detail = report["steps"][2]["detail"]
+        self.assertTrue(detail.startswith("5 pages libérées sur "), detail)
+        self.assertGreater(self.pragma("freelist_count"), 0)
+
+    @override_settings(SQLITE_PRAGMAS={})
+    def test_full_vacuum(self):
+        """``--vacuum`` passe une base existante en mode incrémental."""
+        self.connection.close()
+        self.connection = self.open()
+        with self.connection.cursor() as cursor:
+            cursor.execute("PRAGMA auto_vacuum = none")
+            cursor.execute("VACUUM")
+        self.assertIn("ignoré: auto_vacuum=none", self.run_command())
+        output = self.run_command("--vacuum")
+        self.assertIn("VACUUM complet", output)
+        self.assertIn("Maintenance terminée", output)
+        self.assertEqual(self.pragma("auto_vacuum"), 2)
@@ -0,0 +1,63 @@
+"""Mesure des requêtes (``projects.timing``, ``projects.middleware``)."""
+
+import re
+from types import SimpleNamespace
+
+from django.db import connection
+from django.test import SimpleTestCase
+from django.test.utils import CaptureQueriesContext
+
+from projects.timing import install_query_timer, record_query
+
+from .base import ProjectAPITestCase
+
+
+class ServerTimingTests(ProjectAPITestCase):
+    """En-tête Server-Timing des réponses."""
+
+    def test_counts_queries(self):
+        """Le nombre de requêtes SQL annoncé est celui exécuté."""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.issues_url())
+        match = re.search(
+            r'db;dur=[\d.]+;desc="(\d+) SQL"', response["Server-Timing"]
+        )
+        self.assertIsNotNone(match)
+        self.assertEqual(int(match.group(1)), len(queries))
+
+    def test_counts_queries_inside_execute_wrapper(self):
+        """Les requêtes restent comptées sous un ``execute_wrapper()``."""
+
+        def passthrough(execute, sql, params, many, context):
+            return execute(sql, params, many, context)
+
+        with connection.execute_wrapper(passthrough):
+            response = self.client.get(self.issues_url())
+        self.assertNotIn('desc="0 SQL"', response["Server-Timing"])
+        self.assertIn(record_query, connection.execute_wrappers)
+
+
+class InstallQueryTimerTests(SimpleTestCase):
+    """Installation de ``record_query`` sur une nouvelle connexion."""
+
+    def test_survives_execute_wrapper_exit(self):
+        """Une connexion ouverte sous ``execute_wrapper()`` le garde.
+
+        En sortie, ``execute_wrapper()`` retire le dernier wrapper de la
+        liste, qui doit être le sien et non ``record_query``.
+        """
+
+        def wrapper(execute, sql, params, many, context):
+            return execute(sql, params, many, context)
+
+        new_connection = SimpleNamespace(execute_wrappers=[wrapper])
+        install_query_timer(None, new_connection)
+        self.assertIs(new_connection.execute_wrappers.pop(), wrapper)
+        self.assertEqual(new_connection.execute_wrappers, [record_query])
+
+    def test_installed_once(self):
+        """Un second signal n'ajoute pas ``record_query`` en double."""
+        new_connection = SimpleNamespace(execute_wrappers=[])
+        install_query_timer(None, new_connection)
+        install_query_timer(None, new_connection)
+        self.assertEqual(new_connection.execute_wrappers, [record_query])
@@ -0,0 +1,94 @@
+"""Mesure du temps passé en base et en sérialisation par requête.
+
+Le suivi d'une requête est un objet ``RequestTiming`` placé dans une
+variable de contexte par ``projects.middleware.RequestTimingMiddleware``:
+il suit la requête dans les threads des vues synchrones servies en ASGI
+comme dans l'ORM asynchrone. Hors d'une requête mesurée, la variable
+vaut None et les points de mesure ne coûtent qu'une lecture de cette
+variable.
+
+Deux points de mesure l'alimentent:
+- ``record_query``, placé en tête des ``execute_wrappers`` de chaque
+  connexion (voir ``install_query_timer``): nombre et durée des requêtes
+  SQL
+- ``TimedSerializerMixin``: durée de ``to_representation`` des
+  sérialiseurs de l'application projects de plus haut niveau, les
+  sérialiseurs imbriqués étant comptés dans leur parent. Les requêtes
+  SQL faites pendant la sérialisation sont comptées dans les deux
+  durées.
+"""
+
+import time
+from contextvars import ContextVar
+
+current_timing = ContextVar("current_timing", default=None)
+
+
+class RequestTiming:
+    """Mesures en cours d'une requête.
+
+    Attributes:
+        started: Début de la requête (``time.perf_counter()``)
+        queries: Nombre de requêtes SQL
+        db_time: Durée cumulée des requêtes SQL, en secondes
+        serializer_time: Durée cumulée de la sérialisation, en secondes
+        depth: Nombre de sérialisations en cours, pour ne mesurer que la
+            plus externe
+    """
+
+    __slots__ = ("started", "queries", "db_time", "serializer_time", "depth")
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.db_time = 0.0
+        self.serializer_time = 0.0
+        self.depth = 0
+
+    @property
+    def elapsed(self):
+        """Durée écoulée depuis le début de la requête, en secondes."""
+        return time.perf_counter() - self.started
+
+
+def record_query(execute, sql, params, many, context):
+    """Compte et chronomètre une requête SQL de la requête mesurée."""
+    timing = current_timing.get()
+    if timing is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timing.queries += 1
+        timing.db_time += time.perf_counter() - started
+
+
+def install_query_timer(sender, connection, **kwargs):
+    """Ajoute ``record_query`` à une nouvelle connexion.
+
+    Récepteur du signal ``connection_created``. ``record_query`` est placé
+    en tête des ``execute_wrappers``: le gestionnaire de contexte
+    ``connection.execute_wrapper()`` retire le dernier élément de la liste
+    en sortie, et une connexion ouverte dans un tel bloc perdrait sinon
+    ``record_query`` au lieu du wrapper temporaire.
+    """
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, record_query)
+
+
+class TimedSerializerMixin:
+    """Mesure la durée de sérialisation pour la requête en cours."""
+
+    def to_representation(self, instance):
+        """Sérialise ``instance``, en chronométrant l'appel le plus externe."""
+        timing = current_timing.get()
+        if timing is None or timing.depth:
+            return super().to_representation(instance)
+        timing.depth += 1
+        started = time.perf_counter()
+        try:
+            return super().to_representation(instance)
+        finally:
+            timing.serializer_time += time.perf_counter() - started
+            timing.depth -= 1
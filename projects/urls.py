@@ -15,8 +15,8 @@ La structure des URLs suit ce modèle:
 from django.urls import path, include
 from rest_framework_nested import routers
 from rest_framework.permissions import IsAuthenticated
-from rest_framework_simplejwt.authentication import JWTAuthentication
 
+from users.authentication import CachedJWTAuthentication
 from .views import (
     ProjectViewSet,
     ContributorViewSet,
@@ -26,7 +26,7 @@ from .views import (
 
 # Configuration par défaut pour tous les routeurs
 router_config = {
-    "DEFAULT_AUTHENTICATION_CLASSES": [JWTAuthentication],
+    "DEFAULT_AUTHENTICATION_CLASSES": [CachedJWTAuthentication],
     "DEFAULT_PERMISSION_CLASSES": [IsAuthenticated],
 }
 
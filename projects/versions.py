@@ -0,0 +1,60 @@
+"""Version du contenu des projets.
+
+Chaque écriture dans un projet (contributeurs, problèmes, commentaires)
+incrémente ``Project.version`` et avance ``Project.updated_time`` en un
+seul ``UPDATE`` atomique. Ces deux valeurs suffisent à savoir si une
+représentation d'un projet ou de son contenu a changé, sans relire ni
+resérialiser les données (voir ``projects.conditional``).
+"""
+
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import Comment, Contributor, Issue, Project
+
+
+def touch_project(project_id):
+    """Marque le contenu d'un projet comme modifié."""
+    Project.objects.filter(pk=project_id).update(
+        version=F("version") + 1, updated_time=timezone.now()
+    )
+
+
+def touch_issue_project(issue_id):
+    """Marque comme modifié le projet d'un problème, sans le charger."""
+    Project.objects.filter(issues__id=issue_id).update(
+        version=F("version") + 1, updated_time=timezone.now()
+    )
+
+
+def touch_issues_projects(issue_ids):
+    """Marque comme modifiés les projets d'un ensemble de problèmes."""
+    Project.objects.filter(issues__id__in=issue_ids).update(
+        version=F("version") + 1, updated_time=timezone.now()
+    )
+
+
+def touch_user_projects(user_id):
+    """Marque comme modifiés tous les projets qui affichent l'utilisateur.
+
+    Un utilisateur est imbriqué dans les projets dont il est membre, mais
+    aussi dans ceux où il reste auteur ou assigné d'un problème, ou auteur
+    d'un commentaire, après en être sorti.
+    """
+    Project.objects.filter(
+        Q(
+            pk__in=Contributor.objects.filter(user_id=user_id).values(
+                "project_id"
+            )
+        )
+        | Q(
+            pk__in=Issue.objects.filter(
+                Q(author_id=user_id) | Q(assignee_id=user_id)
+            ).values("project_id")
+        )
+        | Q(
+            pk__in=Comment.objects.filter(author_id=user_id).values(
+                "issue__project_id"
+            )
+        )
+    ).update(version=F("version") + 1, updated_time=timezone.now())
@@ -7,34 +7,66 @@ Ce module contient tous les ViewSets pour l'application de projets:
 - CommentViewSet: Gère les commentaires sur les problèmes
 """
 
+import io
+
+from django.conf import settings
+from django.db.models import Prefetch
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 from rest_framework import viewsets, status
+from rest_framework.decorators import action
+from rest_framework.parsers import MultiPartParser
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
-from rest_framework.exceptions import AuthenticationFailed
-from rest_framework_simplejwt.authentication import JWTAuthentication
-
+from rest_framework.exceptions import AuthenticationFailed, ValidationError
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from users.authentication import CachedJWTAuthentication
+from .bulk import create_issues, update_issues
+from .caching import ResponseCacheMixin
+from .export import buffered, export_ndjson
+from .fieldsets import SparseQuerysetMixin
 from .models import Project, Contributor, Issue, Comment
+from .filters import IssueFilterBackend, IssueOrderingFilter
+from .importer import (
+    FORMATS,
+    IssueImporter,
+    guess_format,
+    is_utf8,
+    read_records,
+)
+from .membership import is_project_member
+from .pagination import KeysetPagination
 from .permissions import IsProjectContributor, IsAuthorOrReadOnly
+from .search import parse_terms, search
 from .serializers import (
     ProjectListSerializer,
     ProjectDetailSerializer,
     ContributorSerializer,
     ContributorCreateSerializer,
     IssueListSerializer,
+    IssueBatchUpdateSerializer,
     IssueDetailSerializer,
     CommentSerializer,
+    SearchHitSerializer,
 )
 
 
-class JWTViewSet(viewsets.ModelViewSet):
+class JWTViewSet(
+    SparseQuerysetMixin, ResponseCacheMixin, viewsets.ModelViewSet
+):
     """Classe de base pour tous les ViewSets nécessitant une authentification JWT.
     
     Cette classe implémente la vérification commune d'authentification JWT
     pour éviter la duplication de code à travers les différents ViewSets.
+    Les listes et détails répondent aux requêtes conditionnelles
+    (If-None-Match / If-Modified-Since) par un 304, et les actions listées
+    dans ``cached_actions`` sont servies depuis le cache par utilisateur.
+    Avec ``?fields=`` ou ``?omit=``, les colonnes des champs écartés ne
+    sont pas lues (voir ``projects.fieldsets``).
     """
     
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [CachedJWTAuthentication]
     
     def initial(self, request, *args, **kwargs):
         """Vérifie l'authentification JWT avant de traiter la requête."""
@@ -62,17 +94,41 @@ class ProjectViewSet(JWTViewSet):
     seuls les utilisateurs authentifiés peuvent accéder et modifier les projets
     auxquels ils contribuent.
 
+    Il expose aussi la recherche plein texte dans les problèmes et
+    commentaires: ``/projects/search/`` (tous les projets de l'utilisateur)
+    et ``/projects/{id}/search/`` (un seul projet), ainsi que l'export
+    NDJSON d'un projet: ``/projects/{id}/export/``, et son pendant en
+    import: ``/projects/{id}/import/``.
+
     Attributes:
         permission_classes: Nécessite une authentification
     """
 
     permission_classes = [IsAuthenticated]
+    cached_actions = ("list", "retrieve")
 
     def get_queryset(self):
-        """Obtient les projets où l'utilisateur est contributeur."""
+        """Obtient les projets où l'utilisateur est contributeur.
+
+        Pour le détail, l'auteur et les contributeurs (avec leur utilisateur)
+        sont chargés en un nombre constant de requêtes, quel que soit le
+        nombre de contributeurs du projet, sauf s'ils sont écartés de la
+        réponse (``?fields=`` / ``?omit=``).
+        """
         if not self.request.user.is_authenticated:
             return Project.objects.none()
-        return Project.objects.filter(contributors__user=self.request.user)
+        queryset = Project.objects.filter(contributors__user=self.request.user)
+        if self.action == "retrieve":
+            if self.keeps_field("author"):
+                queryset = queryset.select_related("author")
+            if self.keeps_field("contributors"):
+                queryset = queryset.prefetch_related(
+                    Prefetch(
+                        "contributors",
+                        queryset=Contributor.objects.select_related("user"),
+                    )
+                )
+        return queryset
 
     def get_serializer_class(self):
         """Retourne le sérialiseur approprié selon l'action."""
@@ -87,6 +143,143 @@ class ProjectViewSet(JWTViewSet):
             user=self.request.user, project=project, role="AUTHOR"
         )
 
+    @action(detail=True, methods=["get"])
+    def search(self, request, pk=None):
+        """Recherche plein texte dans les problèmes et commentaires du projet.
+
+        Paramètres: ``q`` (termes recherchés), ``page`` et ``page_size``.
+        """
+        project = self.get_object()
+        return self.search_response(request, [project.pk])
+
+    @action(detail=True, methods=["get"])
+    def export(self, request, pk=None):
+        """Exporte les problèmes et commentaires du projet en NDJSON.
+
+        La réponse est produite au fil de l'eau, et limitée aux données
+        créées ou modifiées depuis ``since`` (date ISO 8601) si ce
+        paramètre est fourni. Comme toute réponse de l'API, elle est
+        compressée selon ``Accept-Encoding`` par
+        ``projects.compression.CompressionMiddleware``.
+        """
+        project = self.get_object()
+        since = request.query_params.get("since")
+        if since is not None:
+            since = IssueFilterBackend().parse_time("since", since)
+
+        response = StreamingHttpResponse(
+            buffered(export_ndjson(project, since)),
+            content_type="application/x-ndjson; charset=utf-8",
+        )
+        response["Content-Disposition"] = (
+            f'attachment; filename="project-{project.pk}.ndjson"'
+        )
+        return response
+
+    @action(
+        detail=True,
+        methods=["post"],
+        url_path="import",
+        parser_classes=[MultiPartParser],
+    )
+    def import_issues(self, request, pk=None):
+        """Importe un fichier NDJSON ou CSV de problèmes et commentaires.
+
+        Le fichier est envoyé dans le champ ``file`` d'un formulaire
+        multipart; son format est déduit de son nom, ou donné par le champ
+        ``format``. Voir ``projects.importer`` pour les colonnes attendues.
+        L'utilisateur qui envoie le fichier est l'auteur de tout ce qui est
+        importé; les personnes assignées doivent contribuer au projet.
+
+        Returns:
+            Rapport d'import, avec le statut 201 si tout est importé, 207
+            si une partie des lignes est refusée, 400 si aucune ne l'est
+        """
+        project = self.get_object()
+        upload = request.FILES.get("file")
+        if upload is None:
+            raise ValidationError({"file": "Aucun fichier n'a été soumis."})
+        file_format = request.data.get("format") or guess_format(upload.name)
+        if file_format not in FORMATS:
+            raise ValidationError({"format": "Format inconnu."})
+
+        if not is_utf8(upload.file):
+            raise ValidationError(
+                {"file": "Le fichier doit être encodé en UTF-8."}
+            )
+        stream = io.TextIOWrapper(upload.file, encoding="utf-8", newline="")
+        importer = IssueImporter(project, author=request.user)
+        report = importer.run(read_records(stream, file_format))
+
+        if not report["issues"] + report["comments"]:
+            response_status = status.HTTP_400_BAD_REQUEST
+        elif report["error_count"]:
+            response_status = status.HTTP_207_MULTI_STATUS
+        else:
+            response_status = status.HTTP_201_CREATED
+        return Response(report, status=response_status)
+
+    @action(
+        detail=False,
+        methods=["get"],
+        url_path="search",
+        url_name="search-all",
+    )
+    def search_all(self, request):
+        """Recherche plein texte dans tous les projets de l'utilisateur."""
+        project_ids = Contributor.objects.filter(
+            user=request.user
+        ).values_list("project_id", flat=True)
+        return self.search_response(request, project_ids)
+
+    def search_response(self, request, project_ids):
+        """Exécute la recherche et construit la réponse paginée.
+
+        Un résultat de plus que la taille de page est demandé pour savoir
+        s'il existe une page suivante, sans compter tous les résultats.
+
+        Raises:
+            ValidationError: Si la requête ne contient aucun terme
+        """
+        query = request.query_params.get("q", "")
+        if not parse_terms(query):
+            raise ValidationError({"q": "Au moins un terme est requis."})
+
+        paginator = KeysetPagination()
+        page_size = paginator.get_page_size(request)
+        try:
+            page = max(1, int(request.query_params.get("page", 1)))
+        except ValueError:
+            page = 1
+
+        hits = search(
+            query,
+            project_ids,
+            offset=(page - 1) * page_size,
+            limit=page_size + 1,
+        )
+        url = request.build_absolute_uri()
+        next_link = None
+        if len(hits) > page_size:
+            next_link = replace_query_param(url, "page", page + 1)
+        previous_link = None
+        if page > 2:
+            previous_link = replace_query_param(url, "page", page - 1)
+        elif page == 2:
+            previous_link = remove_query_param(url, "page")
+
+        return Response(
+            {
+                "next": next_link,
+                "previous": previous_link,
+                "results": SearchHitSerializer(
+                    hits[:page_size],
+                    many=True,
+                    context=self.get_serializer_context(),
+                ).data,
+            }
+        )
+
 
 class ContributorViewSet(JWTViewSet):
     """ViewSet pour gérer les contributeurs des projets.
@@ -99,6 +292,9 @@ class ContributorViewSet(JWTViewSet):
     """
 
     permission_classes = [IsAuthenticated, IsProjectContributor]
+    pagination_class = KeysetPagination
+    cached_actions = ("list",)
+    sparse_required_fields = ("project",)
 
     def get_serializer_class(self):
         """Retourne le sérialiseur approprié selon l'action."""
@@ -107,15 +303,20 @@ class ContributorViewSet(JWTViewSet):
         return ContributorSerializer
 
     def get_queryset(self):
-        """Obtient tous les contributeurs pour un projet spécifique."""
-        return Contributor.objects.filter(project_id=self.kwargs["project_pk"])
+        """Obtient tous les contributeurs pour un projet spécifique.
+
+        L'utilisateur est joint car il est imbriqué dans la réponse.
+        """
+        return Contributor.objects.filter(
+            project_id=self.kwargs["project_pk"]
+        ).select_related("user")
 
     def perform_create(self, serializer):
         """Ajoute un nouveau contributeur au projet."""
         project = get_object_or_404(Project, pk=self.kwargs["project_pk"])
 
         # Vérifier si l'utilisateur actuel est autorisé à ajouter des contributeurs
-        if not project.contributors.filter(user=self.request.user).exists():
+        if not is_project_member(self.request, project.pk):
             return Response(
                 {
                     "detail": "Vous n'êtes pas autorisé à ajouter des contributeurs à ce projet."
@@ -175,10 +376,15 @@ class IssueViewSet(JWTViewSet):
 
     Gère la création, la mise à jour et la liste des problèmes pour un projet spécifique.
     Seuls les contributeurs du projet peuvent créer des problèmes, et seuls les auteurs
-    peuvent les modifier.
+    peuvent les modifier. Un POST dont le corps est une liste crée tous les
+    problèmes de la liste en une seule transaction, et l'action ``batch``
+    modifie le statut, la priorité ou l'assigné de plusieurs problèmes à la
+    fois.
 
     Attributes:
         permission_classes: Nécessite authentification, accès au projet et propriété
+        filter_backends: Filtres (statut, priorité, tag, assigné, auteur,
+            dates de création) et tri de la liste
     """
 
     permission_classes = [
@@ -186,15 +392,36 @@ class IssueViewSet(JWTViewSet):
         IsProjectContributor,
         IsAuthorOrReadOnly,
     ]
+    pagination_class = KeysetPagination
+    filter_backends = [IssueFilterBackend, IssueOrderingFilter]
+    cached_actions = ("list", "retrieve")
+    sparse_required_fields = ("project",)
 
     def get_queryset(self):
-        """Obtient tous les problèmes pour un projet spécifique."""
-        return Issue.objects.filter(project_id=self.kwargs["project_pk"])
+        """Obtient tous les problèmes pour un projet spécifique.
+
+        La liste n'expose que des clés étrangères et ne nécessite aucune
+        jointure. Le détail joint l'auteur et l'assigné s'ils figurent dans
+        la réponse; ses commentaires sont chargés par IssueDetailSerializer
+        en une requête bornée.
+        """
+        queryset = Issue.objects.filter(project_id=self.kwargs["project_pk"])
+        if self.action == "retrieve":
+            queryset = queryset.select_related(
+                *(
+                    name
+                    for name in ("author", "assignee")
+                    if self.keeps_field(name)
+                )
+            )
+        return queryset
 
     def get_serializer_class(self):
         """Retourne le sérialiseur approprié selon l'action."""
         if self.action == "retrieve":
             return IssueDetailSerializer
+        if self.action == "batch_update":
+            return IssueBatchUpdateSerializer
         return IssueListSerializer
 
     def perform_create(self, serializer):
@@ -202,6 +429,90 @@ class IssueViewSet(JWTViewSet):
         project = get_object_or_404(Project, pk=self.kwargs["project_pk"])
         serializer.save(project=project, author=self.request.user)
 
+    def create(self, request, *args, **kwargs):
+        """Crée un problème, ou plusieurs si le corps est une liste."""
+        if isinstance(request.data, list):
+            return self.bulk_create(request)
+        return super().create(request, *args, **kwargs)
+
+    def bulk_create(self, request):
+        """Crée une liste de problèmes en une seule transaction.
+
+        Chaque élément est validé par IssueListSerializer; les éléments
+        valides sont insérés par ``bulk_create`` et les autres sont
+        signalés avec leurs erreurs, à leur position dans la liste.
+
+        Returns:
+            Réponse 201 si tout est créé, 207 si une partie seulement l'est,
+            400 si aucun élément n'est valide
+        """
+        serializer = IssueListSerializer(
+            data=request.data,
+            many=True,
+            allow_empty=False,
+            max_length=getattr(settings, "ISSUE_BULK_CREATE_MAX_ITEMS", 10000),
+            context=self.get_serializer_context(),
+        )
+        serializer.is_valid(raise_exception=True)
+        project = get_object_or_404(Project, pk=self.kwargs["project_pk"])
+
+        valid = [
+            (index, data)
+            for index, data in enumerate(serializer.validated_data)
+            if data is not None
+        ]
+        created = create_issues(
+            [
+                Issue(**data, project=project, author=request.user)
+                for _, data in valid
+            ]
+        )
+
+        results = [
+            {"index": index, "status": 400, "errors": errors}
+            for index, errors in enumerate(serializer.item_errors)
+            if errors
+        ]
+        results += [
+            {"index": index, "status": 201, "id": issue.pk}
+            for (index, _), issue in zip(valid, created)
+        ]
+        results.sort(key=lambda result: result["index"])
+
+        failed = len(results) - len(created)
+        if not created:
+            response_status = status.HTTP_400_BAD_REQUEST
+        elif failed:
+            response_status = status.HTTP_207_MULTI_STATUS
+        else:
+            response_status = status.HTTP_201_CREATED
+        return Response(
+            {"created": len(created), "failed": failed, "results": results},
+            status=response_status,
+        )
+
+    @action(detail=False, methods=["patch"], url_path="batch")
+    def batch_update(self, request, project_pk=None):
+        """Modifie plusieurs problèmes du projet en une seule requête.
+
+        Seuls les problèmes dont l'utilisateur est l'auteur sont modifiés;
+        l'autorisation est vérifiée pour tout le lot en une requête, comme
+        le ferait IsAuthorOrReadOnly pour chaque problème.
+
+        Returns:
+            Réponse contenant les identifiants modifiés (``updated``) et
+            les problèmes refusés avec leur motif (``rejected``)
+        """
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        updated, rejected = update_issues(
+            project_pk,
+            request.user,
+            serializer.validated_data["ids"],
+            serializer.changes,
+        )
+        return Response({"updated": updated, "rejected": rejected})
+
 
 class CommentViewSet(JWTViewSet):
     """ViewSet pour gérer les commentaires sur les problèmes.
@@ -220,13 +531,25 @@ class CommentViewSet(JWTViewSet):
         IsAuthorOrReadOnly,
     ]
     serializer_class = CommentSerializer
+    pagination_class = KeysetPagination
+    cached_actions = ("list",)
 
     def get_queryset(self):
-        """Obtient tous les commentaires pour un problème spécifique."""
-        return Comment.objects.filter(
+        """Obtient tous les commentaires pour un problème spécifique.
+
+        L'auteur est imbriqué dans la réponse et joint s'il y figure; le
+        problème ne l'est que pour les actions sur un objet, où il sert à
+        la vérification des permissions.
+        """
+        queryset = Comment.objects.filter(
             issue__project_id=self.kwargs["project_pk"],
             issue_id=self.kwargs["issue_pk"],
         )
+        if self.keeps_field("author"):
+            queryset = queryset.select_related("author")
+        if self.action != "list":
+            queryset = queryset.select_related("issue")
+        return queryset
 
     def perform_create(self, serializer):
         """Crée un nouveau commentaire sur un problème."""
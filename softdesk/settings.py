@@ -10,6 +10,8 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.0/ref/settings/
 """
 
+import os
+from importlib.util import find_spec
 from pathlib import Path
 from datetime import timedelta
 
@@ -47,30 +49,63 @@ INSTALLED_APPS = [
     "projects",
 ]
 
-# Cache configuration
+# Cache configuration (cache en mémoire locale dont les lectures réussies
+# et manquées alimentent les métriques de /metrics)
 CACHES = {
     "default": {
-        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "BACKEND": "projects.metrics.MetricsLocMemCache",
         "LOCATION": "unique-snowflake",
     }
 }
 
-# Cache middleware
+# Durée de mémorisation de l'appartenance aux projets (secondes). Avec un
+# cache local au processus, un retrait de contributeur n'est propagé aux
+# autres workers qu'à l'expiration de cette durée.
+PROJECT_MEMBERSHIP_CACHE_TIMEOUT = 60
+
 MIDDLEWARE = [
+    "projects.middleware.RequestTimingMiddleware",
+    "projects.compression.CompressionMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
-    "django.middleware.cache.UpdateCacheMiddleware",
     "django.middleware.common.CommonMiddleware",
-    "django.middleware.cache.FetchFromCacheMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "projects.replicas.ReplicaRoutingMiddleware",
 ]
 
-# Cache settings
-CACHE_MIDDLEWARE_SECONDS = 300  # 5 minutes
-CACHE_MIDDLEWARE_KEY_PREFIX = "softdesk"
+# Mesure des requêtes (projects.middleware): proportion des requêtes
+# mesurées et journalisées, et ajout de l'en-tête Server-Timing
+REQUEST_TIMING_SAMPLE_RATE = float(
+    os.environ.get("REQUEST_TIMING_SAMPLE_RATE", 1.0)
+)
+REQUEST_TIMING_HEADER = os.environ.get("REQUEST_TIMING_HEADER", "1") == "1"
+
+# Métriques Prometheus publiées par /metrics (projects.metrics). Avec
+# plusieurs processus, METRICS_DIR désigne un dossier partagé où chacun
+# écrit ses valeurs; METRICS_TOKEN, s'il est défini, protège l'endpoint
+# (en-tête Authorization: Bearer <jeton>)
+METRICS_ENABLED = os.environ.get("METRICS_ENABLED", "1") == "1"
+METRICS_DIR = os.environ.get("METRICS_DIR") or None
+METRICS_FLUSH_INTERVAL = float(os.environ.get("METRICS_FLUSH_INTERVAL", 1.0))
+METRICS_TOKEN = os.environ.get("METRICS_TOKEN", "")
+
+# Cache des réponses de l'API (projects.caching), activé par action via
+# l'attribut cached_actions des ViewSets. Les clés dépendent de
+# l'utilisateur et de la version du projet: une écriture n'a pas besoin
+# d'invalider les entrées existantes, qui expirent après ce délai.
+API_RESPONSE_CACHE_TIMEOUT = 300  # 5 minutes
+
+# Compression des réponses de l'API (projects.compression): codages
+# proposés, par ordre de préférence (br et zstd si brotli et zstandard
+# sont installés), niveau de chaque codage et taille minimale compressée,
+# en octets. Les corps compressés des réponses JSON sont gardés en cache
+# API_RESPONSE_CACHE_TIMEOUT secondes.
+COMPRESSION_ENCODINGS = ("zstd", "br", "gzip")
+COMPRESSION_LEVELS = {"gzip": 6, "br": 5, "zstd": 3}
+COMPRESSION_MIN_SIZE = int(os.environ.get("COMPRESSION_MIN_SIZE", 1024))
 
 ROOT_URLCONF = "softdesk.urls"
 
@@ -96,13 +131,54 @@ WSGI_APPLICATION = "softdesk.wsgi.application"
 # Database
 # https://docs.djangoproject.com/en/5.0/ref/settings/#databases
 
+# Les connexions sont conservées CONN_MAX_AGE secondes entre les requêtes
+# (0 pour une connexion par requête) et vérifiées avant réutilisation.
+# Chaque réglage peut être remplacé par la variable d'environnement du
+# même nom.
 DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db.sqlite3",
+        "NAME": os.environ.get("SQLITE_PATH", BASE_DIR / "db.sqlite3"),
+        "CONN_MAX_AGE": int(os.environ.get("DB_CONN_MAX_AGE", 600)),
+        "CONN_HEALTH_CHECKS": (
+            os.environ.get("DB_CONN_HEALTH_CHECKS", "1") == "1"
+        ),
     }
 }
 
+# Répliques en lecture (projects.replicas): chemins des fichiers SQLite,
+# séparés par des virgules, dans DB_REPLICAS. Elles servent les lectures
+# des requêtes GET des applications projects et users, sauf pendant
+# REPLICA_PIN_SECONDS secondes après une écriture de l'utilisateur.
+REPLICA_DATABASES = []
+for index, path in enumerate(
+    filter(None, os.environ.get("DB_REPLICAS", "").split(",")), start=1
+):
+    alias = f"replica{index}"
+    DATABASES[alias] = {
+        **DATABASES["default"],
+        "NAME": path.strip(),
+        "TEST": {"MIRROR": "default"},
+    }
+    REPLICA_DATABASES.append(alias)
+
+DATABASE_ROUTERS = ["projects.replicas.ReplicaRouter"]
+REPLICA_PIN_SECONDS = int(os.environ.get("REPLICA_PIN_SECONDS", 5))
+
+# Pragmas appliqués à chaque nouvelle connexion SQLite, dans cet ordre
+# (projects.sqlite): attente de 5 s sur un verrou, journal WAL,
+# synchronisation allégée, 256 Mio projetés en mémoire, 64 Mio de cache
+# de pages (valeur négative: en Kio) et récupération incrémentale des
+# pages libres
+SQLITE_PRAGMAS = {
+    "busy_timeout": int(os.environ.get("SQLITE_BUSY_TIMEOUT", 5000)),
+    "auto_vacuum": os.environ.get("SQLITE_AUTO_VACUUM", "incremental"),
+    "journal_mode": os.environ.get("SQLITE_JOURNAL_MODE", "wal"),
+    "synchronous": os.environ.get("SQLITE_SYNCHRONOUS", "normal"),
+    "mmap_size": int(os.environ.get("SQLITE_MMAP_SIZE", 268435456)),
+    "cache_size": int(os.environ.get("SQLITE_CACHE_SIZE", -65536)),
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
@@ -161,7 +237,7 @@ AUTH_USER_MODEL = "users.User"
 # REST Framework settings
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "users.authentication.CachedJWTAuthentication",
     ],
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.IsAuthenticated",
@@ -171,8 +247,49 @@ REST_FRAMEWORK = {
     "EXCEPTION_HANDLER": "projects.exceptions.custom_exception_handler",
     "UNAUTHENTICATED_USER": None,
     "NON_FIELD_ERRORS_KEY": "error",
+    # JSON encodé et décodé par orjson s'il est installé, par la
+    # bibliothèque standard sinon
+    "DEFAULT_RENDERER_CLASSES": [
+        "projects.renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "projects.renderers.FastJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
 }
 
+# MessagePack (application/msgpack) proposé aux clients si la
+# bibliothèque msgpack est installée
+if find_spec("msgpack") is not None:
+    REST_FRAMEWORK["DEFAULT_RENDERER_CLASSES"].append(
+        "projects.renderers.MessagePackRenderer"
+    )
+    REST_FRAMEWORK["DEFAULT_PARSER_CLASSES"].append(
+        "projects.renderers.MessagePackParser"
+    )
+
+# Taille de page maximale acceptée par la pagination par curseur
+# (problèmes, commentaires, contributeurs) via ?page_size=
+CURSOR_PAGINATION_MAX_PAGE_SIZE = 100
+
+# Nombre de commentaires intégrés au détail d'un problème (?comments=N)
+ISSUE_EMBEDDED_COMMENTS_LIMIT = 10
+ISSUE_EMBEDDED_COMMENTS_MAX_LIMIT = 100
+
+# Écritures en masse: nombre maximal de problèmes par POST d'une liste et
+# par modification groupée, et nombre de lignes par INSERT
+ISSUE_BULK_CREATE_MAX_ITEMS = 10000
+ISSUE_BATCH_UPDATE_MAX_ITEMS = 1000
+BULK_INSERT_BATCH_SIZE = 500
+
+# Export NDJSON: nombre de lignes lues par aller-retour avec la base
+EXPORT_CHUNK_SIZE = 2000
+
+# Import NDJSON/CSV: nombre de lignes validées et écrites par transaction
+IMPORT_BATCH_SIZE = 2000
+
 # JWT settings
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(days=1),
@@ -186,6 +303,17 @@ SIMPLE_JWT = {
     "TOKEN_TYPE_CLAIM": "token_type",
 }
 
+# Cache des utilisateurs authentifiés par jeton JWT: nombre d'utilisateurs
+# gardés en mémoire par processus, et durée de vie en secondes. Avec le
+# cache local au processus configuré par défaut (CACHES, LocMemCache), la
+# modification, la désactivation ou la suppression d'un utilisateur n'est
+# propagée aux autres workers qu'à l'expiration de cette durée: un jeton
+# d'un compte supprimé y reste accepté jusque-là. Avec plusieurs workers,
+# configurez un cache partagé (Redis, Memcached); `manage.py check
+# --deploy` le signale (users.W001).
+AUTH_USER_CACHE_SIZE = 1024
+AUTH_USER_CACHE_TIMEOUT = 30
+
 # Logging configuration
 LOGGING = {
     "version": 1,
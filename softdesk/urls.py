@@ -24,6 +24,8 @@ from rest_framework_simplejwt.views import (
     TokenObtainPairView,
 )
 
+from projects.metrics import metrics_view
+
 # Configuration de la documentation de l'API avec Swagger/OpenAPI
 schema_view = get_schema_view(
     openapi.Info(
@@ -47,9 +49,14 @@ urlpatterns = [
     ),
     # URLs de l'API
     path("api/", include("projects.urls")),  # Routes de gestion de projets
+    path(
+        "api/async/", include("projects.async_urls")
+    ),  # Lectures asynchrones (ASGI) des projets
     path(
         "api/auth/", include("users.urls")
     ),  # Routes d'authentification et utilisateurs
+    # Métriques Prometheus
+    path("metrics", metrics_view, name="metrics"),
     # Documentation API
     path(
         "swagger<format>/",
@@ -0,0 +1,23 @@
+"""Configuration de l'application des utilisateurs."""
+
+from django.apps import AppConfig
+
+
+class UsersConfig(AppConfig):
+    """Configuration de l'application users.
+
+    Connecte les signaux de l'application au démarrage, et enregistre la
+    vérification du cache des utilisateurs authentifiés (``check --deploy``).
+    """
+
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "users"
+
+    def ready(self):
+        """Importe les signaux pour enregistrer leurs récepteurs."""
+        from django.core import checks
+
+        from . import signals  # noqa: F401
+        from .authentication import check_shared_cache
+
+        checks.register(check_shared_cache, checks.Tags.caches, deploy=True)
@@ -0,0 +1,284 @@
+"""Authentification JWT avec mise en cache des utilisateurs.
+
+Le jeton JWT est vérifié par signature, sans accès à la base; seul le
+chargement de l'utilisateur désigné par le jeton en demande un. Ce module
+le remplace par un cache à deux niveaux:
+- un cache LRU borné propre au processus, sans aller-retour réseau
+- le cache Django partagé, pour les autres processus
+
+Les entrées sont indexées par identifiant d'utilisateur et par version, et
+expirent après ``AUTH_USER_CACHE_TIMEOUT`` secondes. La version d'un
+utilisateur, conservée dans le cache Django, change à chaque modification
+ou suppression de son compte (``invalidate_user``, appelée par les signaux
+de ``users.signals``): les entrées précédentes deviennent inaccessibles,
+sans avoir à les supprimer une à une. Avec un cache partagé (Redis,
+Memcached), l'invalidation atteint tous les processus à la fois; avec le
+cache en mémoire locale configuré par défaut, elle ne touche que le
+processus qui modifie l'utilisateur, et les autres le gardent jusqu'à
+l'expiration de l'entrée. ``check_shared_cache``, exécutée par ``manage.py
+check --deploy``, signale ce cas. Les utilisateurs mis en cache sont lus
+sur la base principale, jamais sur une réplique en retard.
+"""
+
+import copy
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core import checks
+from django.core.cache import cache, caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import router
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import (
+    AuthenticationFailed,
+    InvalidToken,
+)
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+
+def user_version_key(user_id):
+    """Clé de la version d'un utilisateur dans le cache partagé."""
+    return f"auth:user-version:{user_id}"
+
+
+def user_cache_key(user_id, version):
+    """Clé d'un utilisateur, pour une version donnée, dans le cache partagé."""
+    return f"auth:user:{user_id}:{version}"
+
+
+def get_user_version(user_id):
+    """Retourne la version courante d'un utilisateur.
+
+    Une version absente (première requête, éviction) est remplacée par une
+    valeur aléatoire: elle ne peut pas coïncider avec une version
+    antérieure encore présente dans un cache.
+    """
+    key = user_version_key(user_id)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, uuid.uuid4().hex, None)
+        version = cache.get(key)
+    return version
+
+
+def invalidate_user(user_id):
+    """Invalide l'utilisateur en cache.
+
+    Tous les processus sont concernés si le cache Django est partagé;
+    sinon, seul le processus courant l'est.
+    """
+    cache.set(user_version_key(user_id), uuid.uuid4().hex, None)
+
+
+def check_shared_cache(app_configs, **kwargs):
+    """Signale un cache Django propre à chaque processus.
+
+    Avec ``LocMemCache``, un compte modifié, désactivé ou supprimé reste
+    accepté par les autres workers jusqu'à ``AUTH_USER_CACHE_TIMEOUT``.
+
+    Returns:
+        Liste des avertissements (vide si le cache est partagé)
+    """
+    if not isinstance(caches["default"], LocMemCache):
+        return []
+    return [
+        checks.Warning(
+            "Le cache Django par défaut est propre à chaque processus: "
+            "l'invalidation des utilisateurs authentifiés par jeton "
+            "n'atteint pas les autres workers.",
+            hint=(
+                "Configurez un cache partagé (Redis, Memcached) dans "
+                "CACHES, ou réduisez AUTH_USER_CACHE_TIMEOUT."
+            ),
+            id="users.W001",
+        )
+    ]
+
+
+class LRUCache:
+    """Cache borné, en mémoire, qui évince les entrées les moins utilisées.
+
+    Attributes:
+        max_size: Nombre maximal d'entrées
+        timeout: Durée de vie d'une entrée, en secondes
+    """
+
+    def __init__(self, max_size, timeout):
+        self.max_size = max_size
+        self.timeout = timeout
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        """Retourne la valeur associée à ``key``, ou None si expirée."""
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires < time.monotonic():
+                del self.entries[key]
+                return None
+            self.entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        """Associe ``value`` à ``key``, en évinçant la plus ancienne entrée."""
+        with self.lock:
+            self.entries[key] = (time.monotonic() + self.timeout, value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+    def clear(self):
+        """Vide le cache."""
+        with self.lock:
+            self.entries.clear()
+
+
+def get_user_cache_timeout():
+    """Durée de vie d'un utilisateur en cache, en secondes."""
+    return getattr(settings, "AUTH_USER_CACHE_TIMEOUT", 30)
+
+
+local_users = LRUCache(
+    getattr(settings, "AUTH_USER_CACHE_SIZE", 1024),
+    get_user_cache_timeout(),
+)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """Authentification JWT qui charge l'utilisateur depuis le cache.
+
+    Les vérifications de JWTAuthentication (compte actif, révocation du
+    jeton au changement de mot de passe) sont appliquées à l'utilisateur
+    en cache comme à un utilisateur lu en base.
+    """
+
+    def get_user(self, validated_token):
+        """Retourne l'utilisateur désigné par un jeton déjà vérifié.
+
+        Raises:
+            InvalidToken: Si le jeton ne désigne aucun utilisateur
+            AuthenticationFailed: Si l'utilisateur n'existe pas, est
+                inactif ou a changé de mot de passe
+        """
+        user = self.get_cached_user(self.get_user_id(validated_token))
+        return self.check_user(validated_token, user)
+
+    async def aauthenticate(self, request):
+        """Variante asynchrone de ``authenticate``, pour les vues async.
+
+        Returns:
+            Tuple (utilisateur, jeton validé), ou None si la requête ne
+            porte pas de jeton
+        """
+        header = self.get_header(request)
+        if header is None:
+            return None
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+        validated_token = self.get_validated_token(raw_token)
+        return await self.aget_user(validated_token), validated_token
+
+    async def aget_user(self, validated_token):
+        """Variante asynchrone de ``get_user``."""
+        user_id = self.get_user_id(validated_token)
+        user = await self.aget_cached_user(user_id)
+        return self.check_user(validated_token, user)
+
+    def get_user_id(self, validated_token):
+        """Retourne l'identifiant d'utilisateur porté par le jeton."""
+        try:
+            return validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(
+                _("Token contained no recognizable user identification")
+            )
+
+    def check_user(self, validated_token, user):
+        """Applique au compte les vérifications de JWTAuthentication.
+
+        Returns:
+            Une copie de l'utilisateur en cache: la requête peut la
+            modifier sans toucher à l'instance partagée du processus
+        """
+        if user is None:
+            raise AuthenticationFailed(
+                _("User not found"), code="user_not_found"
+            )
+
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(
+                _("User is inactive"), code="user_inactive"
+            )
+
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(
+                api_settings.REVOKE_TOKEN_CLAIM
+            ) != get_md5_hash_password(user.password):
+                raise AuthenticationFailed(
+                    _("The user's password has been changed."),
+                    code="password_changed",
+                )
+
+        return copy.copy(user)
+
+    def get_user_queryset(self, user_id):
+        """Requête de l'utilisateur à mettre en cache, sur la base principale.
+
+        Un utilisateur lu sur une réplique en retard resterait en cache
+        dans son état périmé jusqu'à l'expiration de l'entrée.
+        """
+        return self.user_model.objects.using(
+            router.db_for_write(self.user_model)
+        ).filter(**{api_settings.USER_ID_FIELD: user_id})
+
+    def get_cached_user(self, user_id):
+        """Charge un utilisateur depuis le cache local, partagé, ou la base.
+
+        Returns:
+            L'utilisateur, ou None s'il n'existe pas
+        """
+        version = get_user_version(user_id)
+        local_key = (user_id, version)
+        user = local_users.get(local_key)
+        if user is not None:
+            return user
+
+        shared_key = user_cache_key(user_id, version)
+        user = cache.get(shared_key)
+        if user is None:
+            user = self.get_user_queryset(user_id).first()
+            if user is None:
+                return None
+            cache.set(shared_key, user, get_user_cache_timeout())
+        local_users.set(local_key, user)
+        return user
+
+    async def aget_cached_user(self, user_id):
+        """Variante asynchrone de ``get_cached_user``."""
+        version = await cache.aget(user_version_key(user_id))
+        if version is None:
+            await cache.aadd(user_version_key(user_id), uuid.uuid4().hex, None)
+            version = await cache.aget(user_version_key(user_id))
+        local_key = (user_id, version)
+        user = local_users.get(local_key)
+        if user is not None:
+            return user
+
+        shared_key = user_cache_key(user_id, version)
+        user = await cache.aget(shared_key)
+        if user is None:
+            user = await self.get_user_queryset(user_id).afirst()
+            if user is None:
+                return None
+            await cache.aset(shared_key, user, get_user_cache_timeout())
+        local_users.set(local_key, user)
+        return user
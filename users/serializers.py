@@ -4,6 +4,7 @@ from django.contrib.auth.password_validation import validate_password
 from rest_framework import serializers
 from rest_framework.validators import UniqueValidator
 
+from projects.fieldsets import SparseFieldsetMixin
 from .models import User
 
 
@@ -93,11 +94,12 @@ class RegisterSerializer(serializers.ModelSerializer):
         return user
 
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Sérialiseur pour le modèle utilisateur.
 
     Utilisé pour la visualisation et la mise à jour des données utilisateur
-    après l'inscription initiale.
+    après l'inscription initiale. En lecture, ``?fields=`` et ``?omit=``
+    en restreignent les champs (voir ``projects.fieldsets``).
     """
 
     class Meta:
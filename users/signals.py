@@ -0,0 +1,22 @@
+"""Signaux de l'application des utilisateurs.
+
+Toute modification ou suppression d'un utilisateur, quelle qu'en soit
+l'origine (API, administration, shell), invalide son entrée dans le cache
+d'authentification (voir ``users.authentication``). Un ``QuerySet.update()``
+ne passe pas par les signaux: il doit appeler ``invalidate_user`` pour
+chaque utilisateur modifié.
+"""
+
+from django.conf import settings
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .authentication import invalidate_user
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL)
+def invalidate_cached_user(sender, instance, created=False, **kwargs):
+    """Invalide l'utilisateur en cache après sa modification."""
+    if not created:
+        invalidate_user(instance.pk)
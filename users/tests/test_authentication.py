@@ -0,0 +1,103 @@
+"""Authentification JWT par utilisateur en cache (``users.authentication``)."""
+
+import logging
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import SimpleTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient, APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
+
+from users.authentication import check_shared_cache, local_users
+from users.models import User
+
+ACCOUNT_URL = "/api/auth/account/"
+
+
+class CachedJWTAuthenticationTests(APITestCase):
+    """Utilisateurs mis en cache, et invalidés par les signaux du modèle."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Coupe les journaux de chaque requête pendant les tests."""
+        super().setUpClass()
+        logging.disable(logging.INFO)
+        cls.addClassCleanup(logging.disable, logging.NOTSET)
+
+    def setUp(self):
+        """Vide les caches et authentifie un utilisateur."""
+        cache.clear()
+        local_users.clear()
+        self.user = User.objects.create_user(
+            username="alice", password="Password123", age=30
+        )
+        self.client = APIClient()
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(self.user)}"
+        )
+
+    def user_reads(self):
+        """Appelle la route du compte et compte les lectures du compte."""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(ACCOUNT_URL)
+        reads = [
+            query
+            for query in queries
+            if query["sql"].startswith('SELECT "users_user"')
+        ]
+        return response, len(reads)
+
+    def test_user_is_cached(self):
+        """L'utilisateur n'est lu en base qu'à la première requête."""
+        response, reads = self.user_reads()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(reads, 1)
+        response, reads = self.user_reads()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(reads, 0)
+
+    def test_save_invalidates_user(self):
+        """Un compte désactivé est refusé dès la requête suivante."""
+        self.user_reads()
+        self.user.is_active = False
+        self.user.save()
+        response, _ = self.user_reads()
+        self.assertEqual(response.status_code, 401)
+
+    def test_delete_invalidates_user(self):
+        """Un compte supprimé est refusé dès la requête suivante."""
+        self.user_reads()
+        self.user.delete()
+        response, _ = self.user_reads()
+        self.assertEqual(response.status_code, 401)
+
+    def test_cached_user_is_a_copy(self):
+        """Modifier l'utilisateur d'une requête ne touche pas au cache."""
+        self.user_reads()
+        cached = next(iter(local_users.entries.values()))[1]
+        response = self.client.patch(
+            ACCOUNT_URL, {"first_name": "Alice"}, format="json"
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(cached.first_name, "")
+
+
+class SharedCacheCheckTests(SimpleTestCase):
+    """Vérification ``users.W001`` de ``check --deploy``."""
+
+    def test_local_cache_warns(self):
+        """Un cache propre au processus est signalé."""
+        warnings = check_shared_cache(None)
+        self.assertEqual([warning.id for warning in warnings], ["users.W001"])
+
+    @override_settings(
+        CACHES={
+            "default": {
+                "BACKEND": "django.core.cache.backends.dummy.DummyCache"
+            }
+        }
+    )
+    def test_other_cache_does_not_warn(self):
+        """Un autre cache n'est pas signalé."""
+        self.assertEqual(check_shared_cache(None), [])
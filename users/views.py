@@ -3,8 +3,8 @@
 from rest_framework import generics, status
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
-from rest_framework_simplejwt.authentication import JWTAuthentication
 
+from .authentication import CachedJWTAuthentication
 from .models import User
 from .serializers import RegisterSerializer, UserSerializer
 
@@ -61,7 +61,7 @@ class UserDetailView(generics.RetrieveUpdateDestroyAPIView):
     ou supprimer son propre compte. L'authentification JWT est requise.
     """
 
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [CachedJWTAuthentication]
     permission_classes = [IsAuthenticated]
     serializer_class = UserSerializer
 